@@ -5,9 +5,25 @@ QAI Logo'dan tüm gerekli boyutlarda logo dosyaları oluşturur
 """
 
 from PIL import Image
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import tempfile
+import time
 import os
 import sys
 
+# ICO için gerekli boyutlar
+ICO_SIZES = [(16, 16), (32, 32), (48, 48), (256, 256)]
+
+# Piramit kalite ayarları
+#   min_ratio: hedef, en az bu kat büyük seviyeden küçültülür (düşük = hızlı, yüksek = keskin)
+#   level_filter: seviyeler arası yarıya indirme filtresi
+QUALITY_PRESETS = {
+    'fast': {'min_ratio': 1.0, 'level_filter': Image.Resampling.BOX},
+    'balanced': {'min_ratio': 2.0, 'level_filter': Image.Resampling.LANCZOS},
+    'best': {'min_ratio': None, 'level_filter': None},  # Her hedef tam çözünürlükten (eski davranış)
+}
+
 def create_ico(img_path, output_path):
     """Multiple size ICO dosyası oluştur"""
     img = Image.open(img_path)
@@ -47,21 +63,59 @@ def create_png(img_path, size, output_path):
     resized.save(output_path, 'PNG')
     print(f"[OK] Created: {output_path} ({size})")
 
-def main():
-    # Kaynak logo
-    source_logo = "QAI_Logo_Transparent.png"
-    
-    if not os.path.exists(source_logo):
-        print(f"[ERROR] {source_logo} bulunamadi!")
-        sys.exit(1)
-    
-    print("QuadroAIPilot Logo Generator")
-    print("=" * 40)
-    
-    # 1. ICO dosyası oluştur
-    create_ico(source_logo, "icon.ico")
-    
-    # 2. UWP/WinUI için gerekli PNG'ler
+class ResizePyramid:
+    """
+    Kaynağı bir kez decode edip yarıya inen seviyeler oluşturur
+    Her hedef, yeterince büyük en küçük seviyeden küçültülür
+    """
+    
+    def __init__(self, img_path, quality='balanced'):
+        preset = QUALITY_PRESETS[quality]
+        self.min_ratio = preset['min_ratio']
+        
+        source = Image.open(img_path)
+        source.load()
+        if source.mode != 'RGBA':
+            source = source.convert('RGBA')
+        self.levels = [source]
+        
+        if self.min_ratio is None:
+            return
+        # Yarıya indirerek seviyeleri oluştur (16 px altına inme)
+        level = source
+        while min(level.size) >= 32:
+            level = level.resize((level.width // 2, level.height // 2), preset['level_filter'])
+            self.levels.append(level)
+    
+    def level_for(self, size):
+        """Hedefin min_ratio katından büyük en küçük seviye (yoksa kaynak)"""
+        if self.min_ratio is None:
+            return self.levels[0]
+        width, height = size
+        for level in reversed(self.levels):
+            if level.width >= width * self.min_ratio and level.height >= height * self.min_ratio:
+                return level
+        return self.levels[0]
+    
+    def resize(self, size):
+        if isinstance(size, int):
+            size = (size, size)
+        return self.level_for(size).resize(size, Image.Resampling.LANCZOS)
+
+def write_png(pyramid, size, output_path):
+    """Piramitten PNG oluştur"""
+    pyramid.resize(size).save(output_path, 'PNG')
+    print(f"[OK] Created: {output_path} ({size})")
+
+def write_ico(pyramid, output_path):
+    """Piramitten multiple size ICO oluştur"""
+    imgs = [pyramid.resize(size) for size in ICO_SIZES]
+    imgs[0].save(output_path, format='ICO', sizes=ICO_SIZES, append_images=imgs[1:])
+    print(f"[OK] Created: {output_path}")
+
+def collect_targets(base_dir='.'):
+    """Oluşturulacak tüm (dosya yolu, boyut) çiftleri"""
+    # UWP/WinUI için gerekli PNG'ler
     logos = {
         # Temel logolar
         "icon128.png": 128,
@@ -77,37 +131,96 @@ def main():
         "SplashScreen.scale-200.png": (1240, 600),
         "Wide310x150Logo.scale-200.png": (620, 300),
     }
+    targets = [(os.path.join(base_dir, filename), size) for filename, size in logos.items()]
     
-    for filename, size in logos.items():
-        create_png(source_logo, size, filename)
-    
-    # 3. Browser extension logolar
     browser_sizes = {
         "icon16.png": 16,
         "icon48.png": 48,
         "icon128.png": 128
     }
+    for browser in ("Chrome", "Edge", "Firefox"):
+        browser_dir = os.path.join(base_dir, "..", "BrowserExtensions", browser)
+        if os.path.exists(browser_dir):
+            targets.extend((os.path.join(browser_dir, filename), size) for filename, size in browser_sizes.items())
+    return targets
+
+def generate_with_pyramid(source_logo, targets, ico_path, quality='balanced', workers=None):
+    """Kaynağı bir kez decode et, tüm hedefleri paralel yaz (PIL resize/encode GIL'i bırakır)"""
+    pyramid = ResizePyramid(source_logo, quality)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(write_ico, pyramid, ico_path)]
+        futures += [pool.submit(write_png, pyramid, size, path) for path, size in targets]
+        for future in futures:
+            future.result()
+
+def generate_legacy(source_logo, targets, ico_path):
+    """Eski yol: her hedef için kaynağı yeniden aç, tam çözünürlükten küçült"""
+    create_ico(source_logo, ico_path)
+    for path, size in targets:
+        create_png(source_logo, size, path)
+
+def benchmark(source_logo, repeats, quality, workers):
+    """Hedef başına yeniden boyutlandırma vs piramit - geçici klasöre yazar"""
+    import contextlib
+    import io
+    
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        # Klasör yapısı korunur (Chrome/Edge/Firefox icon128.png ayrı hedefler); aynı yola giden hedef bir kez sayılır
+        root = os.path.dirname(os.path.abspath('.'))
+        destinations = {}
+        for path, size in collect_targets():
+            destinations[os.path.join(tmp, os.path.relpath(os.path.abspath(path), root))] = size
+        for path in destinations:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        targets = list(destinations.items())
+        ico_path = os.path.join(tmp, "icon.ico")
+        runs = {
+            'legacy': lambda: generate_legacy(source_logo, targets, ico_path),
+            f'pyramid-{quality}': lambda: generate_with_pyramid(source_logo, targets, ico_path, quality, workers),
+        }
+        for name, run in runs.items():
+            timings = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    run()
+                timings.append(time.perf_counter() - start)
+            results[name] = timings
+    
+    print(f"Benchmark: {len(targets) + 1} hedef, {repeats} tekrar")
+    print(f"{'Yol':<20}{'en iyi (ms)':>14}{'ortalama (ms)':>16}")
+    for name, timings in results.items():
+        print(f"{name:<20}{min(timings) * 1000:>14.0f}{sum(timings) / len(timings) * 1000:>16.0f}")
+    legacy = min(results['legacy'])
+    pyramid = min(results[f'pyramid-{quality}'])
+    print(f"\nHızlanma: {legacy / pyramid:.1f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description="QuadroAIPilot Logo Generator")
+    parser.add_argument('--quality', choices=QUALITY_PRESETS.keys(), default='balanced',
+                        help="Piramit kalitesi (best = her hedef tam çözünürlükten)")
+    parser.add_argument('--workers', type=int, default=None, help="Paralel yazma thread sayısı")
+    parser.add_argument('--benchmark', action='store_true', help="Eski yol ile piramidi karşılaştır (dosyalara dokunmaz)")
+    parser.add_argument('--repeats', type=int, default=5, help="Benchmark tekrar sayısı")
+    args = parser.parse_args()
+    
+    # Kaynak logo
+    source_logo = "QAI_Logo_Transparent.png"
+    
+    if not os.path.exists(source_logo):
+        print(f"[ERROR] {source_logo} bulunamadi!")
+        sys.exit(1)
+    
+    if args.benchmark:
+        benchmark(source_logo, args.repeats, args.quality, args.workers)
+        return
+    
+    print("QuadroAIPilot Logo Generator")
+    print("=" * 40)
     
-    # Chrome için
-    chrome_dir = "../BrowserExtensions/Chrome"
-    if os.path.exists(chrome_dir):
-        print("\n[Chrome Extension Icons]")
-        for filename, size in browser_sizes.items():
-            create_png(source_logo, size, os.path.join(chrome_dir, filename))
-    
-    # Edge için
-    edge_dir = "../BrowserExtensions/Edge"
-    if os.path.exists(edge_dir):
-        print("\n[Edge Extension Icons]")
-        for filename, size in browser_sizes.items():
-            create_png(source_logo, size, os.path.join(edge_dir, filename))
-    
-    # Firefox için
-    firefox_dir = "../BrowserExtensions/Firefox"
-    if os.path.exists(firefox_dir):
-        print("\n[Firefox Extension Icons]")
-        for filename, size in browser_sizes.items():
-            create_png(source_logo, size, os.path.join(firefox_dir, filename))
+    # ICO + UWP/WinUI PNG'leri + browser extension logoları tek piramitten
+    generate_with_pyramid(source_logo, collect_targets(), "icon.ico", args.quality, args.workers)
     
     print("\n[SUCCESS] Tum logo dosyalari basariyla olusturuldu!")
 
@@ -1,16 +1,30 @@
 #!/usr/bin/env python3
+import io
 import os
+import json
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from PIL import Image
 import numpy as np
 
-def make_background_transparent(image_path, output_path, bg_color_range=None):
+# İşlenmiş dosyaların kaydı: dosya adı -> çıktı hash'i
+# Dosyalar yerinde işlendiği için mevcut hash kayıttaki çıktı hash'ine eşitse dosya zaten işlenmiştir
+# (tekrar işlemek alfa kanalını her seferinde biraz daha bulanıklaştırırdı)
+MANIFEST_FILE = '.transparency_manifest.json'
+
+# Manifest'e yazılan işlem parametreleri - değişirse tüm dosyalar yeniden işlenir
+PIPELINE_VERSION = 1
+DEFAULT_SIGMA = 0.5
+
+# Bantlı işlemede varsayılan bant yüksekliği (satır)
+DEFAULT_BAND_ROWS = 256
+
+def remove_background(data, bg_color_range=None, sigma=DEFAULT_SIGMA):
     """
-    Arka planı şeffaf yapar
+    RGBA dizisinde arka planı şeffaf yapar (yerinde) ve diziyi döndürür
     bg_color_range: Arka plan renk aralığı (min_rgb, max_rgb) tuple'ı
     """
-    img = Image.open(image_path).convert('RGBA')
-    data = np.array(img)
-    
     # Mor/lacivert arka plan renk aralığı
     if bg_color_range is None:
         # Koyu mor/lacivert tonları için renk aralığı
@@ -31,15 +45,190 @@ def make_background_transparent(image_path, output_path, bg_color_range=None):
     # Kenarları yumuşat
     from scipy.ndimage import gaussian_filter
     alpha_float = alpha.astype(float) / 255.0
-    alpha_smooth = gaussian_filter(alpha_float, sigma=0.5)
+    alpha_smooth = gaussian_filter(alpha_float, sigma=sigma)
     data[:, :, 3] = (alpha_smooth * 255).astype(np.uint8)
+    return data
+
+def remove_background_tiled(data, out=None, bg_color_range=None, sigma=DEFAULT_SIGMA, band_rows=DEFAULT_BAND_ROWS):
+    """
+    remove_background'un sınırlı bellekli sürümü - görüntüyü yatay bantlar halinde işler
+    data/out np.memmap olabilir; out verilmezse yerinde yazar
+    
+    Gaussian için her banda üstten/alttan filtre yarıçapı kadar halo satırı eklenir, böylece
+    bant sınırlarında sonuç tam görüntü işlemesiyle aynıdır (dikiş oluşmaz). Yerinde yazarken
+    önceki bandın son halo satırlarının orijinali saklanır. Geçici diziler tam görüntü değil
+    bant boyutundadır; alfa float64 yerine float32 ile işlenir.
+    """
+    from scipy.ndimage import gaussian_filter
+    
+    if out is None:
+        out = data
+    inplace = np.may_share_memory(data, out)
+    
+    if bg_color_range is None:
+        min_rgb = np.array([20, 0, 40, 255])
+        max_rgb = np.array([80, 40, 120, 255])
+    else:
+        min_rgb, max_rgb = bg_color_range
+    
+    # scipy gaussian_filter yarıçapı: int(truncate * sigma + 0.5), truncate varsayılanı 4.0
+    halo = int(4.0 * sigma + 0.5)
+    band_rows = max(band_rows, halo, 1)
+    height = data.shape[0]
+    carry = None  # Önceki bandın son halo satırlarının orijinali (yerinde yazım için)
+    
+    for y0 in range(0, height, band_rows):
+        y1 = min(y0 + band_rows, height)
+        top = max(0, y0 - halo)
+        bottom = min(height, y1 + halo)
+        
+        region = np.array(data[top:bottom])  # Bant + halo kopyası
+        if inplace and carry is not None and y0 > top:
+            region[:y0 - top] = carry[-(y0 - top):]
+        if inplace and halo:
+            carry = region[max(0, y1 - top - halo):y1 - top].copy()
+        
+        # Arka plan maskesi - kanal kanal (4 kanallık geçici karşılaştırma dizileri yerine)
+        mask = np.ones(region.shape[:2], dtype=bool)
+        for c in range(4):
+            channel = region[:, :, c]
+            mask &= channel >= min_rgb[c]
+            mask &= channel <= max_rgb[c]
+        region[mask] = 0
+        
+        # Kenarları yumuşat (doğrusal filtre: /255 ve *255 gereksiz)
+        alpha = region[:, :, 3].astype(np.float32)
+        gaussian_filter(alpha, sigma=sigma, output=alpha)
+        
+        center = slice(y0 - top, y1 - top)
+        out[y0:y1, :, :3] = region[center, :, :3]
+        np.copyto(out[y0:y1, :, 3], alpha[center], casting='unsafe')
+    
+    if isinstance(out, np.memmap):
+        out.flush()
+    return out
+
+def make_background_transparent(image_path, output_path, bg_color_range=None):
+    """
+    Arka planı şeffaf yapar
+    bg_color_range: Arka plan renk aralığı (min_rgb, max_rgb) tuple'ı
+    """
+    img = Image.open(image_path).convert('RGBA')
+    data = remove_background(np.array(img), bg_color_range)
     
     # Yeni görüntüyü kaydet
     new_img = Image.fromarray(data, 'RGBA')
     new_img.save(output_path)
     print(f"Saved: {output_path}")
 
-def process_all_icons():
+def process_icon_bytes(filename, source, output_path, tiled=False):
+    """
+    Worker: kaynak byte'larını bir kez decode eder, işler, atomik olarak yazar
+    Çıktının hash'ini döndürür (manifest için)
+    """
+    img = Image.open(io.BytesIO(source)).convert('RGBA')
+    data = np.array(img)
+    del img
+    data = remove_background_tiled(data) if tiled else remove_background(data)
+    
+    buffer = io.BytesIO()
+    Image.fromarray(data, 'RGBA').save(buffer, 'PNG')
+    encoded = buffer.getvalue()
+    
+    tmp_path = output_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(encoded)
+    os.replace(tmp_path, output_path)
+    return filename, hashlib.sha256(encoded).hexdigest()
+
+def load_manifest(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    # İşlem parametreleri değiştiyse eski kayıtlar geçersiz
+    if manifest.get('version') != PIPELINE_VERSION or manifest.get('sigma') != DEFAULT_SIGMA:
+        return {}
+    return manifest.get('files', {})
+
+def save_manifest(path, files):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': PIPELINE_VERSION, 'sigma': DEFAULT_SIGMA, 'files': files}, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def process_batch(filenames, base_dir='.', workers=None, force=False, tiled=False):
+    """
+    Dosyaları process pool'da paralel işle, değişmeyenleri atla
+    Her kaynak bir kez okunur: aynı byte'lar hem hash'lenir hem worker'a gönderilir
+    """
+    manifest_path = os.path.join(base_dir, MANIFEST_FILE)
+    manifest = {} if force else load_manifest(manifest_path)
+    
+    pending = []
+    skipped = 0
+    for filename in filenames:
+        path = os.path.join(base_dir, filename)
+        if not os.path.exists(path):
+            continue
+        with open(path, 'rb') as f:
+            source = f.read()
+        if manifest.get(filename) == hashlib.sha256(source).hexdigest():
+            skipped += 1
+            continue
+        pending.append((filename, source, path, tiled))
+    
+    print(f"{len(pending)} dosya işlenecek, {skipped} dosya değişmemiş (atlandı)")
+    if not pending:
+        return manifest
+    
+    # Tek dosya için process başlatma maliyetine değmez
+    if len(pending) == 1 or workers == 1:
+        results = [process_icon_bytes(*job) for job in pending]
+    else:
+        results = []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(process_icon_bytes, *job) for job in pending]
+            for future in as_completed(futures):
+                results.append(future.result())
+    
+    for filename, output_hash in results:
+        manifest[filename] = output_hash
+        print(f"Saved: {os.path.join(base_dir, filename)}")
+    save_manifest(manifest_path, manifest)
+    return manifest
+
+def process_large_image(input_path, output_path, band_rows=DEFAULT_BAND_ROWS):
+    """
+    Büyük tek görüntü - bantlı işleme, .npy giriş/çıkış memory-mapped
+    .npy girişte ve çıkışta görüntünün tamamı belleğe alınmaz
+    """
+    input_npy = input_path.endswith('.npy')
+    output_npy = output_path.endswith('.npy')
+    same_file = os.path.abspath(input_path) == os.path.abspath(output_path)
+    
+    if input_npy:
+        data = np.load(input_path, mmap_mode='r+' if same_file else 'r')
+    else:
+        data = np.array(Image.open(input_path).convert('RGBA'))
+    if data.ndim != 3 or data.shape[2] != 4 or data.dtype != np.uint8:
+        raise ValueError(f"RGBA uint8 (H, W, 4) dizi bekleniyor: {data.shape} {data.dtype}")
+    
+    if output_npy and not same_file:
+        out = np.lib.format.open_memmap(output_path, mode='w+', dtype=np.uint8, shape=data.shape)
+    elif data.flags.writeable:
+        out = data
+    else:
+        out = np.empty_like(data)
+    
+    remove_background_tiled(data, out, band_rows=band_rows)
+    
+    if not output_npy:
+        Image.fromarray(np.asarray(out), 'RGBA').save(output_path)
+    print(f"Saved: {output_path}")
+
+def process_all_icons(workers=None, force=False, tiled=False):
     """Tüm icon dosyalarını işle"""
     sizes = {
         'icon.ico': None,  # ICO dosyası özel işlem gerektirir
@@ -55,23 +244,29 @@ def process_all_icons():
         'Wide310x150Logo.scale-200.png': 620
     }
     
-    # Önce PNG dosyalarını işle
-    for filename, size in sizes.items():
-        if filename == 'icon.ico':
-            continue
-            
-        input_path = filename
-        if os.path.exists(input_path):
-            print(f"Processing {filename}...")
-            make_background_transparent(input_path, input_path)
+    # PNG dosyalarını işle (ICO özel işlem gerektirir)
+    png_files = [filename for filename in sizes if filename != 'icon.ico']
+    process_batch(png_files, workers=workers, force=force, tiled=tiled)
     
     print("\nTüm PNG dosyaları işlendi!")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Icon arka planlarını şeffaf yap")
+    parser.add_argument('--workers', type=int, default=None, help="Process sayısı (varsayılan: CPU sayısı)")
+    parser.add_argument('--force', action='store_true', help="Manifest'i yok say, tüm dosyaları yeniden işle")
+    parser.add_argument('--tiled', action='store_true', help="Bantlı, sınırlı bellekli işleme")
+    parser.add_argument('--band-rows', type=int, default=DEFAULT_BAND_ROWS, help="Bant yüksekliği (satır)")
+    parser.add_argument('--input', help="Tek büyük görüntü (PNG veya RGBA uint8 .npy - memory-mapped)")
+    parser.add_argument('--output', help="--input çıktısı (varsayılan: yerinde)")
+    args = parser.parse_args()
+    
     # scipy kurulu değilse basit versiyon kullan
     try:
         from scipy.ndimage import gaussian_filter
-        process_all_icons()
+        if args.input:
+            process_large_image(args.input, args.output or args.input, args.band_rows)
+        else:
+            process_all_icons(workers=args.workers, force=args.force, tiled=args.tiled)
     except ImportError:
         print("scipy bulunamadı, basit versiyon kullanılıyor...")
         
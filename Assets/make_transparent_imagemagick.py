@@ -2,98 +2,76 @@
 import subprocess
 import os
 
-def make_transparent_with_imagemagick():
-    """ImageMagick kullanarak arka planı şeffaf yap"""
-    
-    files = ['icon128.png', 'icon16.png', 'icon48.png']
-    
-    for filename in files:
-        if os.path.exists(filename):
-            print(f"Processing {filename}...")
-            
-            # Geçici dosya adı
-            temp_file = f"temp_{filename}"
-            
-            # ImageMagick komutu - mor/lacivert arka planı şeffaf yap
-            cmd = [
-                'magick', filename,
-                '-fuzz', '20%',  # Renk toleransı
-                '-transparent', '#2D1B69',  # Koyu mor/lacivert rengi
-                '-background', 'none',
-                temp_file
-            ]
-            
-            try:
-                subprocess.run(cmd, check=True)
-                # Orijinal dosyayı değiştir
-                os.replace(temp_file, filename)
-                print(f"Updated: {filename}")
-            except subprocess.CalledProcessError as e:
-                print(f"Error processing {filename}: {e}")
-            except FileNotFoundError:
-                print("ImageMagick not found. Trying alternative method...")
-                break
+# İşlenecek dosyalar
+FILES = ['icon128.png', 'icon16.png', 'icon48.png']
 
-# PowerShell ile alternatif yöntem
-def make_transparent_with_powershell():
-    """PowerShell ve .NET kullanarak arka planı şeffaf yap"""
-    
-    ps_script = '''
-Add-Type -AssemblyName System.Drawing
-
-function Make-TransparentBackground {
-    param($inputPath, $outputPath)
-    
-    $bitmap = [System.Drawing.Bitmap]::new($inputPath)
+def make_transparent_with_imagemagick(files=None, threads=None):
+    """
+    ImageMagick kullanarak arka planı şeffaf yap
+    Tüm dosyalar tek bir mogrify çağrısıyla, çok thread'li işlenir (dosya başına process yok)
+    Başarılıysa True döndürür
+    """
+    files = [f for f in (files or FILES) if os.path.exists(f)]
+    if not files:
+        return True
     
-    # Arka plan rengini belirle (sol üst köşeden)
-    $bgColor = $bitmap.GetPixel(0, 0)
+    print(f"Processing {len(files)} files with ImageMagick...")
     
-    # Yeni bitmap oluştur
-    $newBitmap = [System.Drawing.Bitmap]::new($bitmap.Width, $bitmap.Height)
+    # mogrify dosyaları yerinde günceller - geçici dosya gerekmez
+    cmd = [
+        'magick', 'mogrify',
+        '-limit', 'thread', str(threads or os.cpu_count() or 1),  # OpenMP thread sayısı
+        '-fuzz', '20%',  # Renk toleransı
+        '-transparent', '#2D1B69',  # Koyu mor/lacivert rengi
+        '-background', 'none',
+    ] + files
     
-    for ($x = 0; $x -lt $bitmap.Width; $x++) {
-        for ($y = 0; $y -lt $bitmap.Height; $y++) {
-            $pixel = $bitmap.GetPixel($x, $y)
-            
-            # Mor/lacivert arka plan kontrolü
-            if ($pixel.R -lt 80 -and $pixel.G -lt 40 -and $pixel.B -gt 40 -and $pixel.B -lt 120) {
-                # Şeffaf yap
-                $newBitmap.SetPixel($x, $y, [System.Drawing.Color]::Transparent)
-            } else {
-                # Orijinal rengi koru
-                $newBitmap.SetPixel($x, $y, $pixel)
-            }
-        }
-    }
+    try:
+        subprocess.run(cmd, check=True)
+    except subprocess.CalledProcessError as e:
+        print(f"ImageMagick error: {e}")
+        return False
+    except FileNotFoundError:
+        print("ImageMagick not found. Trying alternative method...")
+        return False
     
-    $newBitmap.Save($outputPath, [System.Drawing.Imaging.ImageFormat]::Png)
-    $bitmap.Dispose()
-    $newBitmap.Dispose()
-}
+    for filename in files:
+        print(f"Updated: {filename}")
+    return True
 
-# PNG dosyalarını işle
-@("icon128.png", "icon16.png", "icon48.png") | ForEach-Object {
-    if (Test-Path $_) {
-        Write-Host "Processing $_..."
-        Make-TransparentBackground -inputPath $_ -outputPath $_
-        Write-Host "Updated: $_"
-    }
-}
-'''
-    
-    # PowerShell scriptini çalıştır
+# NumPy ile alternatif yöntem (eski PowerShell GetPixel/SetPixel döngüsünün yerine)
+def make_transparent_with_numpy(files=None):
+    """Vektörel NumPy maskesi ile arka planı şeffaf yap"""
     try:
-        subprocess.run(['powershell', '-Command', ps_script], check=True, cwd=os.getcwd())
-        print("PNG files processed with PowerShell")
-    except Exception as e:
-        print(f"PowerShell error: {e}")
+        from PIL import Image
+        import numpy as np
+    except ImportError:
+        print("Pillow/NumPy not found. pip install pillow numpy")
+        return False
+    
+    for filename in (files or FILES):
+        if not os.path.exists(filename):
+            continue
+        print(f"Processing {filename}...")
+        
+        data = np.array(Image.open(filename).convert('RGBA'))
+        r, g, b = data[:, :, 0], data[:, :, 1], data[:, :, 2]
+        
+        # Mor/lacivert arka plan kontrolü (PowerShell yöntemiyle aynı eşikler)
+        mask = (r < 80) & (g < 40) & (b > 40) & (b < 120)
+        data[mask] = [0, 0, 0, 0]
+        
+        # Geçici dosyaya yaz, sonra yerine taşı
+        temp_file = f"temp_{filename}"
+        Image.fromarray(data, 'RGBA').save(temp_file, 'PNG')
+        os.replace(temp_file, filename)
+        print(f"Updated: {filename}")
+    
+    print("PNG files processed with NumPy")
+    return True
 
 if __name__ == "__main__":
-    # Önce ImageMagick'i dene
-    make_transparent_with_imagemagick()
-    
-    # ImageMagick yoksa PowerShell kullan
-    if not os.path.exists('temp_icon128.png'):
-        print("\nTrying PowerShell method...")
-        make_transparent_with_powershell()
\ No newline at end of file
+    # Önce ImageMagick'i dene, olmazsa NumPy kullan
+    if not make_transparent_with_imagemagick():
+        print("\nTrying NumPy method...")
+        make_transparent_with_numpy()
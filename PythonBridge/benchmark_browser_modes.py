@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Chromium pencere modu / launch profili benchmark'ı - QuadroAIPilot bridge'leri için
+offscreen (ekran dışı pencere) ve headless (--headless=new) modlarında, seçilen launch
+profilleriyle (latency / balanced / low-memory) Chromium process ağacının boşta ve aktif
+(yanıt akışı simülasyonu) CPU ve RSS değerlerini ve sayfa gecikmesini ölçer.
+
+Aktif faz, sayfaya token token metin ekleyen ve her adımda markdown benzeri yeniden render
+yapan bir script çalıştırır (provider'ların yanıt akışına yakın bir yük). Bu sırada sayfaya
+periyodik evaluate atılır; round-trip süresi (p50/p95) bridge'in her tick'te gördüğü gecikmedir.
+Arka planda ikinci bir sekme (standby sayfası gibi) açık tutulur.
+
+Kullanım:
+    python benchmark_browser_modes.py
+    python benchmark_browser_modes.py --idle 20 --active 20 --repeats 3
+    python benchmark_browser_modes.py --modes headless --profiles latency,balanced,low-memory
+    python benchmark_browser_modes.py --url https://gemini.google.com/app --json sonuc.json
+
+Gereksinim: playwright, psutil
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+
+from playwright.async_api import async_playwright
+
+from browser_launch import BROWSER_MODES, DEFAULT_LAUNCH_PROFILE, LAUNCH_PROFILES, launch_args, window_options
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Sohbet sayfasına benzeyen yerel test sayfası (ağ gerektirmez)
+TEST_PAGE = '''data:text/html;charset=utf-8,<!doctype html>
+<html><head><style>
+body { font-family: sans-serif; margin: 0; }
+main { max-width: 760px; margin: 0 auto; padding: 16px; }
+.msg { padding: 8px 12px; margin: 8px 0; border-radius: 8px; background: %23f4f4f4; }
+.cursor { display: inline-block; width: 8px; height: 1em; background: %23333; animation: blink 1s step-end infinite; }
+@keyframes blink { 50%25 { opacity: 0; } }
+</style></head><body><main id="chat"><div class="msg">Merhaba, size nasıl yardımcı olabilirim?</div></main></body></html>'''
+
+# Yanıt akışı simülasyonu: her interval ms'de birkaç kelime ekle, mesajı yeniden render et
+STREAM_JS = '''async ({seconds, interval}) => {
+    const words = 'Bu bir yanıt akışı simülasyonudur ve her adımda mesaj yeniden oluşturulur'.split(' ');
+    const container = document.querySelector('#chat') || document.body;
+    let msg = null;
+    let text = '';
+    let steps = 0;
+    const end = performance.now() + seconds * 1000;
+    while (performance.now() < end) {
+        if (!msg || text.length > 4000) {
+            msg = document.createElement('div');
+            msg.className = 'msg';
+            container.appendChild(msg);
+            text = '';
+        }
+        text += ' ' + words[steps % words.length] + ' ' + words[(steps * 7) % words.length];
+        const paragraphs = text.match(/.{1,240}/g) || [];
+        msg.innerHTML = paragraphs.map(p => '<p>' + p + '</p>').join('') + '<span class="cursor"></span>';
+        msg.scrollIntoView({block: 'end'});
+        steps++;
+        await new Promise(resolve => setTimeout(resolve, interval));
+    }
+    return steps;
+}'''
+
+
+class ProcessTree:
+    """Playwright'ın başlattığı Chromium process'leri (bu Python process'inin alt ağacı)"""
+
+    def __init__(self):
+        self.procs = {}
+
+    def refresh(self):
+        for child in psutil.Process().children(recursive=True):
+            try:
+                name = child.name().lower()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            if ('chrom' in name or 'headless_shell' in name) and child.pid not in self.procs:
+                self.procs[child.pid] = child
+
+    def sample(self):
+        """(toplam CPU saniyesi, toplam RSS byte)"""
+        self.refresh()
+        cpu = 0.0
+        rss = 0
+        for pid, proc in list(self.procs.items()):
+            try:
+                times = proc.cpu_times()
+                cpu += times.user + times.system
+                rss += proc.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                self.procs.pop(pid, None)
+        return cpu, rss
+
+
+async def measure(tree, seconds, interval=0.5):
+    """seconds boyunca CPU (tek çekirdeğe göre %) ve RSS (ortalama/tepe MB) ölç"""
+    start_cpu, rss = tree.sample()
+    samples = [rss]
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        await asyncio.sleep(interval)
+        _, rss = tree.sample()
+        samples.append(rss)
+    end_cpu, _ = tree.sample()
+    elapsed = time.perf_counter() - start
+    return {
+        'cpu_pct': round((end_cpu - start_cpu) / elapsed * 100, 1),
+        'rss_avg_mb': round(statistics.mean(samples) / (1024 * 1024), 1),
+        'rss_peak_mb': round(max(samples) / (1024 * 1024), 1),
+    }
+
+
+async def probe_latency(page, seconds, interval=0.25):
+    """seconds boyunca evaluate round-trip sürelerini (ms) topla"""
+    samples = []
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        started = time.perf_counter()
+        await page.evaluate('() => document.querySelectorAll(".msg").length')
+        samples.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(interval)
+    return samples
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[max(0, min(len(ordered) - 1, int(len(ordered) * p / 100 + 0.5) - 1))]
+
+
+async def run_mode(playwright, mode, profile, args):
+    """Tek ölçüm: başlat → yükle → boşta → aktif → kapat"""
+    window = window_options(mode)
+    started = time.perf_counter()
+    browser = await playwright.chromium.launch(headless=window['headless'], args=window['args'] + launch_args(profile))
+    try:
+        context = await browser.new_context(viewport={'width': 840, 'height': 480})
+        # Arka plan sekmesi (unified bridge'deki ikinci provider / standby sayfası gibi)
+        background = await context.new_page()
+        await background.goto(args.url, wait_until='domcontentloaded', timeout=90000)
+        page = await context.new_page()
+        await page.goto(args.url, wait_until='domcontentloaded', timeout=90000)
+        await page.bring_to_front()
+        startup_ms = int((time.perf_counter() - started) * 1000)
+
+        tree = ProcessTree()
+        await asyncio.sleep(args.settle)
+
+        idle = await measure(tree, args.idle)
+
+        stream = asyncio.ensure_future(page.evaluate(STREAM_JS, {'seconds': args.active, 'interval': args.interval}))
+        probe = asyncio.ensure_future(probe_latency(page, args.active))
+        active = await measure(tree, args.active)
+        steps = await stream
+        latencies = await probe
+        active['rtt_p50_ms'] = round(percentile(latencies, 50), 1)
+        active['rtt_p95_ms'] = round(percentile(latencies, 95), 1)
+
+        return {
+            'mode': mode,
+            'profile': profile,
+            'version': browser.version,
+            'startup_ms': startup_ms,
+            'idle': idle,
+            'active': active,
+            'stream_steps': steps,
+        }
+    finally:
+        await browser.close()
+
+
+def summarize(runs):
+    """Tekrarların medyanı"""
+    def med(values):
+        return round(statistics.median(values), 1)
+
+    keys = ('cpu_pct', 'rss_avg_mb', 'rss_peak_mb')
+    return {
+        'mode': runs[0]['mode'],
+        'profile': runs[0]['profile'],
+        'version': runs[0]['version'],
+        'repeats': len(runs),
+        'startup_ms': med([run['startup_ms'] for run in runs]),
+        'idle': {key: med([run['idle'][key] for run in runs]) for key in keys},
+        'active': {key: med([run['active'][key] for run in runs]) for key in keys + ('rtt_p50_ms', 'rtt_p95_ms')},
+        'stream_steps': med([run['stream_steps'] for run in runs]),
+    }
+
+
+def print_table(results):
+    print()
+    print(
+        f"{'Mod':<10} {'Profil':<11} {'Başlatma':>9} {'Boşta CPU':>10} {'Boşta RSS':>16} "
+        f"{'Aktif CPU':>10} {'Aktif RSS':>16} {'RTT p50/p95':>14} {'Adım':>6}"
+    )
+    for r in results:
+        idle, active = r['idle'], r['active']
+        idle_rss = f"{idle['rss_avg_mb']:.0f}/{idle['rss_peak_mb']:.0f} MB"
+        active_rss = f"{active['rss_avg_mb']:.0f}/{active['rss_peak_mb']:.0f} MB"
+        rtt = f"{active['rtt_p50_ms']:.0f}/{active['rtt_p95_ms']:.0f} ms"
+        print(
+            f"{r['mode']:<10} {r['profile']:<11} {r['startup_ms']:>7.0f}ms {idle['cpu_pct']:>9.1f}% {idle_rss:>16} "
+            f"{active['cpu_pct']:>9.1f}% {active_rss:>16} {rtt:>14} {r['stream_steps']:>6.0f}"
+        )
+    print("(CPU: tek çekirdeğe göre %, RSS: ortalama/tepe - Chromium process ağacı toplamı,")
+    print(" RTT: aktif fazda evaluate round-trip, Adım: akış simülasyonunun tamamladığı adım - kısılma göstergesi)")
+
+    if len(results) > 1:
+        base = results[0]
+        for other in results[1:]:
+            for phase in ('idle', 'active'):
+                cpu = other[phase]['cpu_pct'] - base[phase]['cpu_pct']
+                rss = other[phase]['rss_avg_mb'] - base[phase]['rss_avg_mb']
+                print(
+                    f"   {other['mode']}/{other['profile']} - {base['mode']}/{base['profile']} ({phase}): "
+                    f"CPU {cpu:+.1f} puan, RSS {rss:+.0f} MB"
+                )
+
+
+async def run(args):
+    results = []
+    async with async_playwright() as playwright:
+        for mode in args.modes:
+            for profile in args.profiles:
+                runs = []
+                for i in range(args.repeats):
+                    print(f"⏱️ {mode} / {profile} ölçülüyor ({i + 1}/{args.repeats})...", flush=True)
+                    runs.append(await run_mode(playwright, mode, profile, args))
+                results.append(summarize(runs))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Chromium pencere modu / launch profili CPU, RSS ve gecikme benchmark')
+    parser.add_argument('--modes', default=','.join(BROWSER_MODES), help='Virgülle ayrılmış modlar')
+    parser.add_argument('--profiles', default=DEFAULT_LAUNCH_PROFILE,
+                        help=f"Virgülle ayrılmış launch profilleri ({', '.join(LAUNCH_PROFILES)})")
+    parser.add_argument('--url', default=TEST_PAGE, help='Yüklenecek sayfa (varsayılan: yerel test sayfası)')
+    parser.add_argument('--idle', type=float, default=10, help='Boşta ölçüm süresi (sn)')
+    parser.add_argument('--active', type=float, default=10, help='Aktif ölçüm süresi (sn)')
+    parser.add_argument('--interval', type=int, default=40, help='Akış adımları arası (ms)')
+    parser.add_argument('--settle', type=float, default=3, help='Yükleme sonrası bekleme (sn)')
+    parser.add_argument('--repeats', type=int, default=1, help='Mod başına tekrar (medyan alınır)')
+    parser.add_argument('--json', help='Sonuçları JSON dosyasına yaz')
+    args = parser.parse_args()
+
+    if psutil is None:
+        print("❌ psutil gerekli: pip install psutil")
+        sys.exit(1)
+
+    args.modes = [m.strip() for m in args.modes.split(',') if m.strip()]
+    args.profiles = [p.strip() for p in args.profiles.split(',') if p.strip()]
+    for mode in args.modes:
+        if mode not in BROWSER_MODES:
+            parser.error(f"bilinmeyen mod: {mode} (geçerli: {', '.join(BROWSER_MODES)})")
+    for profile in args.profiles:
+        if profile not in LAUNCH_PROFILES:
+            parser.error(f"bilinmeyen profil: {profile} (geçerli: {', '.join(LAUNCH_PROFILES)})")
+
+    results = asyncio.run(run(args))
+    print_table(results)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"✅ {args.json} yazıldı")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Bridge process yardımcıları - QuadroAIPilot bridge'leri için
+Komut satırı (--port, --supervised, --spare), paylaşılan JSON dosyalarının atomik yazımı, supervisor kapanınca bridge'i kapatma ve
+/health/probe (sayfalara gerçek evaluate round-trip'i) - bkz. bridge_supervisor.py
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Probe'da sayfa başına evaluate zaman aşımı (sn)
+PROBE_TIMEOUT_S = 5.0
+
+
+def parse_args(description, default_port):
+    """Bridge komut satırı: --port (varsayılan C# tarafının beklediği port), --supervised"""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--port', type=int, default=default_port, help=f'HTTP portu (varsayılan: {default_port})')
+    parser.add_argument('--supervised', action='store_true',
+                        help='bridge_supervisor.py altında çalış: stdin kapanınca (supervisor öldü) kapan')
+    parser.add_argument('--spare', action='store_true',
+                        help='Warm spare olarak çalış: POST /promote gelene kadar kapanışta storage state kaydetme')
+    return parser.parse_args()
+
+
+def write_json_atomic(path, data, **dump_kwargs):
+    """
+    JSON'u geçici dosyaya yazıp os.replace ile yerine koy - aynı dosyayı okuyan diğer process
+    (warm spare) yarım yazılmış dosya görmez. Geçici dosya adı pid içerir (iki yazar çakışmaz)
+    """
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, **dump_kwargs)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def close_and_exit(bridge, timeout=5):
+    """Browser'ı kapat (storage state kaydedilir) ve process'i sonlandır"""
+    try:
+        if bridge.loop and bridge.loop.is_running():
+            future = asyncio.run_coroutine_threadsafe(bridge.close(), bridge.loop)
+            future.result(timeout=timeout)
+    except Exception as e:
+        logger.warning(f"⚠️ Browser kapatma hatası: {e}")
+    os._exit(0)
+
+
+def exit_with_parent(bridge):
+    """
+    Supervisor stdin'i pipe olarak verir; supervisor ölünce (kill dahil) pipe kapanır,
+    bridge de kapanır - yetim Chromium process'i kalmaz
+    """
+    def watch():
+        try:
+            while sys.stdin.buffer.read(1024):
+                pass
+        except (OSError, ValueError):
+            pass
+        logger.info("🛑 Supervisor bağlantısı koptu, bridge kapatılıyor...")
+        close_and_exit(bridge)
+
+    threading.Thread(target=watch, daemon=True).start()
+
+
+async def probe_pages(pages, timeout=PROBE_TIMEOUT_S):
+    """Her sayfaya evaluate('1') - ad → ms, zaman aşımı/hata için metin"""
+    results = {}
+    for name, page in pages.items():
+        if page is None or page.is_closed():
+            # Kapanmış sayfayı bridge kendisi yeniler, process'i yeniden başlatma sebebi değil
+            results[name] = 'closed'
+            continue
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(page.evaluate('1'), timeout)
+            results[name] = round((time.perf_counter() - started) * 1000, 1)
+        except asyncio.TimeoutError:
+            results[name] = 'timeout'
+        except Exception as e:
+            results[name] = f'error: {e}'
+    return results
+
+
+def probe_response(loop, pages, ready, timeout=PROBE_TIMEOUT_S):
+    """
+    /health/probe yanıtı: (HTTP kodu, gövde)
+    200 + status 'starting' (browser henüz hazır değil) veya 'ok'; event loop ya da
+    Playwright takıldıysa 503 + status 'hung'
+    """
+    if not ready:
+        return 200, {'status': 'starting', 'ready': False}
+    if loop is None or not loop.is_running():
+        return 503, {'status': 'hung', 'ready': True, 'error': 'event loop çalışmıyor'}
+
+    future = asyncio.run_coroutine_threadsafe(probe_pages(pages, timeout), loop)
+    try:
+        results = future.result(timeout=timeout * max(1, len(pages)) + 1)
+    except Exception:
+        future.cancel()
+        return 503, {'status': 'hung', 'ready': True, 'error': 'event loop yanıt vermiyor'}
+
+    failed = [name for name, value in results.items() if isinstance(value, str) and value != 'closed']
+    if failed:
+        return 503, {'status': 'hung', 'ready': True, 'probe_ms': results}
+    return 200, {'status': 'ok', 'ready': True, 'probe_ms': results}
@@ -0,0 +1,615 @@
+#!/usr/bin/env python3
+"""
+Bridge Supervisor - QuadroAIPilot için
+Yapılandırılan bridge'leri alt process olarak başlatır, /health/probe ile periyodik kontrol eder,
+çöken veya takılan bridge'i backoff ile yeniden başlatır. İstenirse sıcak yedek (warm spare)
+bir process hazır tutulur ve arıza anında soğuk başlatma beklenmeden devreye alınır.
+
+Public port (C# tarafının bildiği 8765 / 8766) supervisor'daki TCP relay'dedir, bridge'ler
+iç portlarda çalışır; yedeğe geçiş istemciye görünmez. Bridge yokken relay hemen 503 döner.
+
+Kullanım:
+    python bridge_supervisor.py                          # unified bridge (8765)
+    python bridge_supervisor.py --warm-spare             # + hazır yedek process
+    python bridge_supervisor.py --bridges chatgpt,gemini # eski ayrı bridge'ler (8765 + 8766)
+    curl http://127.0.0.1:8770/status                    # restart sayıları, kesinti süresi
+"""
+
+import argparse
+import json
+import logging
+import os
+import select
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from browser_launch import config_file
+
+# Log klasörünü hazırla (AppData/QuadroAIPilot/Logs)
+log_dir = os.path.join(os.getenv('LOCALAPPDATA') or os.path.expanduser('~'), 'QuadroAIPilot', 'Logs')
+os.makedirs(log_dir, exist_ok=True)
+log_file = os.path.join(log_dir, 'bridge_supervisor.log')
+
+# Logging - Windows console için UTF-8 encoding
+logging.basicConfig(
+    level=logging.INFO,
+    format='[%(asctime)s] [%(levelname)s] %(message)s',
+    datefmt='%H:%M:%S',
+    handlers=[
+        logging.FileHandler(log_file, encoding='utf-8'),
+        logging.StreamHandler(sys.stdout)
+    ]
+)
+
+# Windows console encoding fix (emoji desteği için)
+if sys.platform == 'win32':
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+        sys.stderr.reconfigure(encoding='utf-8')
+    except:
+        pass
+
+logger = logging.getLogger(__name__)
+
+bridge_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Supervisor'ın yönetebildiği bridge'ler (public port = C# tarafının bağlandığı port)
+SUPERVISED_BRIDGES = {
+    'unified': {'script': 'unified_ai_bridge.py', 'port': 8765, 'spare': True},
+    # Persistent Chrome profili (./chrome-profile) kilitli olduğundan ikinci process açılamaz → yedek yok
+    'chatgpt': {'script': 'chatgpt_http_bridge.py', 'port': 8765, 'spare': False},
+    'gemini': {'script': 'gemini_http_bridge.py', 'port': 8766, 'spare': False},
+}
+
+# bridge_config.json "supervisor" bölümüyle ezilebilir
+DEFAULT_CONFIG = {
+    'bridges': ['unified'],
+    # Hazır yedek process (arızada anında devreye girer, maliyeti: ikinci Chromium)
+    'warm_spare': False,
+    'check_interval_s': 5,
+    # Bridge'in kendi probe süresinden (sayfa başına 5 sn) uzun olmalı
+    'probe_timeout_s': 15,
+    # Arka arkaya bu kadar başarısız kontrol → takılmış sayılır, yeniden başlatılır
+    'failures_before_restart': 3,
+    # İlk açılışta (login sayfası, yavaş ağ) hazır olması beklenen süre
+    'startup_grace_s': 180,
+    'backoff_base_s': 2,
+    'backoff_max_s': 120,
+    # Bu kadar sorunsuz çalışınca backoff sıfırlanır
+    'stable_after_s': 300,
+    'stop_timeout_s': 15,
+    # GET /status (0 = kapalı)
+    'status_port': 8770,
+}
+
+UNAVAILABLE_BODY = json.dumps({
+    "status": "restarting",
+    "success": False,
+    "IsError": True,
+    "error": "Bridge yeniden başlatılıyor",
+    "ErrorMessage": "Bridge yeniden başlatılıyor"
+}).encode()
+UNAVAILABLE_RESPONSE = (
+    b'HTTP/1.0 503 Service Unavailable\r\n'
+    b'Content-Type: application/json\r\n'
+    b'Content-Length: ' + str(len(UNAVAILABLE_BODY)).encode() + b'\r\n'
+    b'Connection: close\r\n\r\n' + UNAVAILABLE_BODY
+)
+
+
+def load_config():
+    """Varsayılanlar + bridge_config.json "supervisor" bölümü"""
+    config = dict(DEFAULT_CONFIG)
+    if os.path.exists(config_file):
+        try:
+            with open(config_file, 'r', encoding='utf-8') as f:
+                user_config = json.load(f).get('supervisor', {})
+            config.update({k: v for k, v in user_config.items() if k in DEFAULT_CONFIG})
+        except Exception as e:
+            logger.warning(f"⚠️ Ayar dosyası okunamadı, varsayılanlar kullanılıyor: {e}")
+    return config
+
+
+def free_port():
+    """İşletim sisteminden boş bir iç port al"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class BridgeProcess:
+    """Tek bridge alt process'i (aktif veya yedek)"""
+
+    def __init__(self, name, script, role):
+        self.name = name
+        self.role = role
+        self.port = free_port()
+        self.started = time.monotonic()
+        self.ready_at = None
+        self.failures = 0
+        self.failing_since = None
+        self.last_status = None
+        # stdin pipe: supervisor ölünce bridge kendini kapatır (bkz. bridge_process.exit_with_parent)
+        # --spare: yedek, kapanışta aktifin paylaşılan storage dosyalarının üzerine yazmaz
+        args = [sys.executable, script, '--port', str(self.port), '--supervised']
+        if role == 'spare':
+            args.append('--spare')
+        self.proc = subprocess.Popen(
+            args,
+            cwd=os.path.dirname(script),
+            stdin=subprocess.PIPE
+        )
+        logger.info(f"🚀 {name} ({role}) başlatıldı: pid {self.proc.pid}, port {self.port}")
+
+    def exit_code(self):
+        return self.proc.poll()
+
+    def check(self, timeout):
+        """GET /health/probe → (status, gövde); status: ok / starting / hung / down"""
+        url = f'http://127.0.0.1:{self.port}/health/probe'
+        try:
+            with urllib.request.urlopen(url, timeout=timeout) as response:
+                body = json.loads(response.read().decode() or '{}')
+            return body.get('status', 'ok'), body
+        except urllib.error.HTTPError as e:
+            try:
+                body = json.loads(e.read().decode() or '{}')
+            except ValueError:
+                body = {}
+            return body.get('status', 'hung'), body
+        except (OSError, ValueError) as e:
+            return 'down', {'error': str(e)}
+
+    def promote(self, timeout):
+        """POST /promote: yedek aktif oldu, storage state'i dosyadan tazeler ve kapanışta kaydeder"""
+        self.role = 'active'
+        request = urllib.request.Request(f'http://127.0.0.1:{self.port}/promote', data=b'', method='POST')
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                body = json.loads(response.read().decode() or '{}')
+            logger.info(f"🔁 {self.name} yedek process aktif, storage yenilendi: {body.get('refreshed')}")
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ {self.name} yedek process'e promote gönderilemedi: {e}")
+
+    def stop(self, timeout):
+        """stdin'i kapat (bridge storage'ı kaydedip çıkar), süre dolarsa öldür"""
+        if self.proc.poll() is not None:
+            return
+        try:
+            self.proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.proc.wait(timeout)
+        except subprocess.TimeoutExpired:
+            logger.warning(f"⚠️ {self.name} ({self.role}) {timeout} sn'de kapanmadı, öldürülüyor (pid {self.proc.pid})")
+            self.proc.kill()
+            try:
+                self.proc.wait(5)
+            except subprocess.TimeoutExpired:
+                pass
+
+    def status(self, now):
+        return {
+            'pid': self.proc.pid,
+            'port': self.port,
+            'uptime_s': round(now - self.started, 1),
+            'ready': self.ready_at is not None,
+            'startup_s': round(self.ready_at - self.started, 1) if self.ready_at else None,
+            'last_status': self.last_status,
+            'failures': self.failures,
+        }
+
+
+def pump(client, upstream):
+    """
+    İki yönlü kopyalama. İstemci bağlantıyı kapatırsa bridge'e yazma tarafı kapatılır
+    (unified bridge bunu istemci ayrıldı olarak görür ve turu durdurur); bridge kapatırsa biter.
+    """
+    sockets = [client, upstream]
+    while sockets:
+        readable, _, _ = select.select(sockets, [], [])
+        for sock in readable:
+            other = upstream if sock is client else client
+            try:
+                data = sock.recv(65536)
+            except OSError:
+                return
+            if data:
+                try:
+                    other.sendall(data)
+                except OSError:
+                    return
+            elif sock is upstream:
+                return
+            else:
+                sockets.remove(client)
+                try:
+                    upstream.shutdown(socket.SHUT_WR)
+                except OSError:
+                    pass
+
+
+class RelayHandler(socketserver.BaseRequestHandler):
+    """Public port → aktif bridge'in iç portu"""
+
+    def handle(self):
+        port = self.server.target()
+        upstream = None
+        if port:
+            try:
+                upstream = socket.create_connection(('127.0.0.1', port), timeout=3)
+            except OSError:
+                upstream = None
+
+        if upstream is None:
+            # İsteği oku (okunmamış veri RST'ye yol açar) ve 503 dön
+            self.request.settimeout(1)
+            try:
+                self.request.recv(65536)
+                self.request.sendall(UNAVAILABLE_RESPONSE)
+            except OSError:
+                pass
+            return
+
+        upstream.settimeout(None)
+        try:
+            pump(self.request, upstream)
+        finally:
+            upstream.close()
+
+
+class Relay(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, port, target):
+        self.target = target
+        super().__init__(('127.0.0.1', port), RelayHandler)
+
+
+class SupervisedBridge:
+    """Bir bridge'in aktif/yedek process'leri, health kontrolü, restart ve kesinti sayaçları"""
+
+    def __init__(self, name, config):
+        spec = SUPERVISED_BRIDGES[name]
+        self.name = name
+        self.script = os.path.join(bridge_dir, spec['script'])
+        self.public_port = spec['port']
+        self.config = config
+        self.warm_spare = bool(config['warm_spare']) and spec['spare']
+        if config['warm_spare'] and not spec['spare']:
+            logger.warning(f"⚠️ {name} için yedek process desteklenmiyor (persistent profil kilidi)")
+
+        self.active = None
+        self.spare = None
+        self.stopping = None
+        self.stopped = False
+        self.next_start = 0.0
+        self.next_spare_start = 0.0
+        self.consecutive = 0  # Kararlı çalışma olmadan art arda yeniden başlatma
+        self.spare_failures = 0
+
+        self.restarts = 0
+        self.reasons = {'crash': 0, 'hung': 0, 'not-ready': 0}
+        self.swaps = 0
+        self.downtime_s = 0.0
+        self.outage_since = None
+        self.last_restart = None
+
+        self.relay = Relay(self.public_port, self.target_port)
+
+    def target_port(self):
+        active = self.active
+        return active.port if active is not None else None
+
+    def _spawn(self, role):
+        return BridgeProcess(self.name, self.script, role)
+
+    def _stop_async(self, process):
+        threading.Thread(target=process.stop, args=(self.config['stop_timeout_s'],), daemon=True).start()
+
+    def _swap_async(self, old, new):
+        """Eski process'i kapat (son storage kaydı), ardından yedeğe promote gönder (o kaydı yükler)"""
+        def swap():
+            old.stop(self.config['stop_timeout_s'])
+            new.promote(self.config['probe_timeout_s'])
+
+        threading.Thread(target=swap, daemon=True).start()
+
+    def _backoff(self, attempts):
+        return min(self.config['backoff_base_s'] * 2 ** max(0, attempts - 1), self.config['backoff_max_s'])
+
+    def _end_outage(self, now):
+        if self.outage_since is not None:
+            duration = now - self.outage_since
+            self.downtime_s += duration
+            self.outage_since = None
+            logger.info(f"✅ {self.name}: servis geri geldi ({duration:.1f} sn kesinti)")
+
+    def tick(self, now):
+        """Tek kontrol turu"""
+        if self.stopped:
+            return
+        self._tick_spare(now)
+
+        active = self.active
+        if active is None:
+            # Eski process (profil kilidi) kapanmadan yenisi açılmaz
+            if self.stopping is not None and self.stopping.exit_code() is None:
+                return
+            if now >= self.next_start:
+                self.active = self._spawn('active')
+            return
+
+        code = active.exit_code()
+        if code == 0:
+            # os._exit(0) sadece /shutdown yolunda → istemci kapattı, yeniden başlatma
+            logger.info(f"🛑 {self.name} kapatıldı (/shutdown), izleme bitti")
+            self.stop()
+            return
+        if code is not None:
+            self._fail('crash', f'çıkış kodu {code}', now)
+            return
+
+        status, detail = active.check(self.config['probe_timeout_s'])
+        active.last_status = status
+        if status == 'ok':
+            if active.ready_at is None:
+                active.ready_at = now
+                logger.info(f"✅ {self.name} hazır ({now - active.started:.1f} sn)")
+            active.failures = 0
+            active.failing_since = None
+            self._end_outage(now)
+            if self.consecutive and now - active.ready_at >= self.config['stable_after_s']:
+                self.consecutive = 0
+            return
+
+        if active.ready_at is None and status in ('starting', 'down') \
+                and now - active.started < self.config['startup_grace_s']:
+            return  # Hâlâ açılıyor
+
+        active.failures += 1
+        if active.failing_since is None:
+            active.failing_since = now
+        limit = self.config['failures_before_restart']
+        logger.warning(f"⚠️ {self.name}: health kontrolü başarısız ({status}, {active.failures}/{limit}) {detail}")
+        if active.failures >= limit:
+            self._fail('not-ready' if active.ready_at is None else 'hung', detail, now)
+
+    def _tick_spare(self, now):
+        if not self.warm_spare:
+            return
+        spare = self.spare
+        if spare is None:
+            # Yedek, aktif hazır olduktan sonra açılır (açılışta kaynak yarışmasın)
+            active = self.active
+            if active is not None and active.ready_at is not None and now >= self.next_spare_start:
+                self.spare = self._spawn('spare')
+            return
+
+        code = spare.exit_code()
+        if code is not None:
+            self._drop_spare(now, f'çıkış kodu {code}')
+            return
+
+        status, detail = spare.check(self.config['probe_timeout_s'])
+        spare.last_status = status
+        if status == 'ok':
+            if spare.ready_at is None:
+                spare.ready_at = now
+                logger.info(f"🔥 {self.name} yedek process hazır ({now - spare.started:.1f} sn)")
+            spare.failures = 0
+            if self.spare_failures and now - spare.ready_at >= self.config['stable_after_s']:
+                self.spare_failures = 0
+            return
+        if spare.ready_at is None and status in ('starting', 'down') \
+                and now - spare.started < self.config['startup_grace_s']:
+            return
+        spare.failures += 1
+        if spare.failures >= self.config['failures_before_restart']:
+            self._drop_spare(now, f'{status} {detail}')
+
+    def _drop_spare(self, now, reason):
+        spare, self.spare = self.spare, None
+        self.spare_failures += 1
+        delay = self._backoff(self.spare_failures)
+        self.next_spare_start = now + delay
+        logger.warning(f"⚠️ {self.name} yedek process düştü ({reason}), {delay:.0f} sn sonra yenisi açılacak")
+        self._stop_async(spare)
+
+    def _fail(self, reason, detail, now):
+        """Aktif process'i bırak: hazır yedek varsa ona geç, yoksa backoff ile soğuk başlat"""
+        old = self.active
+        self.restarts += 1
+        self.reasons[reason] += 1
+        self.consecutive += 1
+        self.last_restart = {
+            'time': datetime.now().isoformat(timespec='seconds'),
+            'reason': reason,
+            'detail': str(detail)[:200],
+        }
+        if self.outage_since is None:
+            self.outage_since = old.failing_since or now
+
+        spare = self.spare
+        if spare is not None and spare.ready_at is not None and spare.exit_code() is None:
+            self.active, self.spare = spare, None
+            self.swaps += 1
+            # Yeni yedek, eski process kapandıktan sonra açılsın (bellek tepe noktası)
+            self.next_spare_start = now + self.config['stop_timeout_s']
+            logger.warning(f"🔁 {self.name} {reason}: yedek process devreye alındı (pid {spare.proc.pid})")
+            self._end_outage(now)
+            self.stopping = old
+            self._swap_async(old, spare)
+            return
+
+        self.active = None
+        delay = self._backoff(self.consecutive)
+        self.next_start = now + delay
+        logger.warning(f"🔄 {self.name} {reason}: {delay:.0f} sn sonra yeniden başlatılacak ({detail})")
+        self.stopping = old
+        self._stop_async(old)
+
+    def stop(self):
+        """Tüm process'leri kapat (yeniden başlatma yok)"""
+        self.stopped = True
+        processes = [p for p in (self.active, self.spare) if p is not None]
+        self.active = self.spare = None
+        for process in processes:
+            process.stop(self.config['stop_timeout_s'])
+
+    def status(self):
+        now = time.monotonic()
+        outage = now - self.outage_since if self.outage_since is not None else 0.0
+        active = self.active
+        if self.stopped:
+            state = 'stopped'
+        elif active is None:
+            state = 'restarting'
+        elif active.ready_at is None:
+            state = 'starting'
+        elif active.failures:
+            state = 'degraded'
+        else:
+            state = 'running'
+        return {
+            'state': state,
+            'public_port': self.public_port,
+            'active': active.status(now) if active is not None else None,
+            'spare': self.spare.status(now) if self.spare is not None else None,
+            'warm_spare': self.warm_spare,
+            'restarts': self.restarts,
+            'restart_reasons': dict(self.reasons),
+            'spare_swaps': self.swaps,
+            'downtime_s': round(self.downtime_s + outage, 1),
+            'current_outage_s': round(outage, 1),
+            'next_start_in_s': round(max(0.0, self.next_start - now), 1) if active is None and not self.stopped else None,
+            'last_restart': self.last_restart,
+        }
+
+    def run(self, stop_event):
+        """Relay + kontrol döngüsü (bridge başına ayrı thread, yavaş probe diğerlerini bekletmez)"""
+        threading.Thread(target=self.relay.serve_forever, daemon=True).start()
+        logger.info(f"🔀 {self.name}: http://127.0.0.1:{self.public_port} → bridge iç portu")
+        while not stop_event.is_set() and not self.stopped:
+            try:
+                self.tick(time.monotonic())
+            except Exception as e:
+                logger.error(f"❌ {self.name} kontrol hatası: {e}")
+            stop_event.wait(self.config['check_interval_s'])
+
+
+class Supervisor:
+    """Bridge'leri başlatır/izler, GET /status ile sayaçları yayınlar"""
+
+    def __init__(self, config):
+        self.config = config
+        self.started = time.monotonic()
+        self.stop_event = threading.Event()
+
+        ports = {}
+        for name in config['bridges']:
+            if name not in SUPERVISED_BRIDGES:
+                raise ValueError(f"bilinmeyen bridge: {name} (geçerli: {', '.join(SUPERVISED_BRIDGES)})")
+            port = SUPERVISED_BRIDGES[name]['port']
+            if port in ports:
+                raise ValueError(f"{name} ve {ports[port]} aynı portu ({port}) kullanıyor")
+            ports[port] = name
+        self.bridges = [SupervisedBridge(name, config) for name in config['bridges']]
+
+    def status(self):
+        return {
+            'pid': os.getpid(),
+            'uptime_s': round(time.monotonic() - self.started, 1),
+            'bridges': {bridge.name: bridge.status() for bridge in self.bridges},
+        }
+
+    def _start_status_server(self):
+        port = self.config['status_port']
+        if not port:
+            return
+        supervisor = self
+
+        class StatusHandler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                if self.path in ['/status', '/health']:
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'application/json')
+                    self.end_headers()
+                    self.wfile.write(json.dumps(supervisor.status()).encode())
+                else:
+                    self.send_response(404)
+                    self.end_headers()
+
+        server = ThreadingHTTPServer(('127.0.0.1', port), StatusHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        logger.info(f"📊 Supervisor durumu: http://127.0.0.1:{port}/status")
+
+    def run(self):
+        self._start_status_server()
+        threads = [
+            threading.Thread(target=bridge.run, args=(self.stop_event,), daemon=True)
+            for bridge in self.bridges
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            # Tüm bridge'ler /shutdown ile kapanınca supervisor da çıkar
+            while any(thread.is_alive() for thread in threads):
+                time.sleep(1)
+        except KeyboardInterrupt:
+            logger.info("🛑 Kapatılıyor...")
+        finally:
+            self.stop_event.set()
+            for bridge in self.bridges:
+                bridge.stop()
+
+
+def main():
+    """Main entry point"""
+    config = load_config()
+
+    parser = argparse.ArgumentParser(description='QuadroAIPilot bridge supervisor')
+    parser.add_argument('--bridges', help=f"Virgülle ayrılmış bridge'ler ({', '.join(SUPERVISED_BRIDGES)})")
+    parser.add_argument('--warm-spare', action='store_true', help='Hazır yedek process tut (sadece unified)')
+    parser.add_argument('--interval', type=float, help='Health kontrol aralığı (sn)')
+    parser.add_argument('--status-port', type=int, help='GET /status portu (0 = kapalı)')
+    args = parser.parse_args()
+
+    if args.bridges:
+        config['bridges'] = [b.strip() for b in args.bridges.split(',') if b.strip()]
+    if args.warm_spare:
+        config['warm_spare'] = True
+    if args.interval:
+        config['check_interval_s'] = args.interval
+    if args.status_port is not None:
+        config['status_port'] = args.status_port
+
+    logger.info("=" * 60)
+    logger.info("🛡️ Bridge Supervisor - QuadroAIPilot")
+    logger.info(f"   Bridge'ler: {', '.join(config['bridges'])}, yedek: {'açık' if config['warm_spare'] else 'kapalı'}")
+    logger.info("=" * 60)
+
+    try:
+        supervisor = Supervisor(config)
+    except (ValueError, OSError) as e:
+        logger.error(f"❌ Supervisor başlatılamadı: {e}")
+        sys.exit(1)
+    supervisor.run()
+
+
+if __name__ == '__main__':
+    main()
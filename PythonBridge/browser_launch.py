@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Chromium başlatma seçenekleri - QuadroAIPilot bridge'leri için
+Pencere modu (ekran dışı pencere veya headless), launch profilleri (latency / balanced / low-memory),
+headless User-Agent düzeltmesi ve provider'ın headless'ı reddedip reddetmediğini saklayan yetenek kaydı
+"""
+
+import json
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+# offscreen: görünür pencere ekran dışında (eski davranış, compositing + pencere yönetimi maliyeti var)
+# headless: yeni headless implementasyonu (--headless=new), pencere yok
+BROWSER_MODES = ('offscreen', 'headless')
+DEFAULT_BROWSER_MODE = 'offscreen'
+
+# Her profilde ortak argümanlar
+BASE_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--disable-dev-shm-usage',
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-accelerated-2d-canvas',
+    '--disable-gpu',
+]
+
+# Playwright'ın (1.40) kendi verdiği --disable-features listesi. Chromium tekrarlanan switch'in sadece
+# son değerini kullanır; profil listesi bununla birleştirilmezse Playwright'ın varsayılanları düşer
+PLAYWRIGHT_DISABLED_FEATURES = [
+    'ImprovedCookieControls', 'LazyFrameLoading', 'GlobalMediaControls', 'DestroyProfileOnBrowserClose',
+    'MediaRouter', 'DialMediaRouteProvider', 'AcceptCHFrame', 'AutoExpandDetailsElement',
+    'CertificateTransparencyComponentUpdater', 'AvoidUnnecessaryBeforeUnloadCheckSync', 'Translate', 'HttpsUpgrades',
+]
+
+# Launch profilleri - RSS / gecikme dengesi (ölçüm: benchmark_browser_modes.py --profiles ...)
+LAUNCH_PROFILES = {
+    # Eski davranış: arka plan sekmeleri ve timer'lar kısılmaz, yanıt/standby sayfası her zaman sıcak
+    'latency': {
+        'description': 'En düşük gecikme, en yüksek bellek/CPU',
+        'args': [
+            '--disable-background-timer-throttling',
+            '--disable-backgrounding-occluded-windows',
+            '--disable-renderer-backgrounding',
+        ],
+    },
+    # Arka plandaki sekmeler (standby) kısılır, ön plandaki sekme ekran dışı pencerede de kısılmaz;
+    # eklenti/yan servisler kapalı, disk cache sınırlı
+    'balanced': {
+        'description': 'Arka plan sekmeleri kısılır, yan servisler kapalı',
+        'args': [
+            '--disable-backgrounding-occluded-windows',
+            '--disable-extensions',
+            '--disable-component-extensions-with-background-pages',
+            '--disable-background-networking',
+            '--disk-cache-size=67108864',
+            '--renderer-process-limit=4',
+        ],
+        'disable_features': ['Translate', 'MediaRouter', 'OptimizationHints', 'AutofillServerCommunication'],
+    },
+    # Renderer sayısı ve V8 heap'i sınırlı, site izolasyonu kapalı (sadece iki sabit site açılıyor),
+    # cache'ler küçük ve agresif boşaltılıyor; Chromium'un tüm arka plan kısıtlamaları açık
+    # (offscreen modda pencere "örtülü" sayılıp kısılabilir, headless ile birlikte önerilir)
+    'low-memory': {
+        'description': 'En düşük RSS; ilk yanıt ve sekme geçişi yavaşlayabilir',
+        'args': [
+            '--disable-extensions',
+            '--disable-component-extensions-with-background-pages',
+            '--disable-background-networking',
+            '--disable-site-isolation-trials',
+            '--renderer-process-limit=2',
+            '--process-per-site',
+            '--js-flags=--max-old-space-size=512',
+            '--disk-cache-size=33554432',
+            '--media-cache-size=16777216',
+            '--aggressive-cache-discard',
+        ],
+        'disable_features': [
+            'Translate', 'MediaRouter', 'OptimizationHints', 'AutofillServerCommunication',
+            'IsolateOrigins', 'BackForwardCache',
+        ],
+    },
+}
+DEFAULT_LAUNCH_PROFILE = 'latency'
+
+# --headless=new bu Chromium sürümünden itibaren tam tarayıcı ile aynı render yolunu kullanır
+NEW_HEADLESS_MIN_VERSION = 112
+
+# Reddedilen provider bu süre boyunca headless denenmeden ekran dışı pencereyle açılır
+HEADLESS_RECHECK_S = 7 * 24 * 3600
+
+appdata_base = os.path.join(os.getenv('LOCALAPPDATA') or os.path.expanduser('~'), 'QuadroAIPilot')
+config_file = os.path.join(appdata_base, 'bridge_config.json')
+capability_file = os.path.join(appdata_base, 'browser_capability.json')
+
+# Bot / challenge sayfası işaretleri (Cloudflare, Google "unusual traffic")
+DETECT_REJECTION_JS = '''(editorSelector) => {
+    const title = (document.title || '').toLowerCase();
+    const body = (document.body ? document.body.innerText : '').slice(0, 4000).toLowerCase();
+    const markers = [
+        'just a moment', 'verify you are human', 'checking your browser',
+        'unusual traffic', 'robot olmadığınızı', 'insan olduğunuzu'
+    ];
+    for (const marker of markers) {
+        if (title.includes(marker) || body.includes(marker)) {
+            return 'challenge: ' + marker;
+        }
+    }
+    if (document.querySelector('#challenge-form, iframe[src*="challenges.cloudflare.com"]')) {
+        return 'challenge: cloudflare';
+    }
+    if (editorSelector && !document.querySelector(editorSelector)) {
+        return 'editor-not-found';
+    }
+    return null;
+}'''
+
+# navigator.userAgent'tan "HeadlessChrome" izini sil (her dokümana önceden yüklenir)
+USER_AGENT_OVERRIDE_JS = '''(() => {
+    const ua = %s;
+    Object.defineProperty(Navigator.prototype, 'userAgent', {get: () => ua});
+    Object.defineProperty(Navigator.prototype, 'appVersion', {get: () => ua.replace(/^Mozilla\\//, '')});
+})();'''
+
+
+def _load_setting(key, env_name, choices, default, config=None):
+    """
+    Ayar sırası: ortam değişkeni > bridge_config.json > varsayılan
+    config verilirse (unified bridge zaten yüklemiş) dosya tekrar okunmaz
+    """
+    value = os.getenv(env_name)
+    if not value:
+        if config is None:
+            config = {}
+            if os.path.exists(config_file):
+                try:
+                    with open(config_file, 'r', encoding='utf-8') as f:
+                        config = json.load(f)
+                except Exception as e:
+                    logger.warning(f"⚠️ Ayar dosyası okunamadı: {e}")
+        value = config.get(key, default)
+
+    value = str(value).strip().lower()
+    if value not in choices:
+        logger.warning(f"⚠️ Bilinmeyen {key} '{value}', {default} kullanılıyor")
+        value = default
+    return value
+
+
+def load_browser_mode(config=None):
+    """Pencere modu: QUADRO_BROWSER_MODE > bridge_config.json "browser_mode" > offscreen"""
+    return _load_setting('browser_mode', 'QUADRO_BROWSER_MODE', BROWSER_MODES, DEFAULT_BROWSER_MODE, config)
+
+
+def load_launch_profile(config=None):
+    """Launch profili: QUADRO_LAUNCH_PROFILE > bridge_config.json "launch_profile" > latency"""
+    return _load_setting('launch_profile', 'QUADRO_LAUNCH_PROFILE', LAUNCH_PROFILES, DEFAULT_LAUNCH_PROFILE, config)
+
+
+def launch_args(profile):
+    """Profilin Chromium argümanları (pencere modu argümanları hariç)"""
+    args = BASE_ARGS + LAUNCH_PROFILES[profile]['args']
+    features = LAUNCH_PROFILES[profile].get('disable_features')
+    if features:
+        # Playwright'ın listesiyle birleştir (tekrarsız, sıra korunur)
+        merged = list(dict.fromkeys(PLAYWRIGHT_DISABLED_FEATURES + features))
+        args = args + ['--disable-features=' + ','.join(merged)]
+    return args
+
+
+def window_options(mode, size=(840, 480), position=(-10000, -10000), minimized=True):
+    """
+    Moda göre launch(headless=..., args=[...]) seçenekleri
+    Yeni headless için headless=False + --headless=new verilir (Playwright headless=True eski
+    headless implementasyonunu seçer). Headless'ta sayfa boyutunu context viewport'u belirler.
+    """
+    if mode == 'headless':
+        return {'headless': False, 'args': ['--headless=new']}
+
+    args = [f'--window-position={position[0]},{position[1]}']  # Ekran dışına taşı
+    if minimized:
+        args.append('--start-minimized')
+    args.append(f'--window-size={size[0]},{size[1]}')
+    return {'headless': False, 'args': args}
+
+
+def chromium_major_version(version):
+    """'120.0.6099.28' → 120 (okunamazsa 0)"""
+    try:
+        return int(str(version).split('.')[0])
+    except ValueError:
+        return 0
+
+
+async def apply_headless_user_agent(context, page):
+    """
+    Headless Chromium User-Agent'ındaki "HeadlessChrome"u "Chrome" yap
+    (hem HTTP başlığı hem navigator.userAgent) - düzeltilmiş UA'yı döndürür
+    """
+    user_agent = await page.evaluate('() => navigator.userAgent')
+    fixed = user_agent.replace('HeadlessChrome', 'Chrome')
+    if fixed != user_agent:
+        await context.set_extra_http_headers({'User-Agent': fixed})
+        await context.add_init_script(USER_AGENT_OVERRIDE_JS % json.dumps(fixed))
+        logger.info(f"🕶️ Headless User-Agent düzeltildi: {fixed}")
+    return fixed
+
+
+async def detect_rejection(page, editor_selector=None):
+    """Sayfa headless'ı reddetti mi? (challenge sayfası / editör yok) - neden veya None"""
+    try:
+        if page.is_closed():
+            return 'page-closed'
+        return await page.evaluate(DETECT_REJECTION_JS, editor_selector)
+    except Exception as e:
+        return f'check-failed: {e}'
+
+
+class HeadlessCapability:
+    """Provider başına headless yetenek kaydı (browser_capability.json)"""
+
+    def __init__(self, path=capability_file):
+        self.path = path
+        self.data = {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.data = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    def allowed(self, provider):
+        """Son HEADLESS_RECHECK_S içinde reddedildiyse False"""
+        entry = self.data.get(provider)
+        if not entry or entry.get('headless'):
+            return True
+        return time.time() - entry.get('checked', 0) > HEADLESS_RECHECK_S
+
+    def record_check(self, provider, reason):
+        """
+        detect_rejection sonucunu işle: kabul ve challenge kalıcı kaydedilir; geçici hatalar
+        (page-not-ready, editor-not-found, check-failed...) sadece bu oturumu etkiler
+        """
+        if reason is None:
+            self.record(provider, True)
+        elif reason.startswith('challenge:'):
+            self.record(provider, False, reason)
+        else:
+            logger.info(f"🕶️ {provider}: geçici hata ({reason}), headless kaydı değiştirilmedi")
+
+    def record(self, provider, ok, reason=None):
+        self.data[provider] = {'headless': ok, 'checked': time.time(), 'reason': reason}
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(self.data, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            logger.warning(f"⚠️ Headless yetenek kaydı yazılamadı: {e}")
@@ -11,10 +11,17 @@ import asyncio
 import json
 import logging
 import sys
+import uuid
 from datetime import datetime
 from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
 import websockets
 
+from page_scripts import STOP_GENERATION_JS
+from stream_watch import STREAM_URL_PATTERNS, StreamCompletionWatcher
+
+# ChatGPT "Stop generating" butonu
+STOP_SELECTOR = 'button[data-testid="stop-button"], button[aria-label*="Stop"]'
+
 # Logging ayarları
 logging.basicConfig(
     level=logging.INFO,
@@ -39,6 +46,12 @@ class ChatGPTBridge:
         self.clients = set()
         self.is_ready = False
 
+        # Sayfada tek seferde tek mesaj; bekleyenler ID ile iptal edilebilir
+        self.send_lock = None
+        self.pending = {}  # request_id → task (kuyrukta veya çalışıyor)
+        self.current_request_id = None
+        self.cancel_event = None
+
     async def init_browser(self):
         """Playwright browser'ı başlat"""
         try:
@@ -105,52 +118,96 @@ class ChatGPTBridge:
             prev_count = await self.page.locator('[data-message-author-role="assistant"]').count()
             logger.info(f"🔍 Mesaj göndermeden ÖNCE mevcut assistant mesajları: {prev_count}")
 
-            # Textarea'ya yaz
-            textarea_selector = 'textarea[placeholder*="Message"], textarea#prompt-textarea, div[contenteditable="true"]'
-            await self.page.fill(textarea_selector, message)
-            await self.page.wait_for_timeout(500)
-
-            # Enter tuşuna bas
-            await self.page.press(textarea_selector, 'Enter')
-            logger.info("✅ Mesaj gönderildi, yanıt bekleniyor...")
-
-            # Yeni assistant mesajının gelmesini bekle
-            response_text = ""
-            max_wait = 60  # 60 saniye max
-            start_time = asyncio.get_event_loop().time()
-
-            while (asyncio.get_event_loop().time() - start_time) < max_wait:
-                await self.page.wait_for_timeout(1000)
-
-                # Yeni assistant mesaj sayısı
-                current_count = await self.page.locator('[data-message-author-role="assistant"]').count()
-
-                if current_count > prev_count:
-                    logger.info(f"🔍 Yeni assistant mesajı geldi! (toplam: {current_count}, önceki: {prev_count})")
-
-                    # En son assistant mesajını al
-                    last_assistant = self.page.locator('[data-message-author-role="assistant"]').last
-
-                    # İlk içerik geldi mi?
-                    response_text = await last_assistant.inner_text()
-                    if response_text and len(response_text) > 3:
-                        logger.info(f"🔥 İlk içerik geldi: {response_text[:50]}...")
-
-                        # Yanıt tamamlandı mı kontrol et (typing animasyonu bitti mi?)
-                        # Stop button kayboldu mu?
-                        stop_button = self.page.locator('button[aria-label*="Stop"]')
-                        stop_count = await stop_button.count()
-
-                        if stop_count == 0:
-                            # Stop button yok = yanıt tamamlandı
-                            # 2 saniye daha bekle (yanıt tamamen render edilsin)
-                            logger.info("⏳ Stop button kayboldu, son render için 2s bekleniyor...")
-                            await self.page.wait_for_timeout(2000)
-
-                            # Yanıtı tekrar al (tamamen render edilmiş hali)
-                            response_text = await last_assistant.inner_text()
-                            logger.info(f"✅ Final yanıt alındı: {len(response_text)} karakter")
-                            break
+            # Streaming isteğini (conversation SSE) gönderimden ÖNCE izlemeye başla
+            watcher = StreamCompletionWatcher(self.page, STREAM_URL_PATTERNS['chatgpt'])
+            watcher.attach()
+
+            try:
+                # Textarea'ya yaz
+                textarea_selector = 'textarea[placeholder*="Message"], textarea#prompt-textarea, div[contenteditable="true"]'
+                await self.page.fill(textarea_selector, message)
+                await self.page.wait_for_timeout(500)
+
+                # Enter tuşuna bas
+                await self.page.press(textarea_selector, 'Enter')
+                logger.info("✅ Mesaj gönderildi, yanıt bekleniyor...")
+
+                # Yeni assistant mesajının gelmesini bekle
+                response_text = ""
+                max_wait = 60  # 60 saniye max
+                start_time = asyncio.get_event_loop().time()
+
+                while (asyncio.get_event_loop().time() - start_time) < max_wait:
+                    # Streaming isteği biterse 1 saniye dolmadan uyan
+                    await watcher.wait(1.0)
+
+                    if self.cancel_event is not None and self.cancel_event.is_set():
+                        # Kullanıcı iptal etti ("dur", "iptal") - üretimi durdur, sayfayı boşalt
+                        stopped = await self.page.evaluate(STOP_GENERATION_JS, STOP_SELECTOR)
+                        logger.info(f"⏹️ İstek iptal edildi{', üretim durduruldu' if stopped else ''}")
+                        return {
+                            'success': False,
+                            'cancelled': True,
+                            'error': 'İstek iptal edildi',
+                            'duration': asyncio.get_event_loop().time() - start_time
+                        }
+
+                    # Yeni assistant mesaj sayısı
+                    current_count = await self.page.locator('[data-message-author-role="assistant"]').count()
+
+                    if current_count <= prev_count and watcher.done:
+                        # Stream bitti ama yeni mesaj yok: istek hatalıysa yanıt gelmeyecek;
+                        # değilse DOM güncellenene kadar bekle (wait artık hemen döner, IPC'yi sıkıştırma)
+                        if watcher.failed:
+                            raise Exception("ChatGPT streaming isteği başarısız oldu, yanıt gelmedi")
+                        await asyncio.sleep(0.5)
+                        continue
+
+                    if current_count > prev_count:
+                        logger.info(f"🔍 Yeni assistant mesajı geldi! (toplam: {current_count}, önceki: {prev_count})")
+
+                        # En son assistant mesajını al
+                        last_assistant = self.page.locator('[data-message-author-role="assistant"]').last
+
+                        if watcher.seen:
+                            # Ağ sinyali: SSE isteği bitti = yanıt tamamlandı
+                            if watcher.done:
+                                if watcher.failed:
+                                    raise Exception("ChatGPT streaming isteği başarısız oldu, yanıt yarım kaldı")
+                                # Son token'lar DOM'a henüz yazılmamış olabilir: Stop kontrolü kalkana kadar
+                                # bekle, ardından bir render turu daha bekleyip oku (unified bridge ile aynı)
+                                if await self.page.locator(STOP_SELECTOR).count() > 0:
+                                    await asyncio.sleep(0.05)
+                                    continue
+                                await asyncio.sleep(0.05)
+                                response_text = await last_assistant.inner_text()
+                                logger.info(f"✅ Stream bitti, final yanıt alındı: {len(response_text)} karakter")
+                                break
+                            continue
+
+                        # Yedek: SSE isteği görülmedi, Stop button'a bak
+                        # İlk içerik geldi mi?
+                        response_text = await last_assistant.inner_text()
+                        if response_text and len(response_text) > 3:
+                            logger.info(f"🔥 İlk içerik geldi: {response_text[:50]}...")
+
+                            # Yanıt tamamlandı mı kontrol et (typing animasyonu bitti mi?)
+                            # Stop button kayboldu mu?
+                            stop_button = self.page.locator('button[aria-label*="Stop"]')
+                            stop_count = await stop_button.count()
+
+                            if stop_count == 0:
+                                # Stop button yok = yanıt tamamlandı
+                                # 2 saniye daha bekle (yanıt tamamen render edilsin)
+                                logger.info("⏳ Stop button kayboldu, son render için 2s bekleniyor...")
+                                await self.page.wait_for_timeout(2000)
+
+                                # Yanıtı tekrar al (tamamen render edilmiş hali)
+                                response_text = await last_assistant.inner_text()
+                                logger.info(f"✅ Final yanıt alındı: {len(response_text)} karakter")
+                                break
+            finally:
+                watcher.detach()
 
             duration = asyncio.get_event_loop().time() - start_time
             logger.info("✅ ChatGPT yanıtı tamamlandı")
@@ -191,18 +248,20 @@ class ChatGPTBridge:
 
                     if data.get('type') == 'send_to_chatgpt':
                         user_message = data.get('message', '')
+                        request_id = data.get('request_id') or uuid.uuid4().hex[:12]
                         logger.info(f"📤 ChatGPT'ye mesaj gönderiliyor: {user_message}...")
 
-                        # ChatGPT'ye gönder
-                        result = await self.send_message_to_chatgpt(user_message)
+                        # Gönderim task olarak çalışır, bu sırada cancel frame'i okunabilir
+                        self.pending[request_id] = asyncio.create_task(
+                            self._process_send(websocket, request_id, user_message)
+                        )
 
-                        # Yanıtı client'a gönder
+                    elif data.get('type') == 'cancel':
+                        result = self.cancel(data.get('request_id'))
                         await websocket.send(json.dumps({
-                            'type': 'chatgpt_response',
-                            'success': result.get('success', False),
-                            'content': result.get('content', ''),
-                            'error': result.get('error'),
-                            'duration': result.get('duration', 0),
+                            'type': 'cancel_result',
+                            'request_id': data.get('request_id'),
+                            **result,
                             'timestamp': datetime.now().isoformat()
                         }))
 
@@ -214,6 +273,60 @@ class ChatGPTBridge:
         finally:
             self.clients.discard(websocket)
 
+    async def _process_send(self, websocket, request_id, user_message):
+        """Mesajı sırası gelince gönder ve yanıtı client'a ilet"""
+        if self.send_lock is None:
+            self.send_lock = asyncio.Lock()
+
+        try:
+            async with self.send_lock:
+                self.current_request_id = request_id
+                self.cancel_event = asyncio.Event()
+                try:
+                    result = await self.send_message_to_chatgpt(user_message)
+                finally:
+                    self.current_request_id = None
+                    self.cancel_event = None
+        except asyncio.CancelledError:
+            # Sırası gelmeden iptal edildi
+            result = {'success': False, 'cancelled': True, 'error': 'İstek iptal edildi'}
+        finally:
+            self.pending.pop(request_id, None)
+
+        # Yanıtı client'a gönder
+        try:
+            await websocket.send(json.dumps({
+                'type': 'chatgpt_response',
+                'request_id': request_id,
+                'success': result.get('success', False),
+                'cancelled': result.get('cancelled', False),
+                'content': result.get('content', ''),
+                'error': result.get('error'),
+                'duration': result.get('duration', 0),
+                'timestamp': datetime.now().isoformat()
+            }))
+        except websockets.exceptions.ConnectionClosed:
+            logger.info("connection closed")
+
+    def cancel(self, request_id=None):
+        """
+        İptal: request_id verilmezse çalışan istek, verilirse o istek
+        (kuyruktaysa hiç gönderilmez, çalışıyorsa üretim durdurulur)
+        """
+        if request_id is None or request_id == self.current_request_id:
+            if self.cancel_event is None:
+                return {'status': 'not_found'}
+            self.cancel_event.set()
+            logger.info(f"🛑 Çalışan istek iptal ediliyor: {self.current_request_id}")
+            return {'status': 'ok', 'running': 1, 'queued': 0}
+
+        task = self.pending.get(request_id)
+        if task is None or task.done():
+            return {'status': 'not_found'}
+        task.cancel()
+        logger.info(f"🛑 Kuyruktaki istek iptal edildi: {request_id}")
+        return {'status': 'ok', 'running': 0, 'queued': 1}
+
     async def start_server(self, host='localhost', port=8765):
         """WebSocket sunucusunu başlat"""
         logger.info("╔═══════════════════════════════════════════════════════════╗")
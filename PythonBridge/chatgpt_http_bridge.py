@@ -10,10 +10,22 @@ import logging
 import os
 import sys
 from datetime import datetime
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from playwright.async_api import async_playwright
 import threading
 
+from bridge_process import exit_with_parent, parse_args, probe_response
+from browser_launch import (
+    HeadlessCapability,
+    apply_headless_user_agent,
+    detect_rejection,
+    launch_args,
+    load_browser_mode,
+    load_launch_profile,
+    window_options,
+)
+from dom_access import response_text, wait_visible
+
 # Log klasörünü hazırla (AppData/QuadroAIPilot/Logs)
 log_dir = os.path.join(os.getenv('LOCALAPPDATA'), 'QuadroAIPilot', 'Logs')
 os.makedirs(log_dir, exist_ok=True)
@@ -50,38 +62,37 @@ class ChatGPTBridge:
         self.page = None
         self.is_ready = False
         self.loop = None
+        self.browser_mode = None
+        self.launch_profile = None
 
-    async def init_browser(self):
-        """Playwright browser başlat"""
+    async def init_browser(self, mode=None):
+        """Playwright browser başlat (mode: 'headless' / 'offscreen', verilmezse ayardan)"""
         try:
+            if mode is None:
+                mode = load_browser_mode()
+                if mode == 'headless' and not HeadlessCapability().allowed('chatgpt'):
+                    logger.info("🕶️ Headless yakın zamanda reddedildi, ekran dışı pencere kullanılıyor")
+                    mode = 'offscreen'
+            self.browser_mode = mode
+            self.launch_profile = load_launch_profile()
+            window = window_options(mode, size=(840, 480), position=(-10000, -10000))
+
             logger.info("🚀 Playwright başlatılıyor...")
             self.playwright = await async_playwright().start()
 
             # Chrome profili ile kalıcı oturum (GÖRÜNÜR MOD - ChatGPT login için)
             # DÜZELTME: Stable chrome args + devtools + timeout artırıldı
+            # browser_mode=offscreen: ekran dışı görünür pencere, headless: --headless=new
             self.browser = await self.playwright.chromium.launch_persistent_context(
                 user_data_dir='./chrome-profile',
-                headless=False,  # ✅ GÖRÜNÜR: ChatGPT'ye giriş yapabilmek için pencere açık (bot detection bypass)
+                headless=window['headless'],
                 viewport={'width': 840, 'height': 480},  # Kompakt boyut
-                args=[
-                    '--window-position=-10000,-10000',  # 🆕 EKLENDI: Ekran dışına taşı (kullanıcı görmez)
-                    '--start-minimized',  # 🆕 EKLENDI: Başlangıçta minimize
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-dev-shm-usage',  # ✅ EKLENDI: Shared memory crash fix
-                    '--no-sandbox',
-                    '--disable-setuid-sandbox',
-                    '--disable-accelerated-2d-canvas',
-                    '--disable-gpu',
-                    '--window-size=840,480',
-                    '--disable-background-timer-throttling',
-                    '--disable-backgrounding-occluded-windows',
-                    '--disable-renderer-backgrounding'
-                ],
+                args=window['args'] + launch_args(self.launch_profile),
                 timeout=120000,  # ✅ 60s → 120s (browser startup zaman aşımı)
                 devtools=False  # ✅ Devtools'u kapat (performans)
             )
 
-            logger.info("📁 Chrome profili: ./chrome-profile")
+            logger.info(f"📁 Chrome profili: ./chrome-profile ({mode}, profil: {self.launch_profile})")
 
             # Sayfa al veya oluştur
             pages = self.browser.pages
@@ -92,6 +103,9 @@ class ChatGPTBridge:
                 self.page = await self.browser.new_page()
                 logger.info("📄 Yeni sekme oluşturuldu")
 
+            if mode == 'headless':
+                await apply_headless_user_agent(self.browser, self.page)
+
             # DÜZELTME: Page close event listener ekle (browser crash detection)
             self.page.on('close', lambda: logger.warning("⚠️ Page closed unexpectedly!"))
 
@@ -123,11 +137,15 @@ class ChatGPTBridge:
             # Page health check: Temel elementleri kontrol et
             try:
                 # UTM URL için daha spesifik selector (ProseMirror editör)
-                await self.page.wait_for_selector('#prompt-textarea, div.ProseMirror, textarea[name="prompt-textarea"]', timeout=15000)
+                await wait_visible(self.page, '#prompt-textarea, div.ProseMirror, textarea[name="prompt-textarea"]', timeout=15000)
                 logger.info("✅ ChatGPT input elementi bulundu, page sağlıklı")
             except:
                 logger.warning("⚠️ ChatGPT input elementi bulunamadı, ama devam ediliyor...")
 
+            # Headless yetenek kontrolü: reddedildiyse ekran dışı pencereyle yeniden başlat
+            if mode == 'headless' and not await self._headless_accepted():
+                return await self.init_browser(mode='offscreen')
+
             # NOT: System prompt kaldırıldı - kimlik soruları artık C# uygulama seviyesinde yakalanıyor
             self.is_ready = True
             logger.info("✅ ChatGPT browser hazır!")
@@ -137,6 +155,23 @@ class ChatGPTBridge:
             logger.error(f"❌ Browser başlatma hatası: {e}")
             return False
 
+    async def _headless_accepted(self):
+        """Sayfa challenge'sız ve editör hazır mı? Değilse browser'ı kapatır (challenge kalıcı kaydedilir)"""
+        reason = await detect_rejection(self.page, '#prompt-textarea, div.ProseMirror, textarea[name="prompt-textarea"]')
+        HeadlessCapability().record_check('chatgpt', reason)
+        if reason is None:
+            logger.info("🕶️ ChatGPT headless kabul etti")
+            return True
+
+        logger.warning(f"🕶️ ChatGPT headless reddetti ({reason}), ekran dışı pencere moduna dönülüyor...")
+        try:
+            await self.browser.close()
+            await self.playwright.stop()
+        except Exception as e:
+            logger.warning(f"⚠️ Browser kapatma hatası: {e}")
+        self.browser = self.page = self.playwright = None
+        return False
+
     async def dismiss_all_modals(self):
         """TÜM modal'ları JavaScript ile DOM'dan sil (rate limit, signup)"""
         try:
@@ -242,7 +277,7 @@ class ChatGPTBridge:
 
             for selector, description in selectors:
                 try:
-                    await self.page.wait_for_selector(selector, timeout=10000)
+                    await wait_visible(self.page, selector, timeout=10000)
                     textarea_selector = selector
                     logger.info(f"✅ Input bulundu: {description}")
                     break
@@ -254,7 +289,8 @@ class ChatGPTBridge:
                 raise Exception("❌ Hiçbir input selector bulunamadı!")
 
             # Contenteditable div için type() kullan (headless modda daha güvenilir)
-            element = await self.page.query_selector(textarea_selector)
+            # Locator: ElementHandle oluşmaz (uzun oturumda handle birikmez)
+            element = self.page.locator(textarea_selector).first
             await element.click()  # Focus et
             await element.type(message)  # type() fill()'den daha güvenilir
             await self.page.keyboard.press('Enter')  # Klavye emülasyonu kullan
@@ -263,7 +299,7 @@ class ChatGPTBridge:
             response_selector = 'div[data-message-author-role="assistant"]'
             logger.info("⏳ Yanıt bekleniyor...")
 
-            await self.page.wait_for_selector(response_selector, timeout=120000)  # 2 dakika
+            await wait_visible(self.page, response_selector, timeout=120000)  # 2 dakika
             logger.info("✅ Yanıt elementi bulundu, streaming bekleniyor...")
 
             # Streaming bitene kadar bekle (içerik uzunluğu sabitlenene kadar)
@@ -276,9 +312,9 @@ class ChatGPTBridge:
             for i in range(max_wait * 2):  # 500ms * 60 = 30 saniye
                 await self.page.wait_for_timeout(polling_interval)
 
-                elements = await self.page.query_selector_all(response_selector)
-                if elements:
-                    current_text = await elements[-1].inner_text()
+                # Tek evaluate: son yanıtın metni (handle yok)
+                count, current_text = await response_text(self.page, response_selector)
+                if count:
                     current_length = len(current_text)
 
                     if current_length == prev_length and current_length > 0:
@@ -303,16 +339,13 @@ class ChatGPTBridge:
                         logger.info(f"📊 Streaming: {current_length} karakter (deneme {i+1}/{max_wait*2})")
 
             # Son yanıtı al
-            elements = await self.page.query_selector_all(response_selector)
-            if elements:
-                last_element = elements[-1]
-                response_text = await last_element.inner_text()
-
-                logger.info(f"✅ Yanıt alındı: {len(response_text)} karakter")
+            count, final_text = await response_text(self.page, response_selector)
+            if count:
+                logger.info(f"✅ Yanıt alındı: {len(final_text)} karakter")
 
                 return {
                     "IsError": False,  # C# property ismi (PascalCase)
-                    "Content": response_text,  # C# property ismi (PascalCase)
+                    "Content": final_text,  # C# property ismi (PascalCase)
                     "ErrorMessage": None,  # C# property ismi (PascalCase)
                     "timestamp": datetime.now().isoformat()
                 }
@@ -347,6 +380,10 @@ class ChatGPTBridge:
 # Global bridge instance
 bridge = ChatGPTBridge()
 
+# Health istekleri paralel yanıtlanır (supervisor probe'u uzun yanıtta takılmasın),
+# mesajlar sayfada yine tek tek işlenir
+chat_lock = threading.Lock()
+
 
 class ChatGPTHandler(BaseHTTPRequestHandler):
     """HTTP Request Handler"""
@@ -361,8 +398,20 @@ class ChatGPTHandler(BaseHTTPRequestHandler):
             self.send_response(200)
             self.send_header('Content-Type', 'application/json')
             self.end_headers()
-            response = json.dumps({"status": "ok", "ready": bridge.is_ready})
+            response = json.dumps({
+                "status": "ok",
+                "ready": bridge.is_ready,
+                "browser_mode": bridge.browser_mode,
+                "launch_profile": bridge.launch_profile
+            })
             self.wfile.write(response.encode())
+        elif self.path == '/health/probe':
+            # Derin health check (bridge_supervisor.py): sayfaya evaluate round-trip'i
+            code, body = probe_response(bridge.loop, {'page': bridge.page}, bridge.is_ready)
+            self.send_response(code)
+            self.send_header('Content-Type', 'application/json')
+            self.end_headers()
+            self.wfile.write(json.dumps(body).encode())
         else:
             self.send_response(404)
             self.end_headers()
@@ -381,11 +430,12 @@ class ChatGPTHandler(BaseHTTPRequestHandler):
                 # Async fonksiyonu sync olarak çalıştır
                 loop = bridge.loop
                 if loop and loop.is_running():
-                    future = asyncio.run_coroutine_threadsafe(
-                        bridge.send_message(message),
-                        loop
-                    )
-                    result = future.result(timeout=300)  # 5 dakika timeout (ChatGPT uzun yanıtlar için)
+                    with chat_lock:
+                        future = asyncio.run_coroutine_threadsafe(
+                            bridge.send_message(message),
+                            loop
+                        )
+                        result = future.result(timeout=300)  # 5 dakika timeout (ChatGPT uzun yanıtlar için)
                 else:
                     result = {
                         "IsError": True,
@@ -469,15 +519,18 @@ async def run_async():
         await asyncio.sleep(1)
 
 
-def start_server():
+def start_server(port=8765):
     """HTTP server başlat"""
-    server = HTTPServer(('127.0.0.1', 8765), ChatGPTHandler)
-    logger.info("🌐 HTTP Server başlatıldı: http://127.0.0.1:8765")
+    server = ThreadingHTTPServer(('127.0.0.1', port), ChatGPTHandler)
+    server.daemon_threads = True
+    logger.info(f"🌐 HTTP Server başlatıldı: http://127.0.0.1:{port}")
     server.serve_forever()
 
 
 def main():
     """Main entry point"""
+    args = parse_args('ChatGPT HTTP Bridge', default_port=8765)
+
     logger.info("=" * 60)
     logger.info("🚀 ChatGPT HTTP Bridge - QuadroAIPilot")
     logger.info("=" * 60)
@@ -487,8 +540,11 @@ def main():
     asyncio.set_event_loop(loop)
     bridge.loop = loop
 
+    if args.supervised:
+        exit_with_parent(bridge)
+
     # Async task başlat (background)
-    loop.run_in_executor(None, start_server)
+    loop.run_in_executor(None, start_server, args.port)
 
     # Browser başlat ve event loop çalıştır
     try:
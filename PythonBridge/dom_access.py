@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+ElementHandle'sız DOM erişimi - QuadroAIPilot bridge'leri için
+query_selector / query_selector_all / wait_for_selector her çağrıda ElementHandle oluşturur;
+dispose edilmeyen handle frame'e bağlı kalır ve sayfa kapanana kadar (hem Python hem Chromium
+tarafında) yaşar. Sıcak yollar locator (count / click / type), primitive döndüren evaluate ve
+dönen handle'ı hemen dispose eden bekleme kullanır; audit_page() canlı handle ve DOM sayaçlarını
+raporlar (uzun oturumda bellek düz mü?)
+"""
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from page_scripts import RESPONSE_TEXT_JS
+
+# Bu kadar canlı handle varsa sızıntı şüphesi (düzgün yolda tur dışında ~0 olmalı)
+HANDLE_LEAK_WARN = 50
+
+
+async def wait_visible(page, selector, timeout=30000):
+    """wait_for_selector(state='visible') - bekleme tarayıcıda, dönen handle hemen dispose edilir"""
+    # Locator.wait_for kullanılmaz: içeride wait_for_selector çağırır, dönen handle dispose edilmez
+    handle = await page.wait_for_selector(selector, state='visible', timeout=timeout)
+    if handle is not None:
+        await handle.dispose()
+
+
+async def first_visible(page, selectors, timeout=10000):
+    """Sırayla denenen selector'lardan ilk görünür olanı (selector başına timeout ms) - yoksa None"""
+    for selector in selectors:
+        try:
+            await wait_visible(page, selector, timeout)
+            return selector
+        except PlaywrightTimeoutError:
+            continue
+    return None
+
+
+async def response_text(page, selector, index=None):
+    """(eleman sayısı, index'teki (None: son) elemanın innerText'i veya None) - tek evaluate"""
+    result = await page.evaluate(RESPONSE_TEXT_JS, {'selector': selector, 'index': index})
+    return result['count'], result['text']
+
+
+def live_handle_count(page):
+    """
+    Sayfanın frame'lerine bağlı canlı ElementHandle / JSHandle sayısı
+    Playwright'ın iç nesne tablosundan okunur (public API yok); okunamazsa None
+    """
+    try:
+        impl = page._impl_obj
+        objects = list(impl._connection._objects.values())
+    except AttributeError:
+        return None
+
+    count = 0
+    for obj in objects:
+        if getattr(obj, '_type', None) not in ('ElementHandle', 'JSHandle'):
+            continue
+        # Handle'ın sahibi frame (ElementHandle.query_selector ile oluşanlarda başka bir handle)
+        owner = getattr(obj, '_parent', None)
+        while owner is not None and not hasattr(owner, '_page'):
+            owner = getattr(owner, '_parent', None)
+        if owner is not None and owner._page is impl:
+            count += 1
+    return count
+
+
+async def dom_counters(context, page):
+    """Renderer DOM sayaçları (CDP Memory.getDOMCounters) ve JS heap kullanımı"""
+    session = await context.new_cdp_session(page)
+    try:
+        counters = await session.send('Memory.getDOMCounters')
+        heap = await session.send('Runtime.getHeapUsage')
+    finally:
+        await session.detach()
+    return {
+        'dom_nodes': counters['nodes'],
+        'documents': counters['documents'],
+        'js_event_listeners': counters['jsEventListeners'],
+        'js_heap_mb': round(heap['usedSize'] / (1024 * 1024), 1),
+    }
+
+
+async def audit_page(context, page):
+    """Tek sayfa denetimi: canlı handle sayısı + DOM sayaçları"""
+    audit = await dom_counters(context, page)
+    audit['live_handles'] = live_handle_count(page)
+    return audit
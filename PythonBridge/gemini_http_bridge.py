@@ -11,10 +11,22 @@ import logging
 import os
 import sys
 from datetime import datetime
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from playwright.async_api import async_playwright
 import threading
 
+from bridge_process import exit_with_parent, parse_args, probe_response
+from browser_launch import (
+    HeadlessCapability,
+    apply_headless_user_agent,
+    detect_rejection,
+    launch_args,
+    load_browser_mode,
+    load_launch_profile,
+    window_options,
+)
+from dom_access import response_text, wait_visible
+
 # Log klasörünü hazırla (AppData/QuadroAIPilot/Logs)
 log_dir = os.path.join(os.getenv('LOCALAPPDATA'), 'QuadroAIPilot', 'Logs')
 os.makedirs(log_dir, exist_ok=True)
@@ -51,36 +63,36 @@ class GeminiBridge:
         self.page = None
         self.is_ready = False
         self.loop = None
+        self.browser_mode = None
+        self.launch_profile = None
 
-    async def init_browser(self):
-        """Playwright browser başlat"""
+    async def init_browser(self, mode=None):
+        """Playwright browser başlat (mode: 'headless' / 'offscreen', verilmezse ayardan)"""
         try:
+            if mode is None:
+                mode = load_browser_mode()
+                if mode == 'headless' and not HeadlessCapability().allowed('gemini'):
+                    logger.info("🕶️ Headless yakın zamanda reddedildi, ekran dışı pencere kullanılıyor")
+                    mode = 'offscreen'
+            self.browser_mode = mode
+            self.launch_profile = load_launch_profile()
+            window = window_options(mode, size=(1, 1), position=(-2400, -2400), minimized=False)
+
             logger.info("🚀 Playwright başlatılıyor...")
             self.playwright = await async_playwright().start()
 
             # Chrome profili ile kalıcı oturum (GİZLİ MOD - Arka planda çalışır)
+            # browser_mode=offscreen: ekran dışı 1x1 pencere, headless: --headless=new
             self.browser = await self.playwright.chromium.launch_persistent_context(
                 user_data_dir='./gemini-profile',
-                headless=False,  # False ama minimized/gizli
+                headless=window['headless'],
                 viewport={'width': 840, 'height': 480},
-                args=[
-                    '--window-position=-2400,-2400',  # Ekran dışı pozisyon
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-dev-shm-usage',
-                    '--no-sandbox',
-                    '--disable-setuid-sandbox',
-                    '--disable-accelerated-2d-canvas',
-                    '--disable-gpu',
-                    '--window-size=1,1',  # Minimum boyut (görünmez)
-                    '--disable-background-timer-throttling',
-                    '--disable-backgrounding-occluded-windows',
-                    '--disable-renderer-backgrounding'
-                ],
+                args=window['args'] + launch_args(self.launch_profile),
                 timeout=120000,
                 devtools=False
             )
 
-            logger.info("📁 Chrome profili: ./gemini-profile")
+            logger.info(f"📁 Chrome profili: ./gemini-profile ({mode}, profil: {self.launch_profile})")
 
             # Sayfa al veya oluştur
             pages = self.browser.pages
@@ -91,6 +103,9 @@ class GeminiBridge:
                 self.page = await self.browser.new_page()
                 logger.info("📄 Yeni sekme oluşturuldu")
 
+            if mode == 'headless':
+                await apply_headless_user_agent(self.browser, self.page)
+
             # Page close event listener
             self.page.on('close', lambda: logger.warning("⚠️ Page closed unexpectedly!"))
 
@@ -133,7 +148,7 @@ class GeminiBridge:
                 for selector in textarea_selectors:
                     try:
                         # Timeout 5s → 2s (toplam bekleme 6s vs eski 30s)
-                        await self.page.wait_for_selector(selector, timeout=2000)
+                        await wait_visible(self.page, selector, timeout=2000)
                         logger.info(f"✅ Gemini input elementi bulundu: {selector}")
                         found = True
                         break
@@ -145,15 +160,19 @@ class GeminiBridge:
                     logger.warning("⚠️ Gemini input elementi bulunamadı, ama devam ediliyor...")
                     # DEBUG: Sayfadaki tüm contenteditable elementleri listele
                     try:
-                        all_editables = await self.page.query_selector_all('[contenteditable]')
-                        logger.info(f"🔍 DEBUG: Sayfada {len(all_editables)} contenteditable element var")
-                        all_textareas = await self.page.query_selector_all('textarea')
-                        logger.info(f"🔍 DEBUG: Sayfada {len(all_textareas)} textarea element var")
+                        editable_count = await self.page.locator('[contenteditable]').count()
+                        logger.info(f"🔍 DEBUG: Sayfada {editable_count} contenteditable element var")
+                        textarea_count = await self.page.locator('textarea').count()
+                        logger.info(f"🔍 DEBUG: Sayfada {textarea_count} textarea element var")
                     except:
                         pass
             except Exception as e:
                 logger.warning(f"⚠️ Input check hatası: {e}")
 
+            # Headless yetenek kontrolü: reddedildiyse ekran dışı pencereyle yeniden başlat
+            if mode == 'headless' and not await self._headless_accepted():
+                return await self.init_browser(mode='offscreen')
+
             # NOT: System prompt kaldırıldı - kimlik soruları artık C# uygulama seviyesinde yakalanıyor
             self.is_ready = True
             logger.info("✅ Gemini browser hazır!")
@@ -163,6 +182,23 @@ class GeminiBridge:
             logger.error(f"❌ Browser başlatma hatası: {e}")
             return False
 
+    async def _headless_accepted(self):
+        """Sayfa challenge'sız ve editör hazır mı? Değilse browser'ı kapatır (challenge kalıcı kaydedilir)"""
+        reason = await detect_rejection(self.page, 'div[contenteditable="true"][role="textbox"], rich-textarea, div[contenteditable="true"]')
+        HeadlessCapability().record_check('gemini', reason)
+        if reason is None:
+            logger.info("🕶️ Gemini headless kabul etti")
+            return True
+
+        logger.warning(f"🕶️ Gemini headless reddetti ({reason}), ekran dışı pencere moduna dönülüyor...")
+        try:
+            await self.browser.close()
+            await self.playwright.stop()
+        except Exception as e:
+            logger.warning(f"⚠️ Browser kapatma hatası: {e}")
+        self.browser = self.page = self.playwright = None
+        return False
+
     async def dismiss_all_modals(self):
         """TÜM modal'ları JavaScript ile DOM'dan sil (Gemini - login, signup, consent)"""
         try:
@@ -203,8 +239,8 @@ class GeminiBridge:
                 button_texts = ['Try Gemini', 'Continue', 'Skip', 'Get started', 'Start']
                 for btn_text in button_texts:
                     try:
-                        button = await self.page.query_selector(f'button:has-text("{btn_text}")')
-                        if button:
+                        button = self.page.locator(f'button:has-text("{btn_text}")').first
+                        if await button.count():
                             await button.click()
                             logger.info(f"✅ '{btn_text}' butonuna tıklandı")
                             modals_closed = True
@@ -275,12 +311,14 @@ class GeminiBridge:
             ]
 
             logger.info("🔍 DEBUG: Textarea aranıyor...")
+            # Locator: ElementHandle oluşmaz (her mesajda handle birikmez)
             textarea_element = None
             used_selector = None
             for selector in textarea_selectors:
                 try:
-                    textarea_element = await self.page.query_selector(selector)
-                    if textarea_element:
+                    locator = self.page.locator(selector).first
+                    if await locator.count():
+                        textarea_element = locator
                         used_selector = selector
                         logger.info(f"✅ Textarea bulundu: {selector}")
                         break
@@ -290,14 +328,14 @@ class GeminiBridge:
                     logger.info(f"❌ Selector hatası ({selector}): {e}")
                     continue
 
-            if not textarea_element:
+            if textarea_element is None:
                 logger.error("❌ Textarea elementi bulunamadı!")
                 # DEBUG: Sayfadaki tüm elementleri listele
                 try:
-                    all_editables = await self.page.query_selector_all('[contenteditable]')
-                    logger.error(f"🔍 DEBUG: Sayfada {len(all_editables)} contenteditable element var")
-                    all_textareas = await self.page.query_selector_all('textarea')
-                    logger.error(f"🔍 DEBUG: Sayfada {len(all_textareas)} textarea element var")
+                    editable_count = await self.page.locator('[contenteditable]').count()
+                    logger.error(f"🔍 DEBUG: Sayfada {editable_count} contenteditable element var")
+                    textarea_count = await self.page.locator('textarea').count()
+                    logger.error(f"🔍 DEBUG: Sayfada {textarea_count} textarea element var")
 
                     # Sayfanın HTML'ini loglayalım (kısa versiyon)
                     page_html = await self.page.content()
@@ -315,8 +353,7 @@ class GeminiBridge:
             # (Böylece yeni yanıtı tespit edebiliriz)
             initial_response_count = 0
             try:
-                initial_responses = await self.page.query_selector_all('message-content')
-                initial_response_count = len(initial_responses)
+                initial_response_count = await self.page.locator('message-content').count()
                 logger.info(f"📊 Mesaj göndermeden önce {initial_response_count} yanıt var")
             except:
                 pass
@@ -335,25 +372,25 @@ class GeminiBridge:
             # İlk yanıt elementini yakala (timeout 2 dakika)
             response_element = None
             try:
-                logger.info("🔍 DEBUG: wait_for_selector başladı...")
-                await self.page.wait_for_selector(response_selector, timeout=120000)
+                logger.info("🔍 DEBUG: wait_visible başladı...")
+                await wait_visible(self.page, response_selector, timeout=120000)
                 response_element = response_selector
                 logger.info(f"✅ Yanıt elementi bulundu: {response_selector}")
             except Exception as e:
-                logger.error(f"❌ wait_for_selector hatası: {e}")
+                logger.error(f"❌ wait_visible hatası: {e}")
 
                 # DEBUG: Sayfadaki TÜM elementleri listele
                 try:
                     logger.info("🔍 DEBUG: Sayfadaki tüm message-content elementlerini arıyorum...")
-                    all_messages = await self.page.query_selector_all('message-content')
-                    logger.info(f"🔍 DEBUG: {len(all_messages)} message-content bulundu")
+                    message_count = await self.page.locator('message-content').count()
+                    logger.info(f"🔍 DEBUG: {message_count} message-content bulundu")
 
                     # Alternatif selector'ları dene
                     alt_selectors = ['model-response', 'div[data-message-author-role]', '.message', '[role="presentation"]']
                     for alt_sel in alt_selectors:
                         try:
-                            alt_elements = await self.page.query_selector_all(alt_sel)
-                            logger.info(f"🔍 DEBUG: Alternatif '{alt_sel}': {len(alt_elements)} element")
+                            alt_count = await self.page.locator(alt_sel).count()
+                            logger.info(f"🔍 DEBUG: Alternatif '{alt_sel}': {alt_count} element")
                         except:
                             pass
                 except Exception as dbg_ex:
@@ -376,11 +413,9 @@ class GeminiBridge:
             for i in range(max_wait * 2):
                 await self.page.wait_for_timeout(polling_interval)
 
-                elements = await self.page.query_selector_all(response_element)
-                if elements and len(elements) > initial_response_count:
-                    # YENİ YANIT: initial_response_count'tan sonraki ilk eleman
-                    new_response_index = initial_response_count
-                    current_text = await elements[new_response_index].inner_text()
+                # YENİ YANIT: initial_response_count'tan sonraki ilk eleman (tek evaluate, handle yok)
+                count, current_text = await response_text(self.page, response_element, initial_response_count)
+                if count > initial_response_count:
                     current_length = len(current_text)
 
                     if current_length == prev_length and current_length > 0:
@@ -405,18 +440,14 @@ class GeminiBridge:
                         logger.info(f"📊 Streaming: {current_length} karakter (deneme {i+1}/{max_wait*2})")
 
             # Son yanıtı al - YENİ EKLENEN YANITI AL (eskiler değil!)
-            elements = await self.page.query_selector_all(response_element)
-            if elements and len(elements) > initial_response_count:
+            count, final_text = await response_text(self.page, response_element, initial_response_count)
+            if count > initial_response_count:
                 # YENİ YANIT: initial_response_count'tan sonraki ilk eleman
-                new_response_index = initial_response_count
-                new_response_element = elements[new_response_index]
-                response_text = await new_response_element.inner_text()
-
-                logger.info(f"✅ Yanıt alındı: {len(response_text)} karakter (Yanıt #{new_response_index+1})")
+                logger.info(f"✅ Yanıt alındı: {len(final_text)} karakter (Yanıt #{initial_response_count+1})")
 
                 return {
                     "IsError": False,
-                    "Content": response_text,
+                    "Content": final_text,
                     "ErrorMessage": None,
                     "timestamp": datetime.now().isoformat()
                 }
@@ -451,6 +482,10 @@ class GeminiBridge:
 # Global bridge instance
 bridge = GeminiBridge()
 
+# Health istekleri paralel yanıtlanır (supervisor probe'u uzun yanıtta takılmasın),
+# mesajlar sayfada yine tek tek işlenir
+chat_lock = threading.Lock()
+
 
 class GeminiHandler(BaseHTTPRequestHandler):
     """HTTP Request Handler"""
@@ -465,8 +500,20 @@ class GeminiHandler(BaseHTTPRequestHandler):
             self.send_response(200)
             self.send_header('Content-Type', 'application/json')
             self.end_headers()
-            response = json.dumps({"status": "ok", "ready": bridge.is_ready})
+            response = json.dumps({
+                "status": "ok",
+                "ready": bridge.is_ready,
+                "browser_mode": bridge.browser_mode,
+                "launch_profile": bridge.launch_profile
+            })
             self.wfile.write(response.encode())
+        elif self.path == '/health/probe':
+            # Derin health check (bridge_supervisor.py): sayfaya evaluate round-trip'i
+            code, body = probe_response(bridge.loop, {'page': bridge.page}, bridge.is_ready)
+            self.send_response(code)
+            self.send_header('Content-Type', 'application/json')
+            self.end_headers()
+            self.wfile.write(json.dumps(body).encode())
         else:
             self.send_response(404)
             self.end_headers()
@@ -485,11 +532,12 @@ class GeminiHandler(BaseHTTPRequestHandler):
                 # Async fonksiyonu sync olarak çalıştır
                 loop = bridge.loop
                 if loop and loop.is_running():
-                    future = asyncio.run_coroutine_threadsafe(
-                        bridge.send_message(message),
-                        loop
-                    )
-                    result = future.result(timeout=300)  # 5 dakika timeout
+                    with chat_lock:
+                        future = asyncio.run_coroutine_threadsafe(
+                            bridge.send_message(message),
+                            loop
+                        )
+                        result = future.result(timeout=300)  # 5 dakika timeout
                 else:
                     result = {
                         "IsError": True,
@@ -568,15 +616,18 @@ async def run_async():
         await asyncio.sleep(1)
 
 
-def start_server():
+def start_server(port=8766):
     """HTTP server başlat"""
-    server = HTTPServer(('127.0.0.1', 8766), GeminiHandler)  # ⚠️ Port: 8766 (ChatGPT: 8765)
-    logger.info("🌐 HTTP Server başlatıldı: http://127.0.0.1:8766")
+    server = ThreadingHTTPServer(('127.0.0.1', port), GeminiHandler)  # ⚠️ Varsayılan port: 8766 (ChatGPT: 8765)
+    server.daemon_threads = True
+    logger.info(f"🌐 HTTP Server başlatıldı: http://127.0.0.1:{port}")
     server.serve_forever()
 
 
 def main():
     """Main entry point"""
+    args = parse_args('Gemini HTTP Bridge', default_port=8766)
+
     logger.info("=" * 60)
     logger.info("🚀 Gemini HTTP Bridge - QuadroAIPilot")
     logger.info("=" * 60)
@@ -586,8 +637,11 @@ def main():
     asyncio.set_event_loop(loop)
     bridge.loop = loop
 
+    if args.supervised:
+        exit_with_parent(bridge)
+
     # Async task başlat (background)
-    loop.run_in_executor(None, start_server)
+    loop.run_in_executor(None, start_server, args.port)
 
     # Browser başlat ve event loop çalıştır
     try:
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Sayfa içi JavaScript yardımcıları - QuadroAIPilot bridge'leri için
+Playwright evaluate() çağrılarına verilen script'ler burada toplanır
+"""
+
+# ChatGPT modal temizliği (rate limit, login, signup, overlay)
+# Bulunan modal türlerinin listesini döndürür
+CHATGPT_DISMISS_MODALS_JS = '''() => {
+    let found = [];
+
+    // 1. Rate limit modal
+    const rateLimit = document.querySelector('[data-testid="modal-no-auth-rate-limit"]');
+    if (rateLimit) {
+        rateLimit.remove();
+        found.push('rate-limit');
+    }
+
+    // 2. Login/Signup modal (çeşitli varyasyonlar)
+    const loginSelectors = [
+        '[data-testid="login-modal"]',
+        '[data-testid="signup-modal"]',
+        '[data-testid="auth-modal"]',
+        '[role="dialog"]',
+        '.modal',
+        '[class*="modal"]',
+        '[class*="Modal"]',
+        '[class*="dialog"]',
+        '[class*="Dialog"]',
+        '[class*="popup"]',
+        '[class*="Popup"]',
+        '[class*="overlay"][class*="auth"]',
+        '[class*="login"]',
+        '[class*="Login"]',
+        '[class*="signin"]',
+        '[class*="SignIn"]',
+        '[class*="signup"]',
+        '[class*="SignUp"]'
+    ];
+
+    loginSelectors.forEach(sel => {
+        try {
+            const elements = document.querySelectorAll(sel);
+            elements.forEach(el => {
+                // Modal içeriğini kontrol et (login/signup ile ilgili mi?)
+                const text = el.textContent.toLowerCase();
+                if (text.includes('log in') || text.includes('login') ||
+                    text.includes('sign in') || text.includes('signin') ||
+                    text.includes('sign up') || text.includes('signup') ||
+                    text.includes('create account') || text.includes('get started') ||
+                    text.includes('continue with') || text.includes('stay logged out') ||
+                    text.includes('giriş yap') || text.includes('kayıt ol') ||
+                    text.includes('hesap oluştur')) {
+                    el.remove();
+                    found.push('login-modal');
+                }
+            });
+        } catch(e) {}
+    });
+
+    // 3. Overlay/backdrop'ları sil
+    const overlaySelectors = [
+        '[data-ignore-for-page-load="true"]',
+        '[class*="backdrop"]',
+        '[class*="Backdrop"]',
+        '[class*="overlay"]',
+        '[class*="Overlay"]',
+        '.fixed.inset-0',
+        '[class*="fixed"][class*="inset"]'
+    ];
+
+    overlaySelectors.forEach(sel => {
+        try {
+            const overlays = document.querySelectorAll(sel);
+            overlays.forEach(overlay => {
+                // Ana içerik değilse sil
+                if (!overlay.querySelector('main') && !overlay.querySelector('#__next')) {
+                    const style = window.getComputedStyle(overlay);
+                    if (style.position === 'fixed' || style.position === 'absolute') {
+                        overlay.remove();
+                        found.push('overlay');
+                    }
+                }
+            });
+        } catch(e) {}
+    });
+
+    // 4. Body scroll'u aç
+    document.body.style.overflow = 'auto';
+    document.body.style.pointerEvents = 'auto';
+
+    // 5. Tüm disabled/blocked elementleri aktif et
+    document.querySelectorAll('[aria-hidden="true"]').forEach(el => {
+        if (el.tagName !== 'SCRIPT' && el.tagName !== 'STYLE') {
+            el.setAttribute('aria-hidden', 'false');
+        }
+    });
+
+    return found;
+}'''
+
+# Delta tabanlı yanıt okuma
+# Her tick'te tüm yanıt metnini Python'a taşımak yerine sayfa içinde son okunan
+# metni saklar ve sadece yeni eklenen karakterleri döndürür.
+#
+# Dönüş: {found, count, offset, delta, length, generating, done}
+#   - Python tarafı: text = text[:offset] + delta
+#   - Metin baştan değiştiyse (markdown yeniden render) offset=0, delta=tam metin
+#   - done: metin son okumadan beri değişmedi ve "Stop" kontrolü görünmüyor
+DELTA_EXTRACT_JS = '''({key, turn, selector, index, stopSelector}) => {
+    const store = window.__quadroDelta || (window.__quadroDelta = {});
+    const nodes = document.querySelectorAll(selector);
+    const el = nodes[index];
+    if (!el) {
+        return {found: false, count: nodes.length};
+    }
+
+    let state = store[key];
+    if (!state || state.turn !== turn || state.el !== el) {
+        state = store[key] = {turn: turn, el: el, prev: ''};
+    }
+
+    const text = el.innerText;
+    const prev = state.prev;
+    let offset = prev.length;
+    let delta = '';
+    if (text.startsWith(prev)) {
+        delta = text.slice(prev.length);
+    } else {
+        offset = 0;
+        delta = text;
+    }
+    state.prev = text;
+
+    const generating = !!(stopSelector && document.querySelector(stopSelector));
+    return {
+        found: true,
+        count: nodes.length,
+        offset: offset,
+        delta: delta,
+        length: text.length,
+        generating: generating,
+        done: text.length > 0 && text === prev && !generating
+    };
+}'''
+
+# Editör bulma: sırayla denenen selector'lardan ilk bağlı element
+FIND_EDITOR_JS = '''(selectors) => {
+    for (const sel of selectors) {
+        const el = document.querySelector(sel);
+        if (el && el.isConnected) {
+            return {editor: el, selector: sel};
+        }
+    }
+    return null;
+}'''
+
+# Taslak yazma (diff): editördeki metinle ortak öneki korur, sadece farkı değiştirir
+# Sesli girişte ara transkriptler sadece sonu değiştirdiği için her güncelleme küçük kalır.
+# Dönüş: {written, kept} - yazılan ve korunan karakter sayısı
+WRITE_DRAFT_JS = '''(editor, text) => {
+    const isField = editor instanceof HTMLTextAreaElement || editor instanceof HTMLInputElement;
+    const current = isField ? editor.value : editor.textContent;
+    if (current === text) {
+        return {written: 0, kept: text.length};
+    }
+
+    let prefix = 0;
+    const max = Math.min(current.length, text.length);
+    while (prefix < max && current[prefix] === text[prefix]) {
+        prefix++;
+    }
+    const insert = text.slice(prefix);
+
+    editor.focus();
+    if (isField) {
+        editor.setRangeText(insert, prefix, current.length, 'end');
+        editor.dispatchEvent(new Event('input', {bubbles: true}));
+        return {written: insert.length, kept: prefix};
+    }
+
+    // Karakter ofsetini DOM pozisyonuna çevir, öneki koruyarak sonrasını seç
+    const range = document.createRange();
+    range.selectNodeContents(editor);
+    if (prefix > 0) {
+        const walker = document.createTreeWalker(editor, NodeFilter.SHOW_TEXT);
+        let remaining = prefix;
+        let node;
+        while ((node = walker.nextNode())) {
+            if (remaining <= node.length) {
+                range.setStart(node, remaining);
+                break;
+            }
+            remaining -= node.length;
+        }
+    }
+    const selection = window.getSelection();
+    selection.removeAllRanges();
+    selection.addRange(range);
+
+    const ok = insert
+        ? document.execCommand('insertText', false, insert)
+        : document.execCommand('delete', false, null);
+    if (!ok) {
+        editor.textContent = text;
+        editor.dispatchEvent(new InputEvent('input', {bubbles: true, inputType: 'insertText', data: text}));
+        return {written: text.length, kept: 0};
+    }
+    return {written: insert.length, kept: prefix};
+}'''
+
+# Taslak güncelleme (gönderim YOK) - sesli girişin ara transkriptleri için
+PREFILL_JS = '''({text, editorSelectors}) => {
+    const q = window.__quadro;
+    const found = q.findEditor(editorSelectors);
+    if (!found) {
+        return {ok: false, reason: 'editor-not-found'};
+    }
+    const result = q.writeDraft(found.editor, text);
+    return {ok: true, written: result.written, kept: result.kept, editor: found.selector};
+}'''
+
+# Tek round-trip mesaj gönderme
+# Editörü bulur, mevcut yanıt sayısını (baseline) kaydeder, metni yazar (varsa taslağa
+# diff olarak) ve gönderir.
+#
+# Dönüş: {ok, injected, submitted, baseline, editor, method, written, kept, reason}
+#   - ok=False: editör yok veya metin yazılamadı (editör temizlenir, Python eski yola döner)
+#   - submitted=False: metin yazıldı ama gönderim doğrulanamadı (Python gerçek Enter basar)
+SEND_MESSAGE_JS = '''async ({text, editorSelectors, responseSelector, sendSelectors, dismissModals}) => {
+    const q = window.__quadro;
+    const tick = () => new Promise(resolve => setTimeout(resolve, 16));
+    const normalize = (value) => (value || '').replace(/\\s+/g, ' ').trim();
+
+    if (dismissModals) {
+        try { q.dismissModals(); } catch (e) {}
+    }
+
+    const found = q.findEditor(editorSelectors);
+    if (!found) {
+        return {ok: false, injected: false, submitted: false, reason: 'editor-not-found'};
+    }
+    const editor = found.editor;
+
+    const baseline = document.querySelectorAll(responseSelector).length;
+    const isField = editor instanceof HTMLTextAreaElement || editor instanceof HTMLInputElement;
+    const readEditor = () => isField ? editor.value : editor.innerText;
+
+    // Metni yaz (taslak varsa sadece fark)
+    const draft = q.writeDraft(editor, text);
+
+    if (normalize(readEditor()) !== normalize(text)) {
+        // Yarım kalan metni temizle, eski yol temiz editörle başlasın
+        if (isField) {
+            editor.value = '';
+            editor.dispatchEvent(new Event('input', {bubbles: true}));
+        } else {
+            document.execCommand('selectAll', false, null);
+            document.execCommand('delete', false, null);
+        }
+        return {ok: false, injected: false, submitted: false, baseline: baseline, reason: 'inject-mismatch'};
+    }
+
+    // Gönder butonu aktif olana kadar bekle (~1 saniye), yoksa Enter
+    let method = 'enter';
+    for (let i = 0; i < 60 && method === 'enter'; i++) {
+        for (const sel of sendSelectors) {
+            const btn = document.querySelector(sel);
+            if (btn && !btn.disabled && btn.getAttribute('aria-disabled') !== 'true') {
+                btn.click();
+                method = 'click';
+                break;
+            }
+        }
+        if (method === 'enter') {
+            await tick();
+        }
+    }
+    if (method === 'enter') {
+        editor.dispatchEvent(new KeyboardEvent('keydown', {
+            key: 'Enter', code: 'Enter', keyCode: 13, which: 13, bubbles: true, cancelable: true
+        }));
+    }
+
+    // Gönderim doğrulaması: editör boşalır veya yeni yanıt elementi oluşur
+    let submitted = false;
+    for (let i = 0; i < 30; i++) {
+        if (normalize(readEditor()) === '' ||
+            document.querySelectorAll(responseSelector).length > baseline) {
+            submitted = true;
+            break;
+        }
+        await tick();
+    }
+
+    return {
+        ok: true,
+        injected: true,
+        submitted: submitted,
+        baseline: baseline,
+        editor: found.selector,
+        method: method,
+        written: draft.written,
+        kept: draft.kept
+    };
+}'''
+
+# Üretimi durdur: provider'ın "Stop" kontrolüne tıklar (deadline / istemci kopması)
+# Dönüş: tıklandıysa true
+STOP_GENERATION_JS = '''(stopSelector) => {
+    const btn = document.querySelector(stopSelector);
+    if (!btn || btn.disabled) {
+        return false;
+    }
+    btn.click();
+    return true;
+}'''
+
+# Yanıt metni okuma (ElementHandle oluşturmadan): index null ise son eleman
+# Dönüş: {count, text} - eleman yoksa text null
+RESPONSE_TEXT_JS = '''({selector, index}) => {
+    const nodes = document.querySelectorAll(selector);
+    const el = index === null ? nodes[nodes.length - 1] : nodes[index];
+    return {count: nodes.length, text: el ? el.innerText : null};
+}'''
+
+# Storage state'teki localStorage girdilerini açık sayfaya yaz (yedek process devreye alınınca)
+RESTORE_LOCAL_STORAGE_JS = '''(items) => {
+    for (const {name, value} of items) {
+        localStorage.setItem(name, value);
+    }
+}'''
+
+# Context'e add_init_script ile yüklenen sayfa yardımcısı
+# Her yeni dokümanda window.__quadro hazır olur; evaluate çağrıları sadece
+# argüman taşır, script gövdesi her seferinde gönderilmez.
+PAGE_HELPERS_INIT_JS = '''(() => {
+    if (window.__quadro) {
+        return;
+    }
+    window.__quadro = {
+        dismissModals: ''' + CHATGPT_DISMISS_MODALS_JS + ''',
+        extract: ''' + DELTA_EXTRACT_JS + ''',
+        findEditor: ''' + FIND_EDITOR_JS + ''',
+        writeDraft: ''' + WRITE_DRAFT_JS + ''',
+        prefill: ''' + PREFILL_JS + ''',
+        send: ''' + SEND_MESSAGE_JS + '''
+    };
+})();'''
+
+# Yardımcı çağrıları (init script yüklü sayfalar için)
+HELPER_SEND_JS = '(args) => window.__quadro.send(args)'
+HELPER_PREFILL_JS = '(args) => window.__quadro.prefill(args)'
+HELPER_EXTRACT_JS = '(args) => window.__quadro.extract(args)'
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Açılış ilerlemesi - QuadroAIPilot unified bridge için
+Browser açılışının aşamalarını (Playwright, Chromium, context'ler, provider sayfaları) izler ve
+önceki açılışların aşama sürelerinden (startup_phases.json, üstel ortalama) kalan süreyi tahmin eder
+"""
+
+import json
+import logging
+import os
+import time
+
+from bridge_process import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+appdata_base = os.path.join(os.getenv('LOCALAPPDATA') or os.path.expanduser('~'), 'QuadroAIPilot')
+phases_file = os.path.join(appdata_base, 'startup_phases.json')
+
+# Kayıt yokken (ilk açılış) kullanılan tahmini aşama süreleri (ms)
+DEFAULT_PHASE_MS = {
+    'playwright': 1500,
+    'browser': 2000,
+    'contexts': 500,
+    # goto + networkidle + 3 sn bekleme + editör
+    'chatgpt': 15000,
+    'gemini': 15000,
+    'headless_check': 500,
+}
+
+# Yeni ölçümün ağırlığı (üstel ortalama)
+HISTORY_ALPHA = 0.3
+
+
+class StartupProgress:
+    """
+    Aşama planı: grup listesi - gruplar sırayla, grup içindeki aşamalar paralel çalışır
+    (ör. [['playwright'], ['browser'], ['contexts'], ['chatgpt', 'gemini']])
+    """
+
+    def __init__(self, path=phases_file):
+        self.path = path
+        self.history = {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.history = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+        self.state = 'pending'  # pending → starting → ready / failed
+        self.started = None
+        self.finished = None
+        self.plan = []
+        self.phases = {}
+
+    def start(self, plan):
+        """Yeni plan (mod değişiminde yeniden çağrılır, toplam süre korunur)"""
+        if self.state != 'starting':
+            self.started = time.monotonic()
+            self.finished = None
+        self.state = 'starting'
+        self.plan = plan
+        self.phases = {
+            name: {'state': 'pending', 'step': None, 'started': None, 'ms': None}
+            for group in plan for name in group
+        }
+
+    def begin(self, name, step=None):
+        phase = self.phases.get(name)
+        if phase is not None:
+            phase.update(state='running', step=step, started=time.monotonic())
+
+    def step(self, name, step):
+        """Çalışan aşamanın alt adımı (ör. goto / networkidle / editor)"""
+        phase = self.phases.get(name)
+        if phase is not None and phase['state'] == 'running':
+            phase['step'] = step
+
+    def end(self, name, ok=True):
+        phase = self.phases.get(name)
+        if phase is None or phase['started'] is None:
+            return
+        phase['ms'] = int((time.monotonic() - phase['started']) * 1000)
+        phase['state'] = 'done' if ok else 'failed'
+        phase['step'] = None
+
+    def finish(self, ok):
+        """Açılış bitti - başarılı aşamaların süresi bir sonraki tahmin için kaydedilir"""
+        self.state = 'ready' if ok else 'failed'
+        self.finished = time.monotonic()
+        if not ok:
+            return
+
+        for name, phase in self.phases.items():
+            if phase['state'] != 'done':
+                continue
+            entry = self.history.get(name)
+            if entry is None:
+                self.history[name] = {'avg_ms': phase['ms'], 'samples': 1}
+            else:
+                entry['avg_ms'] = int(HISTORY_ALPHA * phase['ms'] + (1 - HISTORY_ALPHA) * entry['avg_ms'])
+                entry['samples'] += 1
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            write_json_atomic(self.path, self.history, indent=2)
+        except OSError as e:
+            logger.warning(f"⚠️ Açılış süreleri kaydedilemedi: {e}")
+
+    def expected_ms(self, name):
+        entry = self.history.get(name)
+        if entry:
+            return entry['avg_ms']
+        return DEFAULT_PHASE_MS.get(name, 1000)
+
+    def _remaining_ms(self, name, now):
+        phase = self.phases[name]
+        if phase['state'] in ('done', 'failed'):
+            return 0
+        expected = self.expected_ms(name)
+        if phase['state'] == 'running':
+            # Tahmini aşan aşama için 0 (süre belirsiz, "gecikmeli" olarak raporlanır)
+            return max(0, expected - int((now - phase['started']) * 1000))
+        return expected
+
+    def eta_ms(self, until=None):
+        """until aşamasının bitişine kadar (None: tüm plan) kalan tahmini süre"""
+        if self.state != 'starting':
+            return 0 if self.state in ('ready', 'failed') else None
+        now = time.monotonic()
+        total = 0
+        for group in self.plan:
+            if until in group:
+                return total + self._remaining_ms(until, now)
+            total += max(self._remaining_ms(name, now) for name in group)
+        return total
+
+    def status(self):
+        now = time.monotonic()
+        end = self.finished or now
+        phases = []
+        for name, phase in self.phases.items():
+            ms = phase['ms']
+            if phase['state'] == 'running':
+                ms = int((now - phase['started']) * 1000)
+            expected = self.expected_ms(name)
+            phases.append({
+                'name': name,
+                'state': phase['state'],
+                'step': phase['step'],
+                'ms': ms,
+                'expected_ms': expected,
+                'overdue': phase['state'] == 'running' and ms > expected,
+            })
+        return {
+            'state': self.state,
+            'elapsed_ms': int((end - self.started) * 1000) if self.started else 0,
+            'eta_ms': self.eta_ms(),
+            'phases': phases,
+        }
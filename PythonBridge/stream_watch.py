@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Ağ seviyesinde yanıt tamamlanma sinyali - QuadroAIPilot bridge'leri için
+Provider'ın kendi streaming isteğini (ChatGPT conversation SSE, Gemini StreamGenerate)
+Playwright request event'leri ile izler; istek bittiğinde yanıt da bitmiştir.
+"""
+
+import asyncio
+import re
+import time
+
+# Provider başına streaming isteği URL desenleri
+STREAM_URL_PATTERNS = {
+    # POST /backend-api/conversation, /backend-api/f/conversation, /backend-anon/conversation
+    # (/init, /prepare gibi yan istekler hariç)
+    'chatgpt': r'/backend-(api|anon)/(f/)?conversation(\?|$)',
+    # Gemini yanıtı tek bir StreamGenerate isteği ile akar
+    # (batchexecute başka işlemler için de kullanıldığı için sinyal olarak güvenilir değil)
+    'gemini': r'/assistant\.lamda\.BardFrontendService/StreamGenerate',
+}
+
+
+class StreamCompletionWatcher:
+    """
+    Tek bir mesaj turu için streaming isteğini izler
+
+    Kullanım:
+        watcher = StreamCompletionWatcher(page, STREAM_URL_PATTERNS['chatgpt'])
+        watcher.attach()           # Mesaj göndermeden ÖNCE
+        ...
+        await watcher.wait(0.5)    # İstek biterse erken döner
+        watcher.detach()
+    """
+
+    def __init__(self, page, url_pattern):
+        self.page = page
+        self.pattern = re.compile(url_pattern)
+        self.request = None
+        self.failed = False
+        self.started_at = None
+        self.finished_at = None
+        self._done = asyncio.Event()
+        self._attached = False
+
+    def attach(self):
+        """Request event'lerini dinlemeye başla"""
+        if self._attached:
+            return
+        self.page.on('request', self._on_request)
+        self.page.on('requestfinished', self._on_finished)
+        self.page.on('requestfailed', self._on_failed)
+        self._attached = True
+
+    def detach(self):
+        """Event listener'ları kaldır"""
+        if not self._attached:
+            return
+        for event, handler in (('request', self._on_request),
+                               ('requestfinished', self._on_finished),
+                               ('requestfailed', self._on_failed)):
+            try:
+                self.page.remove_listener(event, handler)
+            except Exception:
+                pass
+        self._attached = False
+
+    @property
+    def seen(self):
+        """Streaming isteği görüldü mü?"""
+        return self.request is not None
+
+    @property
+    def done(self):
+        """Streaming isteği bitti mi (başarılı veya hatalı)?"""
+        return self._done.is_set()
+
+    async def wait(self, timeout):
+        """İstek bitene veya timeout dolana kadar bekle - bitti mi döndürür"""
+        if self._done.is_set():
+            return True
+        try:
+            await asyncio.wait_for(self._done.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self._done.is_set()
+
+    def _on_request(self, request):
+        if self.request is not None or request.method != 'POST':
+            return
+        if self.pattern.search(request.url):
+            self.request = request
+            self.started_at = time.monotonic()
+
+    def _on_finished(self, request):
+        if self.request is not None and request == self.request:
+            self.finished_at = time.monotonic()
+            self._done.set()
+
+    def _on_failed(self, request):
+        if self.request is not None and request == self.request:
+            self.failed = True
+            self.finished_at = time.monotonic()
+            self._done.set()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Unified bridge açılış kuyruğu testi - browser açmadan çalışır
+Kapı kapalıyken (browser hazırlanıyor) süresiz bir işin arkasına giren kısa deadline'lı iş,
+kapı açılmasını beklemeden kendi deadline'ında düşmeli.
+
+Kullanım:
+    python -m unittest test_startup_queue
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# Bridge modülü import'ta log / profil klasörlerini LOCALAPPDATA altında oluşturur
+os.environ.setdefault('LOCALAPPDATA', tempfile.mkdtemp(prefix='quadro_test_'))
+
+try:
+    from unified_ai_bridge import UnifiedAIBridge
+except ImportError as e:
+    raise unittest.SkipTest(f"unified_ai_bridge import edilemedi: {e}")
+
+
+def error_result(message):
+    return {"IsError": True, "Content": None, "ErrorMessage": message}
+
+
+class StartupQueueTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_short_deadline_behind_job_without_deadline(self):
+        bridge = UnifiedAIBridge()
+        self.assertFalse(bridge.accepting['chatgpt'])
+
+        async def factory(job):
+            return {"IsError": False, "Content": "ok", "ErrorMessage": None}
+
+        first = bridge._enqueue('chatgpt', factory, 'interactive', None, error_result)
+        await asyncio.sleep(0.05)  # Worker süresiz kapı beklemesine girsin
+        second = bridge._enqueue('chatgpt', factory, 'interactive', time.monotonic() + 0.3, error_result)
+
+        started = time.monotonic()
+        result = await asyncio.wait_for(second.future, timeout=2)
+        self.assertTrue(result['IsError'])
+        self.assertIn('deadline', result['ErrorMessage'])
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertFalse(first.future.done())
+
+        # Kapı açılınca süresiz iş çalışır
+        bridge._open_gate('chatgpt')
+        result = await asyncio.wait_for(first.future, timeout=2)
+        self.assertEqual(result['Content'], 'ok')
+        self.assertEqual(bridge.metrics['chatgpt']['queue']['interactive']['expired'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,15 +6,54 @@ Tek Chromium instance'da ChatGPT ve Gemini (2 sekme)
 """
 
 import asyncio
+import concurrent.futures
+import heapq
+import itertools
 import json
 import logging
 import os
+import re
+import select
+import socket
 import sys
+import time
+import uuid
 from datetime import datetime
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from playwright.async_api import async_playwright
 import threading
 
+from bridge_process import exit_with_parent, parse_args, probe_response, write_json_atomic
+from browser_launch import (
+    HeadlessCapability,
+    NEW_HEADLESS_MIN_VERSION,
+    apply_headless_user_agent,
+    chromium_major_version,
+    detect_rejection,
+    launch_args,
+    load_browser_mode,
+    load_launch_profile,
+    window_options,
+)
+from dom_access import HANDLE_LEAK_WARN, audit_page, first_visible, wait_visible
+from page_scripts import (
+    CHATGPT_DISMISS_MODALS_JS,
+    HELPER_EXTRACT_JS,
+    HELPER_PREFILL_JS,
+    HELPER_SEND_JS,
+    PAGE_HELPERS_INIT_JS,
+    RESTORE_LOCAL_STORAGE_JS,
+    STOP_GENERATION_JS,
+)
+from startup_progress import StartupProgress
+from stream_watch import STREAM_URL_PATTERNS, StreamCompletionWatcher
+
+# psutil opsiyonel: standby bellek bütçesi için RSS ölçümü
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
 # AppData klasörlerini hazırla
 appdata_base = os.path.join(os.getenv('LOCALAPPDATA'), 'QuadroAIPilot')
 log_dir = os.path.join(appdata_base, 'Logs')
@@ -22,6 +61,7 @@ profile_dir = os.path.join(appdata_base, 'UnifiedProfile')  # Browser profil kla
 os.makedirs(log_dir, exist_ok=True)
 os.makedirs(profile_dir, exist_ok=True)
 log_file = os.path.join(log_dir, 'unified_ai_bridge.log')
+config_file = os.path.join(appdata_base, 'bridge_config.json')  # Opsiyonel ayar dosyası
 
 # Logging - Windows console için UTF-8 encoding
 logging.basicConfig(
@@ -45,6 +85,204 @@ if sys.platform == 'win32':
 logger = logging.getLogger(__name__)
 
 
+# Varsayılan ayarlar - bridge_config.json ile override edilebilir
+DEFAULT_CONFIG = {
+    # Hot-standby: her provider için arka planda hazır bekleyen yedek sayfa (+1 renderer)
+    'standby_pages': False,
+    # Bridge process ağacının (Python + Playwright driver + Chromium) izin verilen toplam RSS'i
+    'standby_memory_budget_mb': 1500,
+    # Bir standby sayfasının tahmini bellek maliyeti
+    'standby_page_cost_mb': 250,
+    # N mesajdan sonra sayfayı taze standby ile değiştir (0 = kapalı)
+    'page_rotate_after_turns': 0,
+    # Storage state en fazla bu aralıkla kaydedilir (her mesajda değil), saniye
+    'storage_save_interval_s': 60,
+    # Aynı provider'a aynı metin bu süre içinde tekrar gelirse yeni tur açılmaz,
+    # ilk isteğin sonucu paylaşılır (sesli girişte çift gönderim), saniye (0 = kapalı)
+    'coalesce_window_s': 2.0,
+    # Pencere modu: 'offscreen' (ekran dışı pencere) veya 'headless' (--headless=new,
+    # provider reddederse otomatik olarak offscreen'e dönülür)
+    'browser_mode': 'offscreen',
+    # Chromium launch profili: 'latency' (eski davranış), 'balanced', 'low-memory'
+    'launch_profile': 'latency',
+    # Canlı handle / DOM sayaçları denetimi aralığı (/metrics "handles"), saniye (0 = kapalı)
+    'handle_audit_interval_s': 300,
+}
+
+
+def load_config():
+    """bridge_config.json'u varsayılan ayarlarla birleştirerek yükle"""
+    config = dict(DEFAULT_CONFIG)
+    if os.path.exists(config_file):
+        try:
+            with open(config_file, 'r', encoding='utf-8') as f:
+                config.update(json.load(f))
+            logger.info(f"⚙️ Ayarlar yüklendi: {config_file}")
+        except Exception as e:
+            logger.warning(f"⚠️ Ayar dosyası okunamadı, varsayılanlar kullanılıyor: {e}")
+    return config
+
+
+config = load_config()
+
+
+# Provider tanımları (URL + editör selector'ları)
+PROVIDERS = {
+    'chatgpt': {
+        'name': 'ChatGPT',
+        'icon': '🔵',
+        'url': 'https://chatgpt.com/?utm_source=quadro&utm_medium=app&utm_campaign=pilot',
+        # (selector, timeout_ms) - sırayla denenir
+        'editor_waits': [
+            ('#prompt-textarea, div.ProseMirror, textarea[name="prompt-textarea"]', 15000),
+        ],
+        'editor_selector': '#prompt-textarea, div.ProseMirror[contenteditable="true"], textarea[name="prompt-textarea"]',
+        # Gönderim için sırayla denenen editör selector'ları
+        'editor_selectors': [
+            '#prompt-textarea',
+            'div.ProseMirror[contenteditable="true"]',
+            'textarea[name="prompt-textarea"]',
+            'div[contenteditable="true"]',
+        ],
+        'send_selectors': [
+            'button[data-testid="send-button"]',
+            '#composer-submit-button',
+            'button[aria-label="Send prompt"]',
+        ],
+        'response_selector': 'div[data-message-author-role="assistant"]',
+        'stop_selector': 'button[data-testid="stop-button"], button[aria-label*="Stop"]',
+        # Uygulama içi "Yeni sohbet" (client-side route, sayfa yenilenmez)
+        'new_chat_selectors': [
+            'a[data-testid="create-new-chat-button"]',
+            'button[data-testid="create-new-chat-button"]',
+            'a[aria-label="New chat"]',
+            'button[aria-label="New chat"]',
+            'a[aria-label="Yeni sohbet"]',
+            'button[aria-label="Yeni sohbet"]',
+        ],
+    },
+    'gemini': {
+        'name': 'Gemini',
+        'icon': '🟢',
+        'url': 'https://gemini.google.com/app',
+        'editor_waits': [
+            ('div[contenteditable="true"][role="textbox"]', 2000),
+            ('rich-textarea', 2000),
+            ('div[contenteditable="true"]', 2000),
+        ],
+        'editor_selector': 'div[contenteditable="true"][role="textbox"], rich-textarea div[contenteditable="true"]',
+        'editor_selectors': [
+            'div[contenteditable="true"][role="textbox"]',
+            'rich-textarea div[contenteditable="true"]',
+            'div[contenteditable="true"]',
+        ],
+        'send_selectors': [
+            'button.send-button',
+            'button[aria-label="Send message"]',
+            'button[aria-label="Mesaj gönder"]',
+        ],
+        'response_selector': 'message-content',
+        'stop_selector': 'button[aria-label*="Stop"], button[aria-label*="Durdur"]',
+        'new_chat_selectors': [
+            'side-nav-action-button[data-test-id="new-chat-button"] button',
+            '[data-test-id="new-chat-button"] button',
+            'button[aria-label="New chat"]',
+            'button[aria-label="Yeni sohbet"]',
+            'a[aria-label="New chat"]',
+            'a[aria-label="Yeni sohbet"]',
+        ],
+    },
+}
+
+
+# Öncelik sınıfları (sıra = öncelik): sesli sorular önce, mail özeti / toplu işler sonra
+PRIORITY_CLASSES = ('interactive', 'background')
+
+
+# İş yarıda kesildiğinde istemciye dönen açıklama
+ABORT_MESSAGES = {
+    'deadline': "deadline aşıldı, üretim durduruldu",
+    'disconnect': "istemci bağlantısı koptu, üretim durduruldu",
+    'cancelled': "istek iptal edildi",
+}
+
+
+class TurnAborted(Exception):
+    """Çalışan tur deadline veya istemci kopması nedeniyle kesildi"""
+
+
+class QueuedJob:
+    """Provider kuyruğunda bekleyen tek iş (mesaj turu veya reset)"""
+
+    def __init__(self, provider, factory, priority, deadline, error_result, future):
+        self.provider = provider
+        self.factory = factory  # job'u alıp çalıştırılacak coroutine'i üreten fonksiyon
+        self.priority = priority
+        self.deadline = deadline  # time.monotonic() cinsinden, None = yok
+        self.error_result = error_result  # açıklama → istemciye dönen hata yanıtı
+        self.future = future
+        self.enqueued = time.monotonic()
+        self.started = False
+        self.waiters = 1  # Sonucu bekleyen istemci sayısı (singleflight takipçileri dahil)
+        self.abort_reason = None
+        self.abort_event = asyncio.Event()
+
+    def abort(self, reason):
+        """İşi iptal olarak işaretle (çalışıyorsa tur bir sonraki kontrolde kesilir)"""
+        if self.abort_reason is None:
+            self.abort_reason = reason
+            self.abort_event.set()
+
+
+class ClientRequest:
+    """HTTP isteği ile kuyruktaki işi eşler (istemci koparsa / iptal gelirse iş bulunur)"""
+
+    def __init__(self, request_id=None):
+        self.request_id = request_id or uuid.uuid4().hex[:12]
+        self.job = None
+        # Paylaşılan (singleflight) turdan sadece bu istek iptal edilirse yanıtı buraya yazılır
+        self.cancelled = None
+
+
+def normalize_prompt(message):
+    """Birleştirme anahtarı: büyük/küçük harf, boşluk ve sondaki noktalama farkları yok sayılır"""
+    text = re.sub(r'\s+', ' ', message or '').strip().casefold()
+    return text.rstrip(' .!?…')
+
+
+def bridge_rss_mb():
+    """Bridge process ağacının toplam RSS'i (MB) - psutil yoksa None"""
+    if psutil is None:
+        return None
+    try:
+        proc = psutil.Process()
+        total = proc.memory_info().rss
+        for child in proc.children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return total / (1024 * 1024)
+    except Exception:
+        return None
+
+
+class TurnStats:
+    """Tek bir mesaj turunun ölçümleri (Playwright IPC round-trip sayısı)"""
+
+    def __init__(self, provider):
+        self.provider = provider
+        self.mode = 'script'  # 'script' (tek evaluate) veya 'legacy' (eski yol)
+        self.ipc_calls = 0
+        self.completion = None  # 'network', 'heuristic' veya 'timeout'
+        self.started = time.monotonic()
+
+    async def call(self, awaitable):
+        """Playwright çağrısını say ve bekle"""
+        self.ipc_calls += 1
+        return await awaitable
+
+
 class UnifiedAIBridge:
     """
     Birleşik AI Browser köprüsü
@@ -65,77 +303,160 @@ class UnifiedAIBridge:
         self.gemini_page = None
         self.gemini_ready = False
 
+        # Hot-standby sayfalar (editörü hazır, arka planda bekler)
+        self.standby_pages = {'chatgpt': None, 'gemini': None}
+        self.standby_tasks = {'chatgpt': None, 'gemini': None}
+        self.turn_counts = {'chatgpt': 0, 'gemini': 0}
+        self.delta_turn = 0  # Delta extractor için tur numarası
+        self.storage_saved_at = {'chatgpt': 0.0, 'gemini': 0.0}
+        # Warm spare (--spare): storage dosyaları aktif process'in, kapanışta üzerine yazılmaz (bkz. promote)
+        self.spare = False
+
+        # Provider başına metrikler (/metrics)
+        self.metrics = {
+            provider: {
+                'requests': 0,
+                'errors': 0,
+                'ipc': {
+                    mode: {'requests': 0, 'calls': 0, 'last': 0, 'avg': 0}
+                    for mode in ('script', 'legacy')
+                },
+                # Spekülatif taslak (prefill) kullanımı
+                'draft': {'prefills': 0, 'prefills_skipped': 0, 'submits_from_draft': 0, 'chars_kept': 0, 'chars_written': 0},
+                # Yanıt bitişi nasıl tespit edildi
+                'completion': {'network': 0, 'heuristic': 0, 'timeout': 0, 'aborted': 0},
+                # Çalışırken yarıda kesilen turlar (Stop tıklandı)
+                'cut_short': {'deadline': 0, 'disconnect': 0, 'cancelled': 0},
+                # Yeni tur açmadan önceki isteğe bağlanan tekrar istekler
+                'coalesced': 0,
+                # Browser açılırken gelip sayfa hazır olana kadar kuyrukta bekleyen istekler
+                'queued_during_startup': 0,
+                # Periyodik denetim: canlı ElementHandle/JSHandle, renderer DOM sayaçları, JS heap
+                # (dom_nodes_growth: sayfa açıldığından beri ilk denetime göre node artışı)
+                'handles': {
+                    'audits': 0, 'live_handles': None, 'dom_nodes': None, 'dom_nodes_growth': None,
+                    'documents': None, 'js_event_listeners': None, 'js_heap_mb': None, 'audited_at': None,
+                },
+                # Öncelik sınıfı başına kuyruk (derinlik, bekleme, deadline nedeniyle düşenler)
+                'queue': {
+                    priority: {
+                        'depth': 0, 'max_depth': 0, 'started': 0, 'expired': 0, 'abandoned': 0, 'cancelled': 0,
+                        'wait_ms_last': 0, 'wait_ms_avg': 0, 'wait_ms_max': 0, 'wait_ms_total': 0,
+                    }
+                    for priority in PRIORITY_CLASSES
+                },
+            }
+            for provider in PROVIDERS
+        }
+        self.closing = False
+        self.browser_mode = None
+        self.launch_profile = None
+
+        # Provider başına öncelikli kuyruk ve tek worker (sayfada tek seferde tek tur)
+        self.queues = {provider: [] for provider in PROVIDERS}
+        self.queue_workers = {provider: None for provider in PROVIDERS}
+        self.queue_seq = itertools.count()
+        # İptal için: istek ID → ClientRequest (request.job ile iş), provider → çalışan iş
+        self.requests = {}
+        self.running = {provider: None for provider in PROVIDERS}
+        # (provider, normalize metin) → (task, başlangıç) - singleflight
+        self.inflight = {}
+
+        # Açılış: aşama ilerlemesi / ETA ve provider başına kuyruk kapısı
+        # (kapı kapalıyken istekler kuyrukta bekler, sayfa hazır olunca açılır)
+        self.startup = StartupProgress()
+        self.accepting = {provider: False for provider in PROVIDERS}
+        self.accepting_events = {}
+        # Kapı beklerken worker'ın uyandığı deadline; daha yakın deadline'lı iş gelince uyandırılır
+        self.gate_wakeups = {}
+        self.gate_wait_deadlines = {}
+
+        # Handle / DOM denetimi: provider → (sayfa, ilk denetimdeki node sayısı)
+        self.audit_task = None
+        self.audit_baselines = {}
+
         self.loop = None
 
-    async def init_browser(self):
+    def _choose_browser_mode(self):
+        """Ayardaki mod; headless son kontrolde reddedildiyse doğrudan offscreen"""
+        mode = load_browser_mode(config)
+        if mode == 'headless':
+            capability = HeadlessCapability()
+            rejected = [PROVIDERS[p]['name'] for p in PROVIDERS if not capability.allowed(p)]
+            if rejected:
+                logger.info(f"🕶️ Headless yakın zamanda reddedildi ({', '.join(rejected)}), ekran dışı pencere kullanılıyor")
+                return 'offscreen'
+        return mode
+
+    def _startup_plan(self):
+        """Açılış aşamaları (gruplar sıralı, grup içi paralel)"""
+        plan = [['playwright'], ['browser'], ['contexts'], list(PROVIDERS)]
+        if self.browser_mode == 'headless':
+            plan.append(['headless_check'])
+        return plan
+
+    async def init_browser(self, mode=None):
         """Tek Playwright browser başlat, iki context oluştur"""
         try:
             logger.info("=" * 60)
             logger.info("🚀 Unified AI Bridge başlatılıyor...")
             logger.info("=" * 60)
 
+            self.browser_mode = mode or self._choose_browser_mode()
+            self.launch_profile = load_launch_profile(config)
+            window = window_options(self.browser_mode)
+            self.startup.start(self._startup_plan())
+
+            self.startup.begin('playwright')
             self.playwright = await async_playwright().start()
+            self.startup.end('playwright')
 
-            # TEK Chromium browser başlat (GİZLİ MOD - ekran dışı)
-            logger.info("🌐 Chromium browser başlatılıyor (TEK INSTANCE)...")
+            # TEK Chromium browser başlat (headless veya ekran dışı pencere)
+            logger.info(f"🌐 Chromium browser başlatılıyor (TEK INSTANCE, {self.browser_mode}, profil: {self.launch_profile})...")
+            self.startup.begin('browser')
             self.browser = await self.playwright.chromium.launch(
-                headless=False,
-                args=[
-                    '--window-position=-10000,-10000',  # Ekran dışına taşı
-                    '--start-minimized',
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-dev-shm-usage',
-                    '--no-sandbox',
-                    '--disable-setuid-sandbox',
-                    '--disable-accelerated-2d-canvas',
-                    '--disable-gpu',
-                    '--window-size=840,480',
-                    '--disable-background-timer-throttling',
-                    '--disable-backgrounding-occluded-windows',
-                    '--disable-renderer-backgrounding'
-                ]
+                headless=window['headless'],
+                args=window['args'] + launch_args(self.launch_profile)
             )
+            self.startup.end('browser')
 
-            logger.info("✅ Chromium browser başlatıldı (TEK INSTANCE)")
+            logger.info(f"✅ Chromium browser başlatıldı (TEK INSTANCE, v{self.browser.version})")
+            if self.browser_mode == 'headless' and chromium_major_version(self.browser.version) < NEW_HEADLESS_MIN_VERSION:
+                logger.warning(f"⚠️ Chromium {self.browser.version} yeni headless'ı desteklemiyor, eski headless kullanılacak")
 
             # İki ayrı BrowserContext oluştur (cookie izolasyonu için)
             # Her context kendi storage state'ini kullanır
 
             # 1. ChatGPT Context
+            self.startup.begin('contexts')
             logger.info("📁 ChatGPT context oluşturuluyor...")
-            chatgpt_storage_path = os.path.join(profile_dir, 'chatgpt-storage.json')
-
-            chatgpt_storage = None
-            if os.path.exists(chatgpt_storage_path):
-                try:
-                    with open(chatgpt_storage_path, 'r') as f:
-                        chatgpt_storage = json.load(f)
-                    logger.info("✅ ChatGPT storage yüklendi")
-                except:
-                    logger.warning("⚠️ ChatGPT storage okunamadı, yeni oluşturulacak")
+            chatgpt_storage = self._load_storage('chatgpt')
+            if chatgpt_storage:
+                logger.info("✅ ChatGPT storage yüklendi")
 
             self.chatgpt_context = await self.browser.new_context(
                 viewport={'width': 840, 'height': 480},
                 storage_state=chatgpt_storage if chatgpt_storage else None
             )
+            # Sayfa yardımcısı (window.__quadro) - her yeni dokümana önceden yüklenir
+            await self.chatgpt_context.add_init_script(PAGE_HELPERS_INIT_JS)
+            if self.browser_mode == 'headless':
+                await self._fix_user_agent(self.chatgpt_context)
 
             # 2. Gemini Context
             logger.info("📁 Gemini context oluşturuluyor...")
-            gemini_storage_path = os.path.join(profile_dir, 'gemini-storage.json')
-
-            gemini_storage = None
-            if os.path.exists(gemini_storage_path):
-                try:
-                    with open(gemini_storage_path, 'r') as f:
-                        gemini_storage = json.load(f)
-                    logger.info("✅ Gemini storage yüklendi")
-                except:
-                    logger.warning("⚠️ Gemini storage okunamadı, yeni oluşturulacak")
+            gemini_storage = self._load_storage('gemini')
+            if gemini_storage:
+                logger.info("✅ Gemini storage yüklendi")
 
             self.gemini_context = await self.browser.new_context(
                 viewport={'width': 840, 'height': 480},
                 storage_state=gemini_storage if gemini_storage else None
             )
+            await self.gemini_context.add_init_script(PAGE_HELPERS_INIT_JS)
+            if self.browser_mode == 'headless':
+                await self._fix_user_agent(self.gemini_context)
+            self.startup.end('contexts')
 
             # Sayfaları paralel olarak başlat
             logger.info("🌐 ChatGPT ve Gemini sayfaları paralel başlatılıyor...")
@@ -145,304 +466,871 @@ class UnifiedAIBridge:
 
             await asyncio.gather(chatgpt_task, gemini_task)
 
+            # Headless yetenek kontrolü: provider reddettiyse ekran dışı pencereyle yeniden başlat
+            # (kuyruk kapısı kontrol bitene kadar kapalı kalır, bekleyen istekler yeni browser'a gider)
+            if self.browser_mode == 'headless':
+                self.startup.begin('headless_check')
+                accepted = await self._headless_accepted()
+                self.startup.end('headless_check', accepted)
+                if not accepted:
+                    logger.warning("🕶️ Headless reddedildi, ekran dışı pencere moduna dönülüyor...")
+                    await self._shutdown_browser()
+                    return await self.init_browser(mode='offscreen')
+
+            self.startup.finish(True)
+            self._open_all_gates()
+
             logger.info("=" * 60)
             logger.info(f"✅ Unified AI Bridge hazır!")
             logger.info(f"   ChatGPT: {'✅ Hazır' if self.chatgpt_ready else '❌ Hazır değil'}")
             logger.info(f"   Gemini:  {'✅ Hazır' if self.gemini_ready else '❌ Hazır değil'}")
             logger.info("=" * 60)
 
+            # Hot-standby sayfalarını arka planda hazırla (opsiyonel)
+            if config['standby_pages']:
+                logger.info("♻️ Standby sayfaları arka planda hazırlanıyor...")
+                for provider in PROVIDERS:
+                    self._schedule_standby_refill(provider)
+
+            # Handle / DOM denetimi (mod değişiminde tekrar init edilse de tek görev)
+            if config['handle_audit_interval_s'] and self.audit_task is None:
+                self.audit_task = asyncio.ensure_future(self._handle_audit_loop())
+
             return True
 
         except Exception as e:
             logger.error(f"❌ Browser başlatma hatası: {e}")
+            self.startup.finish(False)
+            # Bekleyen istekler "hazır değil" yanıtını hemen alsın
+            self._open_all_gates()
             return False
 
+    async def _fix_user_agent(self, context):
+        """Headless UA düzeltmesi (geçici sayfa ile UA okunur)"""
+        probe = await context.new_page()
+        try:
+            await apply_headless_user_agent(context, probe)
+        finally:
+            await self._close_page_quietly(probe)
+
+    async def _headless_accepted(self):
+        """Her provider sayfası challenge'sız ve editörü hazır mı? Challenge kalıcı kaydedilir"""
+        capability = HeadlessCapability()
+        accepted = True
+        for provider, info in PROVIDERS.items():
+            page = getattr(self, f'{provider}_page')
+            reason = 'page-not-ready' if page is None else await detect_rejection(page, info['editor_selector'])
+            capability.record_check(provider, reason)
+            if reason:
+                logger.warning(f"🕶️ {info['name']} headless reddetti: {reason}")
+                accepted = False
+            else:
+                logger.info(f"🕶️ {info['name']} headless kabul etti")
+        return accepted
+
+    async def _shutdown_browser(self):
+        """Browser'ı kaydetmeden kapat (mod değişimi için), durumu sıfırla"""
+        self.closing = True
+        try:
+            for context in (self.chatgpt_context, self.gemini_context):
+                if context:
+                    await context.close()
+            if self.browser:
+                await self.browser.close()
+            if self.playwright:
+                await self.playwright.stop()
+        except Exception as e:
+            logger.warning(f"⚠️ Browser kapatma hatası: {e}")
+        finally:
+            self.chatgpt_context = self.gemini_context = None
+            self.chatgpt_page = self.gemini_page = None
+            self.chatgpt_ready = self.gemini_ready = False
+            self.accepting = {provider: False for provider in PROVIDERS}
+            self.browser = self.playwright = None
+            self.closing = False
+
     async def _init_chatgpt_page(self):
         """ChatGPT sayfasını başlat"""
+        self.startup.begin('chatgpt')
         try:
             logger.info("🔵 ChatGPT sayfası başlatılıyor...")
 
-            self.chatgpt_page = await self.chatgpt_context.new_page()
-            self.chatgpt_page.on('close', lambda: logger.warning("⚠️ ChatGPT page closed!"))
-
-            # ChatGPT'ye git
-            chatgpt_url = 'https://chatgpt.com/?utm_source=quadro&utm_medium=app&utm_campaign=pilot'
-            await self.chatgpt_page.goto(chatgpt_url, wait_until='domcontentloaded', timeout=90000)
-
-            try:
-                await self.chatgpt_page.wait_for_load_state('networkidle', timeout=30000)
-            except:
-                logger.warning("⚠️ ChatGPT network idle timeout (normal)")
-
-            await self.chatgpt_page.wait_for_timeout(3000)
-
-            # Modal'ları kapat
-            await self._dismiss_chatgpt_modals()
-
-            # Input elementi kontrol
-            try:
-                await self.chatgpt_page.wait_for_selector(
-                    '#prompt-textarea, div.ProseMirror, textarea[name="prompt-textarea"]',
-                    timeout=15000
-                )
-                logger.info("✅ ChatGPT input elementi bulundu")
-            except:
-                logger.warning("⚠️ ChatGPT input elementi bulunamadı")
+            self.chatgpt_page = await self._open_provider_page('chatgpt')
 
             self.chatgpt_ready = True
+            self.startup.end('chatgpt')
             logger.info("🔵 ChatGPT sayfası hazır!")
+            # Headless'ta kapı yetenek kontrolünden sonra açılır
+            if self.browser_mode != 'headless':
+                self._open_gate('chatgpt')
 
         except Exception as e:
             logger.error(f"❌ ChatGPT sayfa hatası: {e}")
             self.chatgpt_ready = False
+            self.startup.end('chatgpt', ok=False)
 
     async def _init_gemini_page(self):
         """Gemini sayfasını başlat"""
+        self.startup.begin('gemini')
         try:
             logger.info("🟢 Gemini sayfası başlatılıyor...")
 
-            self.gemini_page = await self.gemini_context.new_page()
-            self.gemini_page.on('close', lambda: logger.warning("⚠️ Gemini page closed!"))
+            self.gemini_page = await self._open_provider_page('gemini')
+
+            self.gemini_ready = True
+            self.startup.end('gemini')
+            logger.info("🟢 Gemini sayfası hazır!")
+            # Headless'ta kapı yetenek kontrolünden sonra açılır
+            if self.browser_mode != 'headless':
+                self._open_gate('gemini')
+
+        except Exception as e:
+            logger.error(f"❌ Gemini sayfa hatası: {e}")
+            self.gemini_ready = False
+            self.startup.end('gemini', ok=False)
+
+    async def _open_provider_page(self, provider, standby=False):
+        """Yeni sekme aç, provider'a git ve editör hazır olana kadar bekle"""
+        info = PROVIDERS[provider]
+        label = f"{info['name']} standby" if standby else info['name']
+
+        context = getattr(self, f'{provider}_context')
+        page = await context.new_page()
+        page.on('close', lambda: self._on_page_closed(provider, page))
 
-            # Gemini'ye git
-            await self.gemini_page.goto('https://gemini.google.com/app', wait_until='domcontentloaded', timeout=90000)
+        # Açılış ilerlemesi (standby sayfaları açılıştan sonra dolar, raporlanmaz)
+        progress = (lambda step: None) if standby else (lambda step: self.startup.step(provider, step))
 
+        try:
+            progress('goto')
+            await page.goto(info['url'], wait_until='domcontentloaded', timeout=90000)
+
+            progress('networkidle')
             try:
-                await self.gemini_page.wait_for_load_state('networkidle', timeout=30000)
+                await page.wait_for_load_state('networkidle', timeout=30000)
             except:
-                logger.warning("⚠️ Gemini network idle timeout (normal)")
+                logger.warning(f"⚠️ {label} network idle timeout (normal)")
 
-            await self.gemini_page.wait_for_timeout(3000)
+            await page.wait_for_timeout(3000)
 
-            # Input elementi kontrol
-            textarea_selectors = [
-                'div[contenteditable="true"][role="textbox"]',
-                'rich-textarea',
-                'div[contenteditable="true"]',
-            ]
+            progress('editor')
 
+            # Modal'ları kapat
+            if provider == 'chatgpt':
+                await self._dismiss_chatgpt_modals(page)
+
+            # Input elementi kontrol
             found = False
-            for selector in textarea_selectors:
+            for selector, timeout in info['editor_waits']:
                 try:
-                    await self.gemini_page.wait_for_selector(selector, timeout=2000)
-                    logger.info(f"✅ Gemini input elementi bulundu: {selector}")
+                    await wait_visible(page, selector, timeout=timeout)
+                    logger.info(f"✅ {label} input elementi bulundu: {selector}")
                     found = True
                     break
                 except:
                     continue
 
             if not found:
-                logger.warning("⚠️ Gemini input elementi bulunamadı")
+                logger.warning(f"⚠️ {label} input elementi bulunamadı")
+                if standby:
+                    # Standby sadece editörü hazırsa işe yarar
+                    raise Exception("standby editörü hazır değil")
+
+        except Exception:
+            # Yarım kalmış sekmeyi açık bırakma (renderer sızıntısı)
+            await self._close_page_quietly(page)
+            raise
+
+        return page
+
+    def _on_page_closed(self, provider, page):
+        """Aktif sayfa veya standby kapandığında durumu güncelle"""
+        if self.closing:
+            return
+
+        if self.standby_pages[provider] is page:
+            logger.warning(f"⚠️ {PROVIDERS[provider]['name']} standby page closed!")
+            self.standby_pages[provider] = None
+            self._schedule_standby_refill(provider)
+            return
+
+        if getattr(self, f'{provider}_page') is page:
+            logger.warning(f"⚠️ {PROVIDERS[provider]['name']} page closed!")
+            # Sayfa çöktü/kapandı: standby varsa hemen devral
+            self._swap_to_standby(provider)
+
+    # ------------------------------------------------------------------
+    # Hot-standby sayfalar
+    # ------------------------------------------------------------------
+
+    def _standby_budget_ok(self):
+        """Yeni bir standby sayfası bellek bütçesine sığıyor mu?"""
+        current = bridge_rss_mb()
+        if current is None:
+            # psutil yok: ölçemiyoruz, sadece ayara güven
+            return True
 
-            self.gemini_ready = True
-            logger.info("🟢 Gemini sayfası hazır!")
+        projected = current + config['standby_page_cost_mb']
+        if projected > config['standby_memory_budget_mb']:
+            logger.warning(
+                f"⚠️ Standby atlandı: bellek bütçesi aşılır "
+                f"({projected:.0f}MB > {config['standby_memory_budget_mb']}MB)"
+            )
+            return False
+        return True
+
+    def _schedule_standby_refill(self, provider):
+        """Standby sayfasını arka planda yeniden doldur"""
+        if not config['standby_pages'] or self.closing:
+            return
+        if self.standby_pages[provider] is not None:
+            return
+        task = self.standby_tasks[provider]
+        if task is not None and not task.done():
+            return
+        self.standby_tasks[provider] = asyncio.ensure_future(self._refill_standby(provider))
+
+    async def _refill_standby(self, provider):
+        """Standby sayfasını aç ve editör hazır olana kadar yükle"""
+        name = PROVIDERS[provider]['name']
+        try:
+            if not getattr(self, f'{provider}_context') or not self._standby_budget_ok():
+                return
+
+            logger.info(f"♻️ {name} standby sayfası hazırlanıyor...")
+            page = await self._open_provider_page(provider, standby=True)
+
+            if self.closing:
+                await page.close()
+                return
+
+            self.standby_pages[provider] = page
+            logger.info(f"♻️ {name} standby sayfası hazır")
 
         except Exception as e:
-            logger.error(f"❌ Gemini sayfa hatası: {e}")
-            self.gemini_ready = False
+            logger.warning(f"⚠️ {name} standby hazırlama hatası: {e}")
+
+    def _swap_to_standby(self, provider):
+        """Aktif sayfayı hazır standby ile değiştir (yoksa False)"""
+        standby = self.standby_pages[provider]
+        if standby is None or standby.is_closed():
+            self.standby_pages[provider] = None
+            self._schedule_standby_refill(provider)
+            return False
+
+        old_page = getattr(self, f'{provider}_page')
+        self.standby_pages[provider] = None
+        setattr(self, f'{provider}_page', standby)
+        setattr(self, f'{provider}_ready', True)
+        self.turn_counts[provider] = 0
+        logger.info(f"♻️ {PROVIDERS[provider]['name']} standby sayfasına geçildi")
+
+        # Eski sayfayı arka planda kapat, yeni standby'ı doldur
+        if old_page is not None and not old_page.is_closed():
+            asyncio.ensure_future(self._close_page_quietly(old_page))
+        self._schedule_standby_refill(provider)
+        return True
+
+    async def _close_page_quietly(self, page):
+        """Sayfayı kapat, hataları yut"""
+        try:
+            await page.close()
+        except Exception:
+            pass
+
+    def _after_turn(self, provider):
+        """Mesaj sonrası sayaç - rotasyon eşiği aşılınca standby'a geç"""
+        self.turn_counts[provider] += 1
+        limit = config['page_rotate_after_turns']
+        if limit and self.turn_counts[provider] >= limit:
+            if self._swap_to_standby(provider):
+                logger.info(f"♻️ {PROVIDERS[provider]['name']} sayfası {limit} mesaj sonrası yenilendi")
+
+    # ------------------------------------------------------------------
+    # Reset (yeni sohbet)
+    # ------------------------------------------------------------------
+
+    async def reset_provider(self, provider, priority='interactive', deadline=None, request=None):
+        """Reset'i provider kuyruğuna al (devam eden turun bitmesini bekler)"""
+        return await self._run_queued(
+            provider,
+            lambda job: self._reset_provider(provider),
+            priority,
+            deadline,
+            lambda reason: {"status": "error", "method": "none", "error": reason},
+            request
+        )
+
+    async def _reset_provider(self, provider):
+        """
+        Yeni sohbet başlat (context sıfırlama)
+        Sıra: uygulama içi "Yeni sohbet" → klavye kısayolu → standby → tam goto
+        """
+        info = PROVIDERS[provider]
+        start = asyncio.get_event_loop().time()
+
+        def result(method, status="ok", error=None):
+            elapsed_ms = int((asyncio.get_event_loop().time() - start) * 1000)
+            logger.info(f"{info['icon']} [{info['name']}] Reset: {method} ({elapsed_ms}ms)")
+            response = {"status": status, "method": method, "elapsed_ms": elapsed_ms}
+            if error:
+                response["error"] = error
+            return response
+
+        page = getattr(self, f'{provider}_page')
+        if not page or not getattr(self, f'{provider}_ready'):
+            return result("none", status="error", error=f"{info['name']} browser hazır değil")
+
+        self.turn_counts[provider] = 0
+
+        if not page.is_closed():
+            try:
+                # Zaten boş sohbet mi? (yanıt yok + editör hazır)
+                if await self._is_fresh_chat(provider, page, timeout=0):
+                    return result("already_fresh")
+
+                # 1. Uygulama içi "Yeni sohbet" butonu (client-side navigation)
+                clicked = await page.evaluate('''(selectors) => {
+                    for (const sel of selectors) {
+                        const el = document.querySelector(sel);
+                        if (el) { el.click(); return sel; }
+                    }
+                    return null;
+                }''', info['new_chat_selectors'])
+
+                if clicked and await self._is_fresh_chat(provider, page):
+                    return result("in_app")
+
+                # 2. Klavye kısayolu (ChatGPT ve Gemini: Ctrl+Shift+O)
+                await page.keyboard.press('Control+Shift+O')
+                if await self._is_fresh_chat(provider, page):
+                    return result("shortcut")
+
+                logger.warning(f"⚠️ {info['name']} uygulama içi reset doğrulanamadı")
+
+            except Exception as e:
+                logger.warning(f"⚠️ {info['name']} uygulama içi reset hatası: {e}")
+
+        # 3. Hazır standby sayfası
+        if self._swap_to_standby(provider):
+            return result("standby")
+
+        # 4. Son çare: tam sayfa yükleme
+        try:
+            page = getattr(self, f'{provider}_page')
+            if page.is_closed():
+                page = await self._open_provider_page(provider)
+                setattr(self, f'{provider}_page', page)
+            else:
+                await page.goto(info['url'], wait_until='domcontentloaded', timeout=90000)
+                if provider == 'chatgpt':
+                    await self._dismiss_chatgpt_modals(page)
+                await wait_visible(page, info['editor_selector'], timeout=15000)
+            return result("goto")
+
+        except Exception as e:
+            logger.error(f"❌ {info['name']} reset hatası: {e}")
+            return result("goto", status="error", error=str(e))
+
+    async def _is_fresh_chat(self, provider, page, timeout=3000):
+        """Editör hazır ve sohbette hiç yanıt yok mu?"""
+        info = PROVIDERS[provider]
+        check = '''([editor, response]) =>
+            !!document.querySelector(editor) &&
+            document.querySelectorAll(response).length === 0'''
+        args = [info['editor_selector'], info['response_selector']]
+        try:
+            if timeout == 0:
+                return await page.evaluate(check, args)
+            await page.wait_for_function(check, arg=args, timeout=timeout, polling='raf')
+            return True
+        except Exception:
+            return False
 
-    async def _dismiss_chatgpt_modals(self):
+    async def _dismiss_chatgpt_modals(self, page=None, stats=None):
         """ChatGPT modal'larını kapat (rate limit, login, signup, vb.)"""
+        page = page or self.chatgpt_page
+        call = stats.call if stats else (lambda awaitable: awaitable)
         try:
             logger.info("🧹 ChatGPT modal kontrolü yapılıyor...")
 
             # TÜM modal'ları JavaScript ile DOM'dan sil
-            modals_found = await self.chatgpt_page.evaluate('''() => {
-                let found = [];
-
-                // 1. Rate limit modal
-                const rateLimit = document.querySelector('[data-testid="modal-no-auth-rate-limit"]');
-                if (rateLimit) {
-                    rateLimit.remove();
-                    found.push('rate-limit');
-                }
-
-                // 2. Login/Signup modal (çeşitli varyasyonlar)
-                const loginSelectors = [
-                    '[data-testid="login-modal"]',
-                    '[data-testid="signup-modal"]',
-                    '[data-testid="auth-modal"]',
-                    '[role="dialog"]',
-                    '.modal',
-                    '[class*="modal"]',
-                    '[class*="Modal"]',
-                    '[class*="dialog"]',
-                    '[class*="Dialog"]',
-                    '[class*="popup"]',
-                    '[class*="Popup"]',
-                    '[class*="overlay"][class*="auth"]',
-                    '[class*="login"]',
-                    '[class*="Login"]',
-                    '[class*="signin"]',
-                    '[class*="SignIn"]',
-                    '[class*="signup"]',
-                    '[class*="SignUp"]'
-                ];
-
-                loginSelectors.forEach(sel => {
-                    try {
-                        const elements = document.querySelectorAll(sel);
-                        elements.forEach(el => {
-                            // Modal içeriğini kontrol et (login/signup ile ilgili mi?)
-                            const text = el.textContent.toLowerCase();
-                            if (text.includes('log in') || text.includes('login') ||
-                                text.includes('sign in') || text.includes('signin') ||
-                                text.includes('sign up') || text.includes('signup') ||
-                                text.includes('create account') || text.includes('get started') ||
-                                text.includes('continue with') || text.includes('stay logged out') ||
-                                text.includes('giriş yap') || text.includes('kayıt ol') ||
-                                text.includes('hesap oluştur')) {
-                                el.remove();
-                                found.push('login-modal');
-                            }
-                        });
-                    } catch(e) {}
-                });
-
-                // 3. Overlay/backdrop'ları sil
-                const overlaySelectors = [
-                    '[data-ignore-for-page-load="true"]',
-                    '[class*="backdrop"]',
-                    '[class*="Backdrop"]',
-                    '[class*="overlay"]',
-                    '[class*="Overlay"]',
-                    '.fixed.inset-0',
-                    '[class*="fixed"][class*="inset"]'
-                ];
-
-                overlaySelectors.forEach(sel => {
-                    try {
-                        const overlays = document.querySelectorAll(sel);
-                        overlays.forEach(overlay => {
-                            // Ana içerik değilse sil
-                            if (!overlay.querySelector('main') && !overlay.querySelector('#__next')) {
-                                const style = window.getComputedStyle(overlay);
-                                if (style.position === 'fixed' || style.position === 'absolute') {
-                                    overlay.remove();
-                                    found.push('overlay');
-                                }
-                            }
-                        });
-                    } catch(e) {}
-                });
-
-                // 4. Body scroll'u aç
-                document.body.style.overflow = 'auto';
-                document.body.style.pointerEvents = 'auto';
-
-                // 5. Tüm disabled/blocked elementleri aktif et
-                document.querySelectorAll('[aria-hidden="true"]').forEach(el => {
-                    if (el.tagName !== 'SCRIPT' && el.tagName !== 'STYLE') {
-                        el.setAttribute('aria-hidden', 'false');
-                    }
-                });
-
-                return found;
-            }''')
+            modals_found = await call(page.evaluate(CHATGPT_DISMISS_MODALS_JS))
 
             if modals_found and len(modals_found) > 0:
                 logger.info(f"✅ ChatGPT modal'ları silindi: {modals_found}")
 
             # ESC tuşlarına bas (ek güvenlik)
             for _ in range(3):
-                await self.chatgpt_page.keyboard.press('Escape')
-                await self.chatgpt_page.wait_for_timeout(200)
+                await call(page.keyboard.press('Escape'))
+                await call(page.wait_for_timeout(200))
 
             # Kısa bekleme (DOM güncellemesi için)
-            await self.chatgpt_page.wait_for_timeout(500)
+            await call(page.wait_for_timeout(500))
 
         except Exception as e:
             logger.warning(f"⚠️ ChatGPT modal kapatma hatası: {e}")
 
-    async def send_chatgpt_message(self, message):
+    async def send_chatgpt_message(self, message, priority='interactive', deadline=None, request=None):
         """ChatGPT'ye mesaj gönder"""
-        try:
-            if not self.chatgpt_page or not self.chatgpt_ready:
-                return {
-                    "IsError": True,
-                    "Content": None,
-                    "ErrorMessage": "ChatGPT browser hazır değil"
-                }
+        return await self._send_coalesced('chatgpt', message, priority, deadline, request)
 
-            if self.chatgpt_page.is_closed():
-                return {
-                    "IsError": True,
-                    "Content": None,
-                    "ErrorMessage": "ChatGPT page kapalı"
-                }
-
-            logger.info(f"🔵 [ChatGPT] Mesaj gönderiliyor: {message[:50]}...")
-
-            # ÖNEMLİ: Mesaj göndermeden önce modal kontrolü yap
-            # Login popup açılmış olabilir, kapatmamız lazım
-            await self._dismiss_chatgpt_modals()
+    async def send_gemini_message(self, message, priority='interactive', deadline=None, request=None):
+        """Gemini'ye mesaj gönder"""
+        return await self._send_coalesced('gemini', message, priority, deadline, request)
+
+    async def _send_coalesced(self, provider, message, priority='interactive', deadline=None, request=None):
+        """
+        Singleflight: aynı provider + aynı (normalize) metin coalesce_window_s içinde
+        tekrar gelirse yeni tur açma, ilk isteğin (lider) sonucunu bekle
+        """
+        window = config['coalesce_window_s']
+        if not window:
+            return await self._send_queued(provider, message, priority, deadline, request)
+
+        loop = asyncio.get_event_loop()
+        key = (provider, normalize_prompt(message))
+        entry = self.inflight.get(key)
+        if entry is not None and loop.time() - entry[1] <= window:
+            job = entry[0]
+            self.metrics[provider]['coalesced'] += 1
+            logger.info(f"🔗 [{PROVIDERS[provider]['name']}] Aynı istek önceki tura bağlandı: {message[:50]}...")
+            if not job.future.done():
+                job.waiters += 1
+                if request is not None:
+                    self._register_request(job, request)
+            return await self._await_job(job, request)
+
+        job = self._enqueue_message(provider, message, priority, deadline, request)
+        started = loop.time()
+        self.inflight[key] = (job, started)
+
+        def forget(_):
+            # Lider bittikten sonra pencerenin kalanı kadar sonucu paylaşmaya devam et
+            remaining = max(0.0, window - (loop.time() - started))
+            loop.call_later(remaining, self._forget_inflight, key, job)
+
+        job.future.add_done_callback(forget)
+        return await self._await_job(job, request)
+
+    def _forget_inflight(self, key, job):
+        """Singleflight kaydını sil (yerine yeni lider geldiyse dokunma)"""
+        entry = self.inflight.get(key)
+        if entry is not None and entry[0] is job:
+            del self.inflight[key]
+
+    async def _send_queued(self, provider, message, priority='interactive', deadline=None, request=None):
+        """Mesaj turunu provider kuyruğuna al ve sonucunu bekle"""
+        job = self._enqueue_message(provider, message, priority, deadline, request)
+        return await self._await_job(job, request)
+
+    async def _await_job(self, job, request):
+        """
+        İşin sonucunu bekle (bekleyenin gitmesi paylaşılan işi iptal etmez); istek tek başına
+        iptal edilirse (tur diğer bekleyenler için sürerken) sadece kendi iptal yanıtı döner
+        """
+        if request is None:
+            return await asyncio.shield(job.future)
+        if request.cancelled is None:
+            request.cancelled = asyncio.get_event_loop().create_future()
+        await asyncio.wait([job.future, request.cancelled], return_when=asyncio.FIRST_COMPLETED)
+        if request.cancelled.done():
+            return request.cancelled.result()
+        return job.future.result()
+
+    def _enqueue_message(self, provider, message, priority, deadline, request):
+        """Mesaj turu işini oluşturup kuyruğa koy"""
+        name = PROVIDERS[provider]['name']
+        return self._enqueue(
+            provider,
+            lambda job: self._send_message(provider, message, job),
+            priority,
+            deadline,
+            lambda reason: {"IsError": True, "Content": None, "ErrorMessage": f"{name} {reason}"},
+            request
+        )
+
+    # ------------------------------------------------------------------
+    # Öncelikli kuyruk
+    # ------------------------------------------------------------------
+
+    async def _run_queued(self, provider, factory, priority, deadline, error_result, request=None):
+        """İşi provider kuyruğuna koy ve sonucunu bekle"""
+        job = self._enqueue(provider, factory, priority, deadline, error_result, request)
+        return await job.future
+
+    def _enqueue(self, provider, factory, priority, deadline, error_result, request=None):
+        """
+        İşi provider kuyruğuna koy (QueuedJob döndürür, sonuç job.future'da)
+        interactive işler background'dan önce, aynı sınıf içinde geliş sırasıyla çalışır.
+        """
+        if priority not in PRIORITY_CLASSES:
+            priority = PRIORITY_CLASSES[0]
+
+        job = QueuedJob(provider, factory, priority, deadline, error_result,
+                        asyncio.get_event_loop().create_future())
+        if request is not None:
+            self._register_request(job, request)
+        queue = self.queues[provider]
+        heapq.heappush(queue, (PRIORITY_CLASSES.index(priority), next(self.queue_seq), job))
+
+        queue_metrics = self.metrics[provider]['queue'][priority]
+        queue_metrics['depth'] += 1
+        queue_metrics['max_depth'] = max(queue_metrics['max_depth'], queue_metrics['depth'])
+
+        if not self.accepting[provider]:
+            self.metrics[provider]['queued_during_startup'] += 1
+            eta_ms = self.provider_eta_ms(provider)
+            eta = f", tahmini {eta_ms / 1000:.0f} sn" if eta_ms is not None else ""
+            logger.info(
+                f"⏳ [{PROVIDERS[provider]['name']}] Browser hazırlanıyor, istek kuyrukta bekliyor ({priority}{eta})"
+            )
+            # Worker daha geç bir deadline'a (veya süresiz) uyuyorsa bu işin deadline'ı için uyandır
+            wakeup = self.gate_wakeups.get(provider)
+            sleeping_until = self.gate_wait_deadlines.get(provider)
+            if wakeup is not None and deadline is not None and (sleeping_until is None or deadline < sleeping_until):
+                wakeup.set()
+
+        worker = self.queue_workers[provider]
+        if worker is None or worker.done():
+            self.queue_workers[provider] = asyncio.ensure_future(self._queue_worker(provider))
+        elif self.accepting[provider]:
+            logger.info(
+                f"⏳ [{PROVIDERS[provider]['name']}] Kuyruğa alındı ({priority}, sırada {len(queue)})"
+            )
 
-            # Textarea bul
-            selectors = [
-                ('#prompt-textarea', 'ProseMirror ID'),
-                ('div.ProseMirror[contenteditable="true"]', 'ProseMirror class'),
-                ('textarea[name="prompt-textarea"]', 'Named textarea'),
-                ('div[contenteditable="true"]', 'Generic contenteditable'),
-            ]
+        return job
+
+    def _register_request(self, job, request):
+        """İstek ID'sini işe bağla (iş bitince kayıt silinir)"""
+        request.job = job
+        self.requests[request.request_id] = request
+        job.future.add_done_callback(lambda _: self.requests.pop(request.request_id, None))
+
+    async def _queue_worker(self, provider):
+        """Kuyruğu öncelik sırasıyla boşalt - süresi geçmiş işler tarayıcıya dokunmadan düşer"""
+        name = PROVIDERS[provider]['name']
+        queue = self.queues[provider]
+
+        while queue:
+            if not self.accepting[provider]:
+                # Açılış sürüyor: sayfa hazır olana veya ilk deadline dolana kadar bekle
+                await self._wait_for_gate(provider, self._next_queue_deadline(provider))
+                self._expire_waiting(provider)
+                continue
+
+            _, _, job = heapq.heappop(queue)
+            queue_metrics = self.metrics[provider]['queue'][job.priority]
+            queue_metrics['depth'] -= 1
+
+            if job.future.done():
+                continue
+
+            now = time.monotonic()
+            waited_ms = int((now - job.enqueued) * 1000)
+
+            if job.deadline is not None and now >= job.deadline:
+                queue_metrics['expired'] += 1
+                logger.warning(f"⌛ [{name}] Deadline aşıldı, istek düşürüldü ({job.priority}, {waited_ms}ms beklendi)")
+                job.future.set_result(job.error_result("deadline aşıldı (kuyrukta)"))
+                continue
+
+            queue_metrics['started'] += 1
+            queue_metrics['wait_ms_last'] = waited_ms
+            queue_metrics['wait_ms_max'] = max(queue_metrics['wait_ms_max'], waited_ms)
+            queue_metrics['wait_ms_total'] += waited_ms
+            queue_metrics['wait_ms_avg'] = round(queue_metrics['wait_ms_total'] / queue_metrics['started'])
+
+            job.started = True
+            self.running[provider] = job
+            try:
+                result = await job.factory(job)
+            except Exception as e:
+                if not job.future.done():
+                    job.future.set_exception(e)
+                continue
+            finally:
+                self.running[provider] = None
+
+            if not job.future.done():
+                job.future.set_result(result)
+
+        self.queue_workers[provider] = None
+
+    # ------------------------------------------------------------------
+    # Açılış: kuyruk kapısı ve ilerleme
+    # ------------------------------------------------------------------
+
+    def _open_gate(self, provider):
+        """Provider kuyruğunu serbest bırak (sayfa hazır veya açılış bitti)"""
+        if self.accepting[provider]:
+            return
+        self.accepting[provider] = True
+        event = self.accepting_events.pop(provider, None)
+        if event is not None:
+            event.set()
+        waiting = len(self.queues[provider])
+        if waiting:
+            logger.info(f"🚦 [{PROVIDERS[provider]['name']}] Sayfa hazır, kuyrukta bekleyen {waiting} istek başlıyor")
+
+    def _open_all_gates(self):
+        for provider in PROVIDERS:
+            self._open_gate(provider)
+
+    async def _wait_for_gate(self, provider, deadline):
+        """
+        Kapı açılana kadar bekle (deadline verilirse en geç o ana kadar); daha yakın deadline'lı
+        bir iş kuyruğa girerse erken döner - worker deadline'ı her turda yeniden hesaplar
+        """
+        event = self.accepting_events.get(provider)
+        if event is None:
+            event = self.accepting_events[provider] = asyncio.Event()
+        wakeup = self.gate_wakeups[provider] = asyncio.Event()
+        self.gate_wait_deadlines[provider] = deadline
+
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        waits = [asyncio.ensure_future(event.wait()), asyncio.ensure_future(wakeup.wait())]
+        try:
+            await asyncio.wait(waits, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in waits:
+                task.cancel()
+            self.gate_wakeups.pop(provider, None)
+            self.gate_wait_deadlines.pop(provider, None)
+
+    def _next_queue_deadline(self, provider):
+        """Kuyrukta bekleyen işlerin en yakın deadline'ı (yoksa None)"""
+        deadlines = [
+            job.deadline for _, _, job in self.queues[provider]
+            if job.deadline is not None and not job.future.done()
+        ]
+        return min(deadlines) if deadlines else None
+
+    def _expire_waiting(self, provider):
+        """Açılış beklerken deadline'ı dolan işleri düşür (kuyruktan worker çıkarır)"""
+        now = time.monotonic()
+        name = PROVIDERS[provider]['name']
+        for _, _, job in self.queues[provider]:
+            if job.future.done() or job.deadline is None or now < job.deadline:
+                continue
+            self.metrics[provider]['queue'][job.priority]['expired'] += 1
+            eta_ms = self.provider_eta_ms(provider)
+            eta = f", tahmini {eta_ms / 1000:.0f} sn" if eta_ms is not None else ""
+            logger.warning(f"⌛ [{name}] Deadline aşıldı, browser hazır olmadan istek düşürüldü ({job.priority})")
+            job.future.set_result(job.error_result(f"deadline aşıldı (browser hazırlanıyor{eta})"))
+
+    def provider_eta_ms(self, provider):
+        """Provider kuyruğunun açılmasına kalan tahmini süre (ms)"""
+        if self.accepting[provider]:
+            return 0
+        until = 'headless_check' if self.browser_mode == 'headless' else provider
+        return self.startup.eta_ms(until)
+
+    def startup_status(self):
+        """/health için açılış ilerlemesi ve provider başına ETA"""
+        status = self.startup.status()
+        status['providers'] = {
+            provider: {
+                'accepting': self.accepting[provider],
+                'queued': len(self.queues[provider]),
+                'eta_ms': self.provider_eta_ms(provider),
+            }
+            for provider in PROVIDERS
+        }
+        return status
+
+    def release_request(self, request, reason='disconnect'):
+        """
+        İstemci vazgeçti (bağlantı koptu / handler süresi doldu)
+        İşi bekleyen başka istemci yoksa: kuyruktaysa düşür, çalışıyorsa yarıda kes
+        """
+        job = request.job
+        if job is None or job.future.done():
+            return
+        job.waiters -= 1
+        if job.waiters > 0:
+            return
+
+        if not job.started:
+            logger.info(f"🚪 [{PROVIDERS[job.provider]['name']}] İstemci ayrıldı, kuyruktaki istek düşürüldü")
+        self._abort_job(job, reason)
+
+    def cancel(self, provider, request_id=None, include_queued=False):
+        """
+        İptal: request_id verilirse o istek (kuyrukta veya çalışıyor), verilmezse çalışan tur;
+        include_queued ile provider kuyruğundaki tüm istekler de düşer.
+        Çalışan tur bir sonraki kontrolde kesilir ve "Stop" tıklanır. Tur birden fazla istek
+        tarafından paylaşılıyorsa (singleflight) request_id ile sadece o istek ayrılır,
+        tur son bekleyen iptal edilince kesilir.
+        """
+        name = PROVIDERS[provider]['name']
+        targets = []
+        cancelled = []
+        if request_id:
+            request = self.requests.get(request_id)
+            job = request.job if request is not None else None
+            if job is not None and job.provider == provider:
+                if job.waiters > 1 and not job.future.done() and job.abort_reason is None:
+                    cancelled.append('running' if job.started else 'queued')
+                    self._detach_request(request, job)
+                    logger.info(f"🛑 [{name}] İptal: istek paylaşılan turdan ayrıldı ({job.waiters} bekleyen kaldı)")
+                else:
+                    targets.append(job)
+        else:
+            if self.running[provider] is not None:
+                targets.append(self.running[provider])
+            if include_queued:
+                targets.extend(entry[2] for entry in self.queues[provider])
+
+        for job in targets:
+            if job.future.done() or job.abort_reason is not None:
+                continue
+            cancelled.append('running' if job.started else 'queued')
+            self._abort_job(job, 'cancelled')
+
+        if cancelled:
+            logger.info(f"🛑 [{name}] İptal: {len(cancelled)} istek ({', '.join(cancelled)})")
+        return {
+            "status": "ok" if cancelled else "not_found",
+            "running": cancelled.count('running'),
+            "queued": cancelled.count('queued'),
+        }
+
+    def _detach_request(self, request, job):
+        """İsteği paylaşılan işten ayır ve sadece ona iptal yanıtı ver (iş diğerleri için sürer)"""
+        job.waiters -= 1
+        request.job = None
+        self.requests.pop(request.request_id, None)
+        if request.cancelled is None:
+            request.cancelled = asyncio.get_event_loop().create_future()
+        if not request.cancelled.done():
+            request.cancelled.set_result(
+                self._aborted_result(job.error_result(ABORT_MESSAGES['cancelled']), 'cancelled')
+            )
 
-            textarea_selector = None
-            for selector, desc in selectors:
-                try:
-                    await self.chatgpt_page.wait_for_selector(selector, timeout=10000)
-                    textarea_selector = selector
-                    logger.info(f"✅ ChatGPT input: {desc}")
-                    break
-                except:
-                    continue
+    def _abort_job(self, job, reason):
+        """İşi iptal et - kuyruktaysa hemen sonuçlandır, çalışıyorsa tur kendini keser"""
+        job.abort(reason)
+        if job.started:
+            return
+        queue_metrics = self.metrics[job.provider]['queue'][job.priority]
+        queue_metrics['cancelled' if reason == 'cancelled' else 'abandoned'] += 1
+        job.future.set_result(self._aborted_result(job.error_result(ABORT_MESSAGES[reason]), reason))
+
+    def _aborted_result(self, result, reason):
+        """Kesilen işin yanıtı - iptalde istemci durumu ayırt edebilsin"""
+        if reason == 'cancelled' and 'IsError' in result:
+            result['Cancelled'] = True
+        return result
+
+    async def _wait_abortable(self, awaitable, job):
+        """
+        Playwright beklemesini iş iptal edilene veya deadline dolana kadar bekle
+        İptalde TurnAborted fırlatır (bekleme yarıda bırakılır)
+        """
+        if job is None:
+            return await awaitable
+
+        self._check_abort(job)
+        task = asyncio.ensure_future(awaitable)
+        abort = asyncio.ensure_future(job.abort_event.wait())
+        timeout = None if job.deadline is None else max(0.0, job.deadline - time.monotonic())
+        try:
+            done, _ = await asyncio.wait({task, abort}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            abort.cancel()
+
+        if task in done:
+            return task.result()
+
+        task.cancel()
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._check_abort(job)
+        # Deadline doldu
+        job.abort('deadline')
+        raise TurnAborted('deadline')
+
+    def _check_abort(self, job):
+        """İş iptal edildiyse veya deadline dolduysa TurnAborted fırlat"""
+        if job is None:
+            return
+        if job.abort_reason is None and job.deadline is not None and time.monotonic() >= job.deadline:
+            job.abort('deadline')
+        if job.abort_reason is not None:
+            raise TurnAborted(job.abort_reason)
+
+    async def _stop_generation(self, provider, page, stats):
+        """Sayfadaki üretimi durdur (Stop butonu) - sayfa bir sonraki istek için hemen boşalır"""
+        try:
+            clicked = await stats.call(page.evaluate(STOP_GENERATION_JS, PROVIDERS[provider]['stop_selector']))
+            return bool(clicked)
+        except Exception as e:
+            logger.warning(f"⚠️ {PROVIDERS[provider]['name']} üretim durdurma hatası: {e}")
+            return False
 
-            if not textarea_selector:
-                return {
-                    "IsError": True,
-                    "Content": None,
-                    "ErrorMessage": "ChatGPT input bulunamadı"
-                }
+    async def _send_message(self, provider, message, job=None):
+        """
+        Provider'a mesaj gönder ve yanıtı al
+        Önce tek evaluate ile gönderim (window.__quadro.send), başarısız olursa eski yol
+        job verilirse deadline / istemci kopması turu keser ve üretim durdurulur
+        """
+        info = PROVIDERS[provider]
+        name = info['name']
+        stats = TurnStats(provider)
+        watcher = None
+        page = None
 
-            # Mesaj gönder
-            element = await self.chatgpt_page.query_selector(textarea_selector)
-            await element.click()
-            await element.type(message)
-            await self.chatgpt_page.keyboard.press('Enter')
-
-            # Yanıt bekle
-            response_selector = 'div[data-message-author-role="assistant"]'
-            await self.chatgpt_page.wait_for_selector(response_selector, timeout=120000)
-
-            # Streaming bitene kadar bekle
-            prev_length = 0
-            stable_count = 0
-
-            for i in range(60):  # 30 saniye
-                await self.chatgpt_page.wait_for_timeout(500)
-
-                elements = await self.chatgpt_page.query_selector_all(response_selector)
-                if elements:
-                    current_text = await elements[-1].inner_text()
-                    current_length = len(current_text)
-
-                    if current_length == prev_length and current_length > 0:
-                        stable_count += 1
-                        if current_length < 100 and stable_count >= 1:
-                            break
-                        if stable_count >= 2:
-                            break
-                    else:
-                        stable_count = 0
-
-                    prev_length = current_length
-
-            # Yanıt al
-            elements = await self.chatgpt_page.query_selector_all(response_selector)
-            if elements:
-                response_text = await elements[-1].inner_text()
-                logger.info(f"🔵 [ChatGPT] Yanıt: {len(response_text)} karakter")
-
-                # Storage state'i kaydet
-                await self._save_chatgpt_storage()
+        try:
+            page = getattr(self, f'{provider}_page')
+            if not page or not getattr(self, f'{provider}_ready'):
+                return self._error_result(stats, f"{name} browser hazır değil")
+
+            if page.is_closed():
+                if not self._swap_to_standby(provider):
+                    return self._error_result(stats, f"{name} page kapalı")
+                page = getattr(self, f'{provider}_page')
+
+            logger.info(f"{info['icon']} [{name}] Mesaj gönderiliyor: {message[:50]}...")
+
+            # Streaming isteğini gönderimden ÖNCE izlemeye başla
+            watcher = StreamCompletionWatcher(page, STREAM_URL_PATTERNS[provider])
+            watcher.attach()
+
+            # Tek round-trip: modal temizliği + editör + baseline + yazma + gönderme
+            sent = await stats.call(page.evaluate(HELPER_SEND_JS, {
+                'text': message,
+                'editorSelectors': info['editor_selectors'],
+                'responseSelector': info['response_selector'],
+                'sendSelectors': info['send_selectors'],
+                'dismissModals': provider == 'chatgpt',
+            }))
+
+            if sent.get('ok'):
+                initial_count = sent['baseline']
+                self._record_draft(provider, sent)
+                if not sent['submitted']:
+                    # Sentetik gönderim tutmadı, gerçek Enter bas
+                    await stats.call(page.keyboard.press('Enter'))
+            else:
+                logger.warning(f"⚠️ {name} script gönderimi başarısız ({sent.get('reason')}), eski yola dönülüyor")
+                stats.mode = 'legacy'
+                if provider == 'chatgpt':
+                    initial_count = await self._legacy_submit_chatgpt(page, message, stats)
+                else:
+                    initial_count = await self._legacy_submit_gemini(page, message, stats)
+                if initial_count is None:
+                    return self._error_result(stats, f"{name} input bulunamadı")
+
+            # Yanıtı delta'lar ile topla
+            response_text = await self._collect_response(provider, page, initial_count, stats, watcher, job)
+
+            if response_text is not None:
+                logger.info(f"{info['icon']} [{name}] Yanıt: {len(response_text)} karakter")
+
+                # Storage state'i kaydet (aralıklı)
+                await self._maybe_save_storage(provider, stats)
+                self._record_turn(stats)
+                self._after_turn(provider)
 
                 return {
                     "IsError": False,
@@ -451,135 +1339,325 @@ class UnifiedAIBridge:
                     "timestamp": datetime.now().isoformat()
                 }
 
-            return {
-                "IsError": True,
-                "Content": None,
-                "ErrorMessage": "ChatGPT yanıt bulunamadı"
-            }
+            return self._error_result(stats, f"{name} yanıt bulunamadı")
+
+        except TurnAborted as e:
+            reason = str(e)
+            stopped = page is not None and await self._stop_generation(provider, page, stats)
+            logger.warning(
+                f"⏹️ [{name}] Tur kesildi ({reason})"
+                f"{', üretim durduruldu' if stopped else ''}"
+            )
+            self.metrics[provider]['cut_short'][reason] += 1
+            stats.completion = 'aborted'
+            return self._aborted_result(self._error_result(stats, f"{name} {ABORT_MESSAGES[reason]}"), reason)
 
         except Exception as e:
-            logger.error(f"❌ [ChatGPT] Mesaj hatası: {e}")
-            return {
-                "IsError": True,
-                "Content": None,
-                "ErrorMessage": str(e)
-            }
+            logger.error(f"❌ [{name}] Mesaj hatası: {e}")
+            return self._error_result(stats, str(e))
+
+        finally:
+            if watcher is not None:
+                watcher.detach()
+
+    async def _legacy_submit_chatgpt(self, page, message, stats):
+        """Eski gönderim yolu (selector bekle + click + type + Enter) - baseline döndürür"""
+        # ÖNEMLİ: Mesaj göndermeden önce modal kontrolü yap
+        # Login popup açılmış olabilir, kapatmamız lazım
+        await self._dismiss_chatgpt_modals(page, stats)
+
+        textarea_selector = await stats.call(first_visible(page, PROVIDERS['chatgpt']['editor_selectors']))
+        if not textarea_selector:
+            return None
+        logger.info(f"✅ ChatGPT input: {textarea_selector}")
+
+        # Mevcut yanıt sayısını kaydet (yeni yanıtı ayırt etmek için)
+        initial_count = await stats.call(page.locator(PROVIDERS['chatgpt']['response_selector']).count())
+
+        # Locator: ElementHandle oluşmaz (uzun oturumda handle birikmez)
+        element = page.locator(textarea_selector).first
+        await stats.call(element.click())
+        await stats.call(element.type(message))
+        await stats.call(page.keyboard.press('Enter'))
+        return initial_count
+
+    async def _legacy_submit_gemini(self, page, message, stats):
+        """Eski gönderim yolu (ilk mevcut editör + click + type + Enter) - baseline döndürür"""
+        textarea_element = None
+        for selector in PROVIDERS['gemini']['editor_selectors']:
+            try:
+                locator = page.locator(selector).first
+                if await stats.call(locator.count()):
+                    textarea_element = locator
+                    logger.info(f"✅ Gemini input: {selector}")
+                    break
+            except:
+                continue
+
+        if textarea_element is None:
+            return None
+
+        # Mevcut yanıt sayısını kaydet
+        initial_count = await stats.call(page.locator(PROVIDERS['gemini']['response_selector']).count())
+
+        await stats.call(textarea_element.click())
+        await stats.call(textarea_element.type(message))
+        await stats.call(page.keyboard.press('Enter'))
+        return initial_count
+
+    async def _collect_response(self, provider, page, initial_count, stats, watcher, job=None):
+        """
+        Yeni yanıtı stream bitene kadar delta'lar ile topla
+        Her tick'te sayfadan sadece yeni karakterler gelir, metin Python'da birleştirilir.
+        Bitiş sinyali: provider'ın streaming isteğinin bitmesi (ağ seviyesi);
+        istek görülmezse metin uzunluğu kararlılığına düşülür.
+        İş iptal edilirse / deadline dolarsa TurnAborted fırlatır.
+        """
+        info = PROVIDERS[provider]
+        response_selector = info['response_selector']
+
+        # Yeni yanıt elementi oluşana kadar bekle
+        await self._wait_abortable(stats.call(page.wait_for_function(
+            '([sel, n]) => document.querySelectorAll(sel).length > n',
+            arg=[response_selector, initial_count],
+            timeout=120000
+        )), job)
+
+        self.delta_turn += 1
+        args = {
+            'key': provider,
+            'turn': self.delta_turn,
+            'selector': response_selector,
+            'index': initial_count,
+            'stopSelector': info['stop_selector'],
+        }
+
+        loop = asyncio.get_event_loop()
+        deadline = loop.time() + 30  # 30 saniye
+        text = ''
+        found = False
+        stable_count = 0
+        stats.completion = 'timeout'
+
+        # Streaming bitene kadar bekle (bekleme Python tarafında - IPC yok)
+        while loop.time() < deadline:
+            self._check_abort(job)
+            if watcher.done:
+                # İstek bitti, sadece DOM'un son render'ını bekliyoruz
+                await asyncio.sleep(0.05)
+            else:
+                # Streaming isteği biterse 500ms dolmadan uyan
+                await watcher.wait(0.5)
 
-    async def send_gemini_message(self, message):
-        """Gemini'ye mesaj gönder"""
-        try:
-            if not self.gemini_page or not self.gemini_ready:
-                return {
-                    "IsError": True,
-                    "Content": None,
-                    "ErrorMessage": "Gemini browser hazır değil"
-                }
+            chunk = await stats.call(page.evaluate(HELPER_EXTRACT_JS, args))
+            if not chunk['found']:
+                continue
 
-            if self.gemini_page.is_closed():
-                return {
-                    "IsError": True,
-                    "Content": None,
-                    "ErrorMessage": "Gemini page kapalı"
-                }
+            found = True
+            text = text[:chunk['offset']] + chunk['delta']
 
-            logger.info(f"🟢 [Gemini] Mesaj gönderiliyor: {message[:50]}...")
+            if watcher.seen:
+                # Ağ sinyali: istek bitti ve sayfa artık üretmiyor → yanıt tamam
+                if watcher.done and not chunk['generating']:
+                    stats.completion = 'network'
+                    break
+                continue
 
-            # Textarea bul
-            textarea_selectors = [
-                'div[contenteditable="true"][role="textbox"]',
-                'rich-textarea',
-                'div[contenteditable="true"]',
-            ]
+            # Yedek: streaming isteği görülmedi, metin kararlılığına bak
+            if chunk['done']:
+                stable_count += 1
+                if (chunk['length'] < 100 and stable_count >= 1) or stable_count >= 2:
+                    stats.completion = 'heuristic'
+                    break
+            else:
+                stable_count = 0
 
-            textarea_element = None
-            for selector in textarea_selectors:
-                try:
-                    textarea_element = await self.gemini_page.query_selector(selector)
-                    if textarea_element:
-                        logger.info(f"✅ Gemini input: {selector}")
-                        break
-                except:
-                    continue
+        return text if found else None
 
-            if not textarea_element:
-                return {
-                    "IsError": True,
-                    "Content": None,
-                    "ErrorMessage": "Gemini input bulunamadı"
-                }
+    # ------------------------------------------------------------------
+    # Spekülatif taslak (sesli girişin ara transkriptleri)
+    # ------------------------------------------------------------------
 
-            # Mevcut yanıt sayısını kaydet
-            initial_responses = await self.gemini_page.query_selector_all('message-content')
-            initial_count = len(initial_responses)
-
-            # Mesaj gönder
-            await textarea_element.click()
-            await textarea_element.type(message)
-            await self.gemini_page.keyboard.press('Enter')
-
-            # Yanıt bekle
-            await self.gemini_page.wait_for_selector('message-content', timeout=120000)
-
-            # Streaming bitene kadar bekle
-            prev_length = 0
-            stable_count = 0
-
-            for i in range(60):  # 30 saniye
-                await self.gemini_page.wait_for_timeout(500)
-
-                elements = await self.gemini_page.query_selector_all('message-content')
-                if elements and len(elements) > initial_count:
-                    new_response = elements[initial_count]
-                    current_text = await new_response.inner_text()
-                    current_length = len(current_text)
-
-                    if current_length == prev_length and current_length > 0:
-                        stable_count += 1
-                        if current_length < 100 and stable_count >= 1:
-                            break
-                        if stable_count >= 2:
-                            break
-                    else:
-                        stable_count = 0
-
-                    prev_length = current_length
-
-            # Yanıt al
-            elements = await self.gemini_page.query_selector_all('message-content')
-            if elements and len(elements) > initial_count:
-                response_text = await elements[initial_count].inner_text()
-                logger.info(f"🟢 [Gemini] Yanıt: {len(response_text)} karakter")
-
-                # Storage state'i kaydet
-                await self._save_gemini_storage()
+    async def prefill_provider(self, provider, text):
+        """Editördeki taslağı güncelle (gönderme YOK) - sadece fark yazılır"""
+        info = PROVIDERS[provider]
+        start = asyncio.get_event_loop().time()
 
-                return {
-                    "IsError": False,
-                    "Content": response_text,
-                    "ErrorMessage": None,
-                    "timestamp": datetime.now().isoformat()
-                }
+        page = getattr(self, f'{provider}_page')
+        if not page or not getattr(self, f'{provider}_ready') or page.is_closed():
+            return {"status": "error", "error": f"{info['name']} browser hazır değil"}
 
-            return {
-                "IsError": True,
-                "Content": None,
-                "ErrorMessage": "Gemini yanıt bulunamadı"
-            }
+        # Çalışan veya kuyrukta bekleyen tur varken editöre dokunma: taslak turun
+        # writeDraft ile send arasına girebilir ya da gönderimden sonra editörde kalır.
+        # Atlamak güvenli - gönderim final metni zaten kendisi yazar.
+        if self.running[provider] is not None or self.queues[provider]:
+            self.metrics[provider]['draft']['prefills_skipped'] += 1
+            return {"status": "skipped", "reason": "busy"}
 
+        try:
+            result = await page.evaluate(HELPER_PREFILL_JS, {
+                'text': text,
+                'editorSelectors': info['editor_selectors'],
+            })
         except Exception as e:
-            logger.error(f"❌ [Gemini] Mesaj hatası: {e}")
-            return {
-                "IsError": True,
-                "Content": None,
-                "ErrorMessage": str(e)
-            }
+            logger.warning(f"⚠️ {info['name']} taslak hatası: {e}")
+            return {"status": "error", "error": str(e)}
+
+        elapsed_ms = int((asyncio.get_event_loop().time() - start) * 1000)
+        if not result.get('ok'):
+            return {"status": "error", "error": result.get('reason'), "elapsed_ms": elapsed_ms}
+
+        self.metrics[provider]['draft']['prefills'] += 1
+        return {
+            "status": "ok",
+            "written": result['written'],
+            "kept": result['kept'],
+            "elapsed_ms": elapsed_ms
+        }
+
+    def _record_draft(self, provider, sent):
+        """Gönderimde taslaktan korunan/yazılan karakterleri kaydet"""
+        draft = self.metrics[provider]['draft']
+        draft['chars_kept'] += sent.get('kept', 0)
+        draft['chars_written'] += sent.get('written', 0)
+        if sent.get('kept'):
+            draft['submits_from_draft'] += 1
+            logger.info(
+                f"✏️ [{PROVIDERS[provider]['name']}] Taslak kullanıldı: "
+                f"{sent['kept']} karakter korundu, {sent['written']} karakter yazıldı"
+            )
+
+    # ------------------------------------------------------------------
+    # Metrikler
+    # ------------------------------------------------------------------
+
+    def _error_result(self, stats, message):
+        """Hata yanıtı üret ve metriklere işle"""
+        self.metrics[stats.provider]['errors'] += 1
+        self._record_turn(stats)
+        return {
+            "IsError": True,
+            "Content": None,
+            "ErrorMessage": message
+        }
+
+    def _record_turn(self, stats):
+        """Tur sonu: IPC round-trip sayısını gönderim moduna göre kaydet"""
+        provider_metrics = self.metrics[stats.provider]
+        provider_metrics['requests'] += 1
+        ipc = provider_metrics['ipc'][stats.mode]
+        ipc['requests'] += 1
+        ipc['calls'] += stats.ipc_calls
+        ipc['last'] = stats.ipc_calls
+        ipc['avg'] = round(ipc['calls'] / ipc['requests'], 1)
+        if stats.completion:
+            provider_metrics['completion'][stats.completion] += 1
+        logger.info(f"📊 [{PROVIDERS[stats.provider]['name']}] IPC round-trip: {stats.ipc_calls} ({stats.mode})")
+
+    def get_metrics(self):
+        """Metriklerin JSON uyumlu kopyası"""
+        return json.loads(json.dumps(self.metrics))
+
+    async def _handle_audit_loop(self):
+        """handle_audit_interval_s aralıkla canlı handle ve DOM sayaçlarını denetle"""
+        while True:
+            await asyncio.sleep(config['handle_audit_interval_s'])
+            if not self.closing:
+                await self.audit_handles()
+
+    async def audit_handles(self):
+        """
+        Aktif sayfalarda canlı handle sayısı, DOM node / doküman / listener sayısı ve JS heap
+        Uzun oturumda bu değerler düz kalmalı; artış sızıntı demektir (metrics "handles")
+        """
+        for provider, info in PROVIDERS.items():
+            page = getattr(self, f'{provider}_page')
+            context = getattr(self, f'{provider}_context')
+            if page is None or context is None or page.is_closed():
+                continue
+            try:
+                audit = await audit_page(context, page)
+            except Exception as e:
+                logger.warning(f"⚠️ [{info['name']}] Handle denetimi başarısız: {e}")
+                continue
+
+            # Node artışı aynı sayfa için ölçülür (rotasyon / reset sonrası yeni taban)
+            baseline = self.audit_baselines.get(provider)
+            if baseline is None or baseline[0] is not page:
+                baseline = self.audit_baselines[provider] = (page, audit['dom_nodes'])
+
+            handles = self.metrics[provider]['handles']
+            handles.update(audit)
+            handles['dom_nodes_growth'] = audit['dom_nodes'] - baseline[1]
+            handles['audits'] += 1
+            handles['audited_at'] = datetime.now().isoformat(timespec='seconds')
+
+            live = audit['live_handles']
+            summary = (
+                f"handle: {'?' if live is None else live}, DOM node: {audit['dom_nodes']} "
+                f"({handles['dom_nodes_growth']:+d}), listener: {audit['js_event_listeners']}, "
+                f"JS heap: {audit['js_heap_mb']} MB"
+            )
+            if live is not None and live >= HANDLE_LEAK_WARN:
+                logger.warning(f"⚠️ [{info['name']}] Handle sızıntısı şüphesi - {summary}")
+            else:
+                logger.info(f"🧮 [{info['name']}] Denetim - {summary}")
+
+    async def _maybe_save_storage(self, provider, stats):
+        """Storage state'i en fazla storage_save_interval_s aralıkla kaydet"""
+        now = time.monotonic()
+        if now - self.storage_saved_at[provider] < config['storage_save_interval_s']:
+            return
+        self.storage_saved_at[provider] = now
+        if provider == 'chatgpt':
+            await stats.call(self._save_chatgpt_storage())
+        else:
+            await stats.call(self._save_gemini_storage())
+
+    def _load_storage(self, provider):
+        """Kayıtlı storage state (cookie + localStorage) - yoksa veya okunamazsa None"""
+        path = os.path.join(profile_dir, f'{provider}-storage.json')
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ {PROVIDERS[provider]['name']} storage okunamadı, yeni oluşturulacak: {e}")
+            return None
+
+    async def promote(self):
+        """
+        Warm spare aktif oldu (supervisor POST /promote): eski process'in açılışımızdan sonra
+        kaydettiği cookie / localStorage'ı context'lere uygula, kapanışta storage kaydını aç
+        """
+        if not self.spare:
+            return {"status": "ok", "refreshed": []}
+        self.spare = False
+        refreshed = []
+        for provider in PROVIDERS:
+            context = getattr(self, f'{provider}_context')
+            storage = self._load_storage(provider)
+            if context is None or not storage:
+                continue
+            try:
+                await context.add_cookies(storage.get('cookies', []))
+                page = getattr(self, f'{provider}_page')
+                if page is not None and not page.is_closed():
+                    for origin in storage.get('origins', []):
+                        if page.url.startswith(origin.get('origin', '') + '/'):
+                            await page.evaluate(RESTORE_LOCAL_STORAGE_JS, origin.get('localStorage', []))
+                refreshed.append(provider)
+            except Exception as e:
+                logger.warning(f"⚠️ {PROVIDERS[provider]['name']} storage yenilenemedi: {e}")
+        logger.info(f"🔁 Yedek process aktif oldu, storage yenilendi: {', '.join(refreshed) or '-'}")
+        return {"status": "ok", "refreshed": refreshed}
 
     async def _save_chatgpt_storage(self):
         """ChatGPT storage state'i kaydet"""
         try:
             storage = await self.chatgpt_context.storage_state()
-            with open(os.path.join(profile_dir, 'chatgpt-storage.json'), 'w') as f:
-                json.dump(storage, f)
+            write_json_atomic(os.path.join(profile_dir, 'chatgpt-storage.json'), storage)
         except Exception as e:
             logger.warning(f"⚠️ ChatGPT storage kaydetme hatası: {e}")
 
@@ -587,17 +1665,20 @@ class UnifiedAIBridge:
         """Gemini storage state'i kaydet"""
         try:
             storage = await self.gemini_context.storage_state()
-            with open(os.path.join(profile_dir, 'gemini-storage.json'), 'w') as f:
-                json.dump(storage, f)
+            write_json_atomic(os.path.join(profile_dir, 'gemini-storage.json'), storage)
         except Exception as e:
             logger.warning(f"⚠️ Gemini storage kaydetme hatası: {e}")
 
     async def close(self):
         """Browser ve context'leri kapat"""
+        self.closing = True
         try:
-            # Storage state'leri kaydet
-            await self._save_chatgpt_storage()
-            await self._save_gemini_storage()
+            # Storage state'leri kaydet - yedek process aktifin yeni cookie'lerini ezmesin
+            if self.spare:
+                logger.info("🔥 Yedek process: storage state kaydedilmedi")
+            else:
+                await self._save_chatgpt_storage()
+                await self._save_gemini_storage()
 
             # Context'leri kapat
             if self.chatgpt_context:
@@ -637,16 +1718,45 @@ class UnifiedAIHandler(BaseHTTPRequestHandler):
             response = json.dumps({
                 "status": "ok",
                 "chatgpt_ready": bridge.chatgpt_ready,
-                "gemini_ready": bridge.gemini_ready
+                "gemini_ready": bridge.gemini_ready,
+                "chatgpt_standby": bridge.standby_pages['chatgpt'] is not None,
+                "gemini_standby": bridge.standby_pages['gemini'] is not None,
+                "browser_mode": bridge.browser_mode,
+                "launch_profile": bridge.launch_profile,
+                "startup": bridge.startup_status()
             })
             self.wfile.write(response.encode())
 
+        elif self.path == '/health/probe':
+            # Derin health check (bridge_supervisor.py): hazır sekmelere evaluate round-trip'i
+            pages = {}
+            if bridge.chatgpt_ready:
+                pages['chatgpt'] = bridge.chatgpt_page
+            if bridge.gemini_ready:
+                pages['gemini'] = bridge.gemini_page
+            code, body = probe_response(bridge.loop, pages, bool(pages))
+            self.send_response(code)
+            self.send_header('Content-Type', 'application/json')
+            self.end_headers()
+            self.wfile.write(json.dumps(body).encode())
+
+        elif self.path == '/metrics':
+            # Bridge metrikleri (IPC round-trip, istek/hata sayıları)
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.end_headers()
+            self.wfile.write(json.dumps(bridge.get_metrics()).encode())
+
         elif self.path == '/chatgpt/health':
             # ChatGPT health check
             self.send_response(200)
             self.send_header('Content-Type', 'application/json')
             self.end_headers()
-            response = json.dumps({"status": "ok", "ready": bridge.chatgpt_ready})
+            response = json.dumps({
+                "status": "ok",
+                "ready": bridge.chatgpt_ready,
+                "eta_ms": bridge.provider_eta_ms('chatgpt')
+            })
             self.wfile.write(response.encode())
 
         elif self.path == '/gemini/health':
@@ -654,7 +1764,11 @@ class UnifiedAIHandler(BaseHTTPRequestHandler):
             self.send_response(200)
             self.send_header('Content-Type', 'application/json')
             self.end_headers()
-            response = json.dumps({"status": "ok", "ready": bridge.gemini_ready})
+            response = json.dumps({
+                "status": "ok",
+                "ready": bridge.gemini_ready,
+                "eta_ms": bridge.provider_eta_ms('gemini')
+            })
             self.wfile.write(response.encode())
 
         else:
@@ -672,12 +1786,37 @@ class UnifiedAIHandler(BaseHTTPRequestHandler):
         elif self.path == '/gemini/chat':
             self._handle_chat_request(bridge.send_gemini_message)
 
+        # Spekülatif taslak (ara transkript) - gönderim yok
+        elif self.path == '/chatgpt/prefill':
+            self._handle_prefill_request('chatgpt')
+
+        elif self.path == '/gemini/prefill':
+            self._handle_prefill_request('gemini')
+
+        # Final metinle taslağı uzlaştır (sadece fark) ve gönder
+        elif self.path in ['/submit', '/chatgpt/submit']:
+            self._handle_chat_request(bridge.send_chatgpt_message)
+
+        elif self.path == '/gemini/submit':
+            self._handle_chat_request(bridge.send_gemini_message)
+
         # Reset endpoints
-        elif self.path in ['/reset', '/chatgpt/reset', '/gemini/reset']:
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps({"status": "ok"}).encode())
+        elif self.path in ['/reset', '/chatgpt/reset']:
+            self._handle_reset_request('chatgpt')
+
+        elif self.path == '/gemini/reset':
+            self._handle_reset_request('gemini')
+
+        # İptal (çalışan tur veya ID ile kuyruktaki istek)
+        elif self.path in ['/cancel', '/chatgpt/cancel']:
+            self._handle_cancel_request('chatgpt')
+
+        elif self.path == '/gemini/cancel':
+            self._handle_cancel_request('gemini')
+
+        # Warm spare → aktif (supervisor)
+        elif self.path == '/promote':
+            self._handle_promote_request()
 
         # Shutdown
         elif self.path == '/shutdown':
@@ -687,6 +1826,54 @@ class UnifiedAIHandler(BaseHTTPRequestHandler):
             self.send_response(404)
             self.end_headers()
 
+    def _scheduling(self):
+        """
+        Kuyruk başlıkları:
+          X-Priority: interactive (varsayılan) | background
+          X-Deadline: istemcinin bekleyeceği süre (ms) - kuyrukta bu süreyi aşan istek düşürülür
+        """
+        priority = (self.headers.get('X-Priority') or PRIORITY_CLASSES[0]).strip().lower()
+        deadline = None
+        deadline_ms = self.headers.get('X-Deadline')
+        if deadline_ms:
+            try:
+                deadline = time.monotonic() + float(deadline_ms) / 1000
+            except ValueError:
+                logger.warning(f"⚠️ Geçersiz X-Deadline: {deadline_ms}")
+        return {'priority': priority, 'deadline': deadline}
+
+    def _wait_for_result(self, future, request, timeout):
+        """
+        Sonucu beklerken istemci bağlantısını izle
+        İstemci koparsa veya süre dolarsa iş bırakılır (çalışıyorsa üretim durdurulur);
+        kopmada None döner.
+        """
+        end = time.monotonic() + timeout
+        while True:
+            try:
+                return future.result(timeout=0.25)
+            except concurrent.futures.TimeoutError:
+                pass
+
+            if self._client_disconnected():
+                logger.info("🚪 İstemci bağlantısı koptu, istek bırakılıyor")
+                bridge.loop.call_soon_threadsafe(bridge.release_request, request, 'disconnect')
+                return None
+
+            if time.monotonic() >= end:
+                bridge.loop.call_soon_threadsafe(bridge.release_request, request, 'deadline')
+                raise TimeoutError(f"Yanıt {timeout} sn içinde gelmedi")
+
+    def _client_disconnected(self):
+        """İstemci soketi kapandı mı? (okunabilir + MSG_PEEK ile 0 byte = EOF)"""
+        try:
+            readable, _, _ = select.select([self.connection], [], [], 0)
+            if not readable:
+                return False
+            return self.connection.recv(1, socket.MSG_PEEK) == b''
+        except (OSError, ValueError):
+            return True
+
     def _handle_chat_request(self, send_func):
         """Chat request'i işle"""
         try:
@@ -698,8 +1885,16 @@ class UnifiedAIHandler(BaseHTTPRequestHandler):
 
             loop = bridge.loop
             if loop and loop.is_running():
-                future = asyncio.run_coroutine_threadsafe(send_func(message), loop)
-                result = future.result(timeout=300)
+                request = ClientRequest(self.headers.get('X-Request-Id') or data.get('request_id'))
+                future = asyncio.run_coroutine_threadsafe(
+                    send_func(message, request=request, **self._scheduling()), loop
+                )
+                result = self._wait_for_result(future, request, timeout=300)
+                if result is None:
+                    # İstemci gitti, yazılacak yer yok
+                    return
+                # Singleflight takipçileri aynı sonucu paylaşır, ID istek başına eklenir
+                result = dict(result, RequestId=request.request_id)
             else:
                 result = {
                     "IsError": True,
@@ -723,6 +1918,112 @@ class UnifiedAIHandler(BaseHTTPRequestHandler):
                 "ErrorMessage": str(e)
             }).encode())
 
+    def _handle_prefill_request(self, provider):
+        """Prefill request'i işle (taslağı yaz, gönderme)"""
+        try:
+            content_length = int(self.headers['Content-Length'])
+            body = self.rfile.read(content_length)
+            data = json.loads(body.decode())
+
+            text = data.get('text', data.get('message', ''))
+
+            loop = bridge.loop
+            if loop and loop.is_running():
+                future = asyncio.run_coroutine_threadsafe(bridge.prefill_provider(provider, text), loop)
+                result = future.result(timeout=10)
+            else:
+                result = {"status": "error", "error": "Event loop not running"}
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.end_headers()
+            self.wfile.write(json.dumps(result).encode())
+
+        except Exception as e:
+            logger.error(f"❌ Prefill hatası: {e}")
+            self.send_response(500)
+            self.send_header('Content-Type', 'application/json')
+            self.end_headers()
+            self.wfile.write(json.dumps({"status": "error", "error": str(e)}).encode())
+
+    def _handle_cancel_request(self, provider):
+        """Cancel request'i işle - body opsiyonel: {"request_id": "...", "all": true}"""
+        try:
+            content_length = int(self.headers.get('Content-Length') or 0)
+            data = json.loads(self.rfile.read(content_length).decode()) if content_length else {}
+
+            loop = bridge.loop
+            if loop and loop.is_running():
+                future = asyncio.run_coroutine_threadsafe(
+                    self._cancel_async(provider, data.get('request_id'), bool(data.get('all'))), loop
+                )
+                result = future.result(timeout=5)
+            else:
+                result = {"status": "error", "error": "Event loop not running"}
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.end_headers()
+            self.wfile.write(json.dumps(result).encode())
+
+        except Exception as e:
+            logger.error(f"❌ Cancel hatası: {e}")
+            self.send_response(500)
+            self.send_header('Content-Type', 'application/json')
+            self.end_headers()
+            self.wfile.write(json.dumps({"status": "error", "error": str(e)}).encode())
+
+    @staticmethod
+    async def _cancel_async(provider, request_id, include_queued):
+        """bridge.cancel'i event loop içinde çalıştır"""
+        return bridge.cancel(provider, request_id, include_queued)
+
+    def _handle_promote_request(self):
+        """Promote request'i işle - supervisor yedek process'e geçince çağırır"""
+        try:
+            loop = bridge.loop
+            if loop and loop.is_running():
+                future = asyncio.run_coroutine_threadsafe(bridge.promote(), loop)
+                result = future.result(timeout=10)
+            else:
+                result = {"status": "error", "error": "Event loop not running"}
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.end_headers()
+            self.wfile.write(json.dumps(result).encode())
+
+        except Exception as e:
+            logger.error(f"❌ Promote hatası: {e}")
+            self.send_response(500)
+            self.send_header('Content-Type', 'application/json')
+            self.end_headers()
+            self.wfile.write(json.dumps({"status": "error", "error": str(e)}).encode())
+
+    def _handle_reset_request(self, provider):
+        """Reset request'i işle (yeni sohbet)"""
+        try:
+            loop = bridge.loop
+            if loop and loop.is_running():
+                future = asyncio.run_coroutine_threadsafe(
+                    bridge.reset_provider(provider, **self._scheduling()), loop
+                )
+                result = future.result(timeout=120)
+            else:
+                result = {"status": "error", "error": "Event loop not running"}
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.end_headers()
+            self.wfile.write(json.dumps(result).encode())
+
+        except Exception as e:
+            logger.error(f"❌ Reset hatası: {e}")
+            self.send_response(500)
+            self.send_header('Content-Type', 'application/json')
+            self.end_headers()
+            self.wfile.write(json.dumps({"status": "error", "error": str(e)}).encode())
+
     def _handle_shutdown(self):
         """Graceful shutdown"""
         logger.info("🛑 Shutdown isteği alındı...")
@@ -759,18 +2060,24 @@ async def run_async():
         await asyncio.sleep(1)
 
 
-def start_server():
+def start_server(port=8765):
     """HTTP server başlat"""
-    server = HTTPServer(('127.0.0.1', 8765), UnifiedAIHandler)
-    logger.info("🌐 Unified AI HTTP Server: http://127.0.0.1:8765")
+    server = ThreadingHTTPServer(('127.0.0.1', port), UnifiedAIHandler)
+    server.daemon_threads = True
+    logger.info(f"🌐 Unified AI HTTP Server: http://127.0.0.1:{port}")
     logger.info("   📌 ChatGPT: POST /chatgpt/chat veya /chat")
     logger.info("   📌 Gemini:  POST /gemini/chat")
-    logger.info("   📌 Health:  GET /health, /chatgpt/health, /gemini/health")
+    logger.info("   📌 Taslak:  POST /chatgpt/prefill, /gemini/prefill → /chatgpt/submit, /gemini/submit")
+    logger.info("   📌 İptal:   POST /chatgpt/cancel, /gemini/cancel")
+    logger.info("   📌 Health:  GET /health, /health/probe, /chatgpt/health, /gemini/health")
+    logger.info("   📌 Metrik:  GET /metrics")
     server.serve_forever()
 
 
 def main():
     """Main entry point"""
+    args = parse_args('Unified AI HTTP Bridge', default_port=8765)
+
     logger.info("=" * 60)
     logger.info("🚀 Unified AI HTTP Bridge - QuadroAIPilot")
     logger.info("   Tek Chromium, 2 Sekme (ChatGPT + Gemini)")
@@ -780,8 +2087,15 @@ def main():
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
     bridge.loop = loop
+    bridge.spare = args.spare
+
+    if config['standby_pages'] and psutil is None:
+        logger.warning("⚠️ psutil yüklü değil: standby bellek bütçesi uygulanamıyor (pip install psutil)")
+
+    if args.supervised:
+        exit_with_parent(bridge)
 
-    loop.run_in_executor(None, start_server)
+    loop.run_in_executor(None, start_server, args.port)
 
     try:
         loop.run_until_complete(run_async())
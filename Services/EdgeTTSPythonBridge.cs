@@ -1,8 +1,11 @@
 using System;
+using System.Collections.Concurrent;
 using System.Collections.Generic;
 using System.Diagnostics;
 using System.IO;
 using System.Text;
+using System.Text.Json;
+using System.Threading;
 using System.Threading.Tasks;
 using QuadroAIPilot.Services;
 
@@ -17,6 +20,16 @@ namespace QuadroAIPilot.Services
         private readonly string _pythonPath;
         private readonly string _edgeTtsScript;
 
+        // Daemon modu: tek uzun ömürlü python process (stdin/stdout JSON satırları)
+        // Her utterance'ta interpreter başlatma, import ve SSL patch maliyeti ödenmez
+        private Process _daemon;
+        private readonly SemaphoreSlim _daemonStartLock = new SemaphoreSlim(1, 1);
+        private readonly SemaphoreSlim _daemonWriteLock = new SemaphoreSlim(1, 1);
+        private readonly ConcurrentDictionary<string, TaskCompletionSource<JsonElement>> _pending = new();
+        private bool _daemonDisabled;
+        private const int DaemonStartTimeoutMs = 15000;
+        private const int DaemonRequestTimeoutMs = 60000;
+
         public EdgeTTSPythonBridge()
         {
             _tempDir = Path.Combine(Path.GetTempPath(), "QuadroAI_EdgeTTS");
@@ -47,6 +60,196 @@ namespace QuadroAIPilot.Services
         }
         
         public async Task<byte[]> SynthesizeSpeechAsync(string text, string voice = "tr-TR-EmelNeural")
+        {
+            // Önce daemon'u dene, başarısız olursa eski tek seferlik process yoluna dön
+            if (!_daemonDisabled && _edgeTtsScript != null && File.Exists(_edgeTtsScript))
+            {
+                try
+                {
+                    return await SynthesizeViaDaemonAsync(text, voice);
+                }
+                catch (Exception ex)
+                {
+                    LoggingService.LogWarning($"[EdgeTTSPython] Daemon hatası, tek seferlik process'e dönülüyor: {ex.Message}");
+                }
+            }
+
+            return await SynthesizeOneShotAsync(text, voice);
+        }
+
+        private async Task<byte[]> SynthesizeViaDaemonAsync(string text, string voice)
+        {
+            var daemon = await EnsureDaemonAsync(voice);
+
+            var id = Guid.NewGuid().ToString("N");
+            var outputFile = Path.Combine(_tempDir, $"tts_{id}.mp3");
+            var tcs = new TaskCompletionSource<JsonElement>(TaskCreationOptions.RunContinuationsAsynchronously);
+            _pending[id] = tcs;
+
+            try
+            {
+                var request = JsonSerializer.Serialize(new Dictionary<string, string>
+                {
+                    ["id"] = id,
+                    ["text"] = text,
+                    ["voice"] = voice,
+                    ["output"] = outputFile
+                });
+
+                await _daemonWriteLock.WaitAsync();
+                try
+                {
+                    await daemon.StandardInput.WriteLineAsync(request);
+                    await daemon.StandardInput.FlushAsync();
+                }
+                finally
+                {
+                    _daemonWriteLock.Release();
+                }
+
+                var completed = await Task.WhenAny(tcs.Task, Task.Delay(DaemonRequestTimeoutMs));
+                if (completed != tcs.Task)
+                {
+                    throw new TimeoutException("edge-tts daemon yanıt vermedi");
+                }
+
+                var reply = await tcs.Task;
+                if (!reply.GetProperty("ok").GetBoolean())
+                {
+                    var error = reply.TryGetProperty("error", out var e) ? e.GetString() : "bilinmeyen hata";
+                    throw new Exception($"edge-tts daemon: {error}");
+                }
+
+                var audioData = await File.ReadAllBytesAsync(outputFile);
+                var cached = reply.TryGetProperty("cached", out var c) && c.GetBoolean();
+                LoggingService.LogVerbose($"[EdgeTTSPython] Daemon audio: {audioData.Length} bytes ({reply.GetProperty("elapsed_ms").GetInt32()} ms{(cached ? ", önbellek" : "")})");
+                return audioData;
+            }
+            finally
+            {
+                _pending.TryRemove(id, out _);
+                try { File.Delete(outputFile); } catch { }
+            }
+        }
+
+        private async Task<Process> EnsureDaemonAsync(string voice)
+        {
+            var daemon = _daemon;
+            if (daemon != null && !daemon.HasExited)
+            {
+                return daemon;
+            }
+
+            await _daemonStartLock.WaitAsync();
+            try
+            {
+                if (_daemon != null && !_daemon.HasExited)
+                {
+                    return _daemon;
+                }
+
+                var startInfo = new ProcessStartInfo
+                {
+                    FileName = _pythonPath,
+                    Arguments = $"\"{_edgeTtsScript}\" --daemon",
+                    UseShellExecute = false,
+                    RedirectStandardInput = true,
+                    RedirectStandardOutput = true,
+                    RedirectStandardError = true,
+                    CreateNoWindow = true,
+                    StandardInputEncoding = new UTF8Encoding(false),
+                    StandardOutputEncoding = Encoding.UTF8,
+                    StandardErrorEncoding = Encoding.UTF8
+                };
+
+                var process = new Process { StartInfo = startInfo };
+                process.ErrorDataReceived += (s, e) =>
+                {
+                    if (!string.IsNullOrWhiteSpace(e.Data))
+                    {
+                        LoggingService.LogVerbose($"[EdgeTTSPython] Daemon: {e.Data}");
+                    }
+                };
+                process.Start();
+                process.BeginErrorReadLine();
+
+                // İlk satır {"event": "ready"} olmalı
+                var readyTask = process.StandardOutput.ReadLineAsync();
+                if (await Task.WhenAny(readyTask, Task.Delay(DaemonStartTimeoutMs)) != readyTask ||
+                    readyTask.Result == null || !readyTask.Result.Contains("\"ready\""))
+                {
+                    try { process.Kill(); } catch { }
+                    _daemonDisabled = true;
+                    throw new Exception("edge-tts daemon başlatılamadı, tek seferlik moda geçildi");
+                }
+
+                _daemon = process;
+                _ = Task.Run(() => ReadDaemonRepliesAsync(process));
+                LoggingService.LogWarning($"[EdgeTTSPython] Daemon başlatıldı (PID: {process.Id})");
+
+                // Sık kullanılan geri bildirim cümlelerini boşta önbelleğe al (gerçek istekleri bekletmez)
+                var warmup = JsonSerializer.Serialize(new Dictionary<string, string>
+                {
+                    ["id"] = "warmup",
+                    ["cmd"] = "warmup",
+                    ["voice"] = voice
+                });
+                await _daemonWriteLock.WaitAsync();
+                try
+                {
+                    await process.StandardInput.WriteLineAsync(warmup);
+                    await process.StandardInput.FlushAsync();
+                }
+                finally
+                {
+                    _daemonWriteLock.Release();
+                }
+                return process;
+            }
+            finally
+            {
+                _daemonStartLock.Release();
+            }
+        }
+
+        private async Task ReadDaemonRepliesAsync(Process process)
+        {
+            try
+            {
+                string line;
+                while ((line = await process.StandardOutput.ReadLineAsync()) != null)
+                {
+                    try
+                    {
+                        using var doc = JsonDocument.Parse(line);
+                        var root = doc.RootElement;
+                        if (root.TryGetProperty("id", out var idProp) &&
+                            idProp.ValueKind == JsonValueKind.String &&
+                            _pending.TryGetValue(idProp.GetString(), out var tcs))
+                        {
+                            tcs.TrySetResult(root.Clone());
+                        }
+                    }
+                    catch (JsonException)
+                    {
+                        LoggingService.LogVerbose($"[EdgeTTSPython] Daemon çıktısı: {line}");
+                    }
+                }
+            }
+            catch (Exception ex)
+            {
+                LoggingService.LogWarning($"[EdgeTTSPython] Daemon okuma hatası: {ex.Message}");
+            }
+
+            // Process kapandı - bekleyen istekler tek seferlik yola düşsün, sonraki istek yeniden başlatır
+            LoggingService.LogWarning("[EdgeTTSPython] Daemon kapandı");
+            foreach (var pending in _pending.Values)
+            {
+                pending.TrySetException(new Exception("edge-tts daemon kapandı"));
+            }
+        }
+
+        private async Task<byte[]> SynthesizeOneShotAsync(string text, string voice)
         {
             try
             {
@@ -151,6 +354,22 @@ namespace QuadroAIPilot.Services
         
         public void Dispose()
         {
+            // Daemon'u kapat (stdin kapanınca kendiliğinden çıkar)
+            try
+            {
+                if (_daemon != null && !_daemon.HasExited)
+                {
+                    _daemon.StandardInput.WriteLine("{\"cmd\": \"shutdown\"}");
+                    _daemon.StandardInput.Close();
+                    if (!_daemon.WaitForExit(2000))
+                    {
+                        _daemon.Kill();
+                    }
+                }
+                _daemon?.Dispose();
+            }
+            catch { }
+
             // Temp dizini temizle
             try
             {
@@ -94,9 +94,16 @@ function Test-EdgeTTSInstallation {
         $pipList = & $script:pythonPath -m pip list 2>&1
         if ($pipList -match "edge-tts") {
             $edgeVersion = & $script:pythonPath -c "import importlib.metadata; print(importlib.metadata.version('edge-tts'))" 2>&1
-            Write-Host "[OK] edge-tts kurulu: v$edgeVersion" -ForegroundColor Green
-            $script:edgeTTSInstalled = $true
-            return $true
+            # edge-tts-nossl.py daemon modu Communicate(connector=...) kullanir (edge-tts >= 7)
+            $edgeMajor = 0
+            [int]::TryParse(("$edgeVersion" -split '\.')[0], [ref]$edgeMajor) | Out-Null
+            if ($edgeMajor -ge 7) {
+                Write-Host "[OK] edge-tts kurulu: v$edgeVersion" -ForegroundColor Green
+                $script:edgeTTSInstalled = $true
+                return $true
+            }
+            Write-Host "[UYARI] edge-tts v$edgeVersion eski (>= 7 gerekli), guncellenecek" -ForegroundColor Yellow
+            return $false
         }
     } catch {
         # pip veya edge-tts yok
@@ -186,7 +193,7 @@ function Install-EdgeTTS {
         
         # edge-tts'i kur
         Write-Host "edge-tts kuruluyor..." -ForegroundColor Yellow
-        & $script:pythonPath -m pip install edge-tts --quiet
+        & $script:pythonPath -m pip install --upgrade "edge-tts>=7" --quiet
         
         # Kurulumu doğrula
         $verification = & $script:pythonPath -c "import edge_tts; print('OK')" 2>&1
@@ -0,0 +1,288 @@
+#!/usr/bin/env python
+"""edge-tts-nossl.py benchmark - tek seferlik process vs daemon modu
+
+Gerçek Microsoft servisi yerine yerel bir stand-in TTS sunucusu açar (edge-tts websocket
+protokolünü konuşur) ve iki modda utterance başına gecikmeyi ölçer:
+    oneshot - her utterance için yeni python process (EdgeTTSPythonBridge'in eski yolu)
+    daemon  - tek process, stdin/stdout JSON satırları
+
+--long ile uzun bir AI yanıtı için tek istek ve cümle modu (paralel) karşılaştırılır:
+ilk ses süresi ve toplam süre. Stand-in sunucu sentez süresini metin uzunluğuyla orantılı
+simüle eder (--ms-per-char).
+
+Kullanım:
+    python benchmark_edge_tts.py
+    python benchmark_edge_tts.py --runs 20 --connect-delay-ms 150 --json sonuc.json
+    python benchmark_edge_tts.py --long --parallel 3
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+from aiohttp import web
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+WRAPPER = os.path.join(SCRIPT_DIR, "edge-tts-nossl.py")
+SAMPLE_TEXT = "Merhaba, bugün hava güneşli ve sıcaklık yirmi dört derece."
+VOICE = "tr-TR-EmelNeural"
+LONG_TEXT = (
+    "Yarınki toplantı saat onda başlayacak ve yaklaşık bir saat sürecek. "
+    "Gündemde üç ana konu var: bütçe planlaması, yeni proje takvimi ve ekip dağılımı. "
+    "Bütçe tarafında geçen çeyreğe göre yüzde on iki artış öneriliyor. "
+    "Proje takvimi için ilk teslim tarihi kasım ayının ikinci haftası olarak belirlendi. "
+    "Ekip dağılımında iki yeni geliştiricinin katılımı bekleniyor. "
+    "Toplantıdan önce sunum dosyasını gözden geçirmeniz faydalı olacaktır. "
+    "Sorularınız olursa Dr. Yılmaz ile önceden görüşebilirsiniz. "
+    "Toplantı notları aynı gün içinde e-posta ile paylaşılacak."
+)
+
+
+# ------------------------------------------------------------------
+# Stand-in TTS sunucusu
+# ------------------------------------------------------------------
+
+def binary_frame(request_id, audio):
+    """edge-tts binary mesajı: 2 byte header uzunluğu + header + ses verisi"""
+    header = (
+        f"X-RequestId:{request_id}\r\n"
+        "Content-Type:audio/mpeg\r\n"
+        "Path:audio\r\n"
+    ).encode()
+    return len(header).to_bytes(2, "big") + header + audio
+
+
+def text_frame(request_id, path, body="{}"):
+    return (
+        f"X-RequestId:{request_id}\r\n"
+        "Content-Type:application/json; charset=utf-8\r\n"
+        f"Path:{path}\r\n\r\n{body}"
+    )
+
+
+def make_stand_in(connect_delay, synth_delay, audio_bytes, ms_per_char=0):
+    """Bağlantı kurulumu ve sentez süresini simüle eden websocket sunucusu
+
+    ms_per_char > 0 ise ses metin uzunluğuyla orantılı süre boyunca parça parça akar
+    (gerçek servisteki gibi uzun metin = geç biten akış).
+    """
+
+    async def handler(request):
+        # Gerçek serviste TLS + websocket handshake maliyeti
+        await asyncio.sleep(connect_delay)
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+
+        async for msg in ws:
+            if msg.type != web.WSMsgType.TEXT or "Path:ssml" not in msg.data:
+                continue
+            request_id = uuid.uuid4().hex
+            await ws.send_str(text_frame(request_id, "turn.start"))
+            await asyncio.sleep(synth_delay)
+
+            size = audio_bytes
+            stream_time = 0
+            if ms_per_char:
+                match = re.search(r"<prosody[^>]*>(.*?)</prosody>", msg.data, re.S)
+                chars = len(match.group(1)) if match else len(msg.data)
+                size = max(audio_bytes // 8, chars * 200)
+                stream_time = chars * ms_per_char / 1000
+
+            # Sesi birkaç parça halinde gönder (gerçek servis gibi)
+            chunk = max(1, size // 4)
+            for offset in range(0, size, chunk):
+                if stream_time:
+                    await asyncio.sleep(stream_time / 4)
+                await ws.send_bytes(binary_frame(request_id, b"\xff" * min(chunk, size - offset)))
+            await ws.send_str(text_frame(request_id, "turn.end"))
+        return ws
+
+    app = web.Application()
+    app.router.add_get("/tts", handler)
+    return app
+
+
+# ------------------------------------------------------------------
+# Ölçümler
+# ------------------------------------------------------------------
+
+async def run_oneshot(runs, env, workdir):
+    timings = []
+    for i in range(runs):
+        output = os.path.join(workdir, f"oneshot_{i}.mp3")
+        start = time.perf_counter()
+        proc = await asyncio.create_subprocess_exec(
+            sys.executable, WRAPPER, "--voice", VOICE, "--text", SAMPLE_TEXT, "--write-media", output,
+            env=env, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE,
+        )
+        _, stderr = await proc.communicate()
+        if proc.returncode != 0:
+            raise RuntimeError(f"oneshot başarısız: {stderr.decode(errors='replace')}")
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+async def run_daemon(runs, env, workdir):
+    start = time.perf_counter()
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable, WRAPPER, "--daemon",
+        env=env, stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    ready = json.loads(await proc.stdout.readline())
+    if ready.get("event") != "ready":
+        raise RuntimeError(f"daemon hazır değil: {ready}")
+    startup_ms = (time.perf_counter() - start) * 1000
+
+    timings = []
+    try:
+        for i in range(runs):
+            request = {
+                "id": str(i),
+                "text": SAMPLE_TEXT,
+                "voice": VOICE,
+                "output": os.path.join(workdir, f"daemon_{i}.mp3"),
+            }
+            start = time.perf_counter()
+            proc.stdin.write((json.dumps(request, ensure_ascii=False) + "\n").encode())
+            await proc.stdin.drain()
+            reply = json.loads(await proc.stdout.readline())
+            if not reply.get("ok"):
+                raise RuntimeError(f"daemon isteği başarısız: {reply}")
+            timings.append((time.perf_counter() - start) * 1000)
+    finally:
+        proc.stdin.write(b'{"cmd": "shutdown"}\n')
+        await proc.stdin.drain()
+        await proc.wait()
+    return timings, startup_ms
+
+
+async def run_long(runs, env, parallel):
+    """Uzun metin: tek istek vs cümle modu - daemon akış modunda ilk ses ve toplam süre"""
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable, WRAPPER, "--daemon",
+        env=env, stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL, limit=16 * 1024 * 1024,
+    )
+    await proc.stdout.readline()  # ready
+
+    results = {"single": {"first": [], "total": []}, "sentences": {"first": [], "total": []}}
+    sentence_count = 1
+    try:
+        for i in range(runs):
+            for mode in ("single", "sentences"):
+                request = {"id": f"{mode}-{i}", "text": LONG_TEXT, "voice": VOICE, "stream": True,
+                           "sentences": mode == "sentences", "parallel": parallel}
+                start = time.perf_counter()
+                proc.stdin.write((json.dumps(request, ensure_ascii=False) + "\n").encode())
+                await proc.stdin.drain()
+                first = None
+                while True:
+                    reply = json.loads(await proc.stdout.readline())
+                    if reply.get("event") == "chunk":
+                        if first is None:
+                            first = (time.perf_counter() - start) * 1000
+                        continue
+                    if not reply.get("ok"):
+                        raise RuntimeError(f"daemon isteği başarısız: {reply}")
+                    break
+                results[mode]["first"].append(first)
+                results[mode]["total"].append((time.perf_counter() - start) * 1000)
+                if mode == "sentences":
+                    sentence_count = reply.get("sentences", 1)
+    finally:
+        proc.stdin.write(b'{"cmd": "shutdown"}\n')
+        await proc.stdin.drain()
+        await proc.wait()
+
+    return {
+        mode: {"first_audio": summarize(values["first"]), "total": summarize(values["total"])}
+        for mode, values in results.items()
+    }, sentence_count
+
+
+def summarize(timings):
+    ordered = sorted(timings)
+    return {
+        "runs": len(ordered),
+        "mean_ms": round(statistics.mean(ordered), 1),
+        "p50_ms": round(ordered[len(ordered) // 2], 1),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 1),
+        "min_ms": round(ordered[0], 1),
+        "max_ms": round(ordered[-1], 1),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="edge-tts oneshot vs daemon gecikme ölçümü")
+    parser.add_argument("--runs", type=int, default=10, help="Mod başına utterance sayısı")
+    parser.add_argument("--connect-delay-ms", type=int, default=100,
+                        help="Stand-in sunucuda bağlantı başına simüle edilen handshake süresi")
+    parser.add_argument("--synth-delay-ms", type=int, default=50,
+                        help="Stand-in sunucuda simüle edilen sentez süresi")
+    parser.add_argument("--audio-bytes", type=int, default=24000, help="Utterance başına ses boyutu")
+    parser.add_argument("--long", action="store_true",
+                        help="Uzun metinde tek istek vs cümle modu karşılaştırması")
+    parser.add_argument("--parallel", type=int, default=3, help="Cümle modunda eşzamanlı sentez")
+    parser.add_argument("--ms-per-char", type=float, default=8,
+                        help="--long: karakter başına simüle edilen sentez süresi")
+    parser.add_argument("--json", help="Sonuçları JSON dosyasına yaz")
+    args = parser.parse_args()
+
+    ms_per_char = args.ms_per_char if args.long else 0
+    app = make_stand_in(args.connect_delay_ms / 1000, args.synth_delay_ms / 1000, args.audio_bytes, ms_per_char)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+
+    env = dict(os.environ)
+    env["EDGE_TTS_WSS_URL"] = f"ws://127.0.0.1:{port}/tts?TrustedClientToken=benchmark"
+    env["EDGE_TTS_CACHE"] = "0"  # Her tur gerçek sentez olsun (önbellek ölçümü bozmasın)
+    print(f"🔧 Stand-in TTS: ws://127.0.0.1:{port}/tts "
+          f"(handshake {args.connect_delay_ms} ms, sentez {args.synth_delay_ms} ms)")
+
+    if args.long:
+        try:
+            results, sentence_count = await run_long(args.runs, env, args.parallel)
+        finally:
+            await runner.cleanup()
+        print(f"📝 Metin: {len(LONG_TEXT)} karakter, {sentence_count} cümle, paralel {args.parallel}")
+        print(f"\n{'Mod':<12}{'ilk ses p50':>14}{'ilk ses p95':>14}{'toplam p50':>14}{'toplam p95':>14}")
+        for mode, r in results.items():
+            print(f"{mode:<12}{r['first_audio']['p50_ms']:>14}{r['first_audio']['p95_ms']:>14}"
+                  f"{r['total']['p50_ms']:>14}{r['total']['p95_ms']:>14}")
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump({"long": results, "sentences": sentence_count, "config": vars(args)}, f, indent=2)
+        return
+
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            oneshot = summarize(await run_oneshot(args.runs, env, workdir))
+            daemon_timings, startup_ms = await run_daemon(args.runs, env, workdir)
+            daemon = summarize(daemon_timings)
+    finally:
+        await runner.cleanup()
+
+    print(f"\n{'Mod':<10}{'ort':>10}{'p50':>10}{'p95':>10}{'min':>10}{'max':>10}")
+    for name, s in (("oneshot", oneshot), ("daemon", daemon)):
+        print(f"{name:<10}{s['mean_ms']:>10}{s['p50_ms']:>10}{s['p95_ms']:>10}{s['min_ms']:>10}{s['max_ms']:>10}")
+    print(f"\n⏱️ Daemon başlangıcı (tek seferlik): {startup_ms:.0f} ms")
+    print(f"🚀 Utterance başına kazanç (ortalama): {oneshot['mean_ms'] - daemon['mean_ms']:.0f} ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"oneshot": oneshot, "daemon": daemon, "daemon_startup_ms": round(startup_ms, 1),
+                       "config": vars(args)}, f, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,7 +1,59 @@
 #!/usr/bin/env python
-"""edge-tts wrapper with SSL verification disabled"""
+"""edge-tts wrapper with SSL verification disabled
+
+Kullanım:
+    python edge-tts-nossl.py --voice tr-TR-EmelNeural --text "Merhaba" --write-media out.mp3
+    python edge-tts-nossl.py --voice tr-TR-EmelNeural --text "Merhaba" --stream [--stream-to PIPE_YOLU]
+    python edge-tts-nossl.py --daemon
+
+Daemon modu (stdin/stdout JSON satırları):
+    → {"id": "1", "text": "Merhaba", "voice": "tr-TR-EmelNeural", "output": "C:/.../out.mp3"}
+    ← {"id": "1", "ok": true, "output": "C:/.../out.mp3", "bytes": 12345, "elapsed_ms": 480}
+    → {"id": "2", "cmd": "ping"}     ← {"id": "2", "ok": true, "pong": true}
+    → {"id": "3", "cmd": "warmup", "voice": "tr-TR-EmelNeural"}   (boşta sık cümleleri önceden sentezle)
+    → {"id": "4", "text": "...", "stream": true}
+    ← {"id": "4", "event": "chunk", "seq": 0, "data": "<base64 mp3>"}   (geldikçe, sırayla)
+    ← {"id": "4", "ok": true, "stream": true, "bytes": ..., "first_chunk_ms": ..., "elapsed_ms": ...}
+    → {"id": "5", "text": "<uzun yanıt>", "stream": true, "sentences": true, "parallel": 3}
+    → {"cmd": "shutdown"}
+Başlangıçta tek satır {"event": "ready"} yazılır. Loglar stderr'e gider.
+
+Akış modu (--stream):
+    MP3 parçaları sentez akışından geldikçe stdout'a (veya --stream-to ile verilen pipe/dosyaya)
+    çerçeveli yazılır: 4 byte big-endian uzunluk + veri. Uzunluğu 0 olan çerçeve akış sonudur;
+    sonu gelmeden kapanan akış hatalıdır (detay stderr'de). Oynatma ilk parçayla başlayabilir.
+
+Cümle modu (--sentences / "sentences": true):
+    Uzun metin Türkçe noktalama kurallarıyla cümlelere bölünür (kısaltmalar, sıra sayıları,
+    ondalık sayılar bölünmez). Cümleler en fazla --parallel kadar eşzamanlı sentezlenir ve ses
+    orijinal sırayla, sıradaki cümle hazır olur olmaz yayınlanır. MP3 çerçeveleri art arda
+    eklenebildiği için çıktı tek bir geçerli MP3 akışıdır. İlk ses süresi metin uzunluğundan
+    bağımsız hale gelir.
+
+Ses önbelleği:
+    (voice, rate, pitch, volume, text) hash'i ile %LOCALAPPDATA%/QuadroAIPilot/TTSCache altında
+    saklanır. Aynı cümle tekrar istendiğinde sentez yapılmaz, dosya kopyalanır (yanıtta "cached": true).
+    Boyut sınırı aşılınca en uzun süredir kullanılmayan dosyalar silinir (LRU, mtime ile).
+
+Ortam değişkenleri:
+    EDGE_TTS_WSS_URL   - TTS websocket adresini değiştir (yerel test sunucusu / benchmark için)
+    EDGE_TTS_CACHE     - "0" ise önbellek kapalı
+    EDGE_TTS_CACHE_DIR - önbellek klasörü
+    EDGE_TTS_CACHE_MB  - önbellek boyut sınırı (varsayılan 200 MB)
+"""
 import sys
+import os
 import ssl
+import json
+import time
+import uuid
+import base64
+import struct
+import re
+import shutil
+import asyncio
+import hashlib
+import argparse
 import aiohttp
 
 # Global SSL context'i patch et
@@ -25,7 +77,635 @@ def patched_init(self, *args, **kwargs):
 
 aiohttp.TCPConnector.__init__ = patched_init
 
-# edge-tts modülünü import et ve çalıştır
-if __name__ == "__main__":
+# Daemon modunda tüm istekler tek connector'ı paylaşır (DNS cache, SSL context)
+# edge-tts her istekte kendi ClientSession'ını açıp kapatıyor; paylaşılan connector'ın
+# session kapanırken kapatılmaması için sahipliği session'a verilmez.
+shared_connector = None
+# edge-tts < 7 Communicate(connector=...) kabul etmez; ilk TypeError'da paylaşım kapatılır
+connector_supported = True
+original_session_init = aiohttp.ClientSession.__init__
+
+def patched_session_init(self, *args, **kwargs):
+    if shared_connector is not None and kwargs.get('connector') is shared_connector:
+        kwargs['connector_owner'] = False
+    original_session_init(self, *args, **kwargs)
+
+aiohttp.ClientSession.__init__ = patched_session_init
+
+DEFAULT_VOICE = "tr-TR-EmelNeural"
+
+# Önbellekten akış yaparken parça boyutu (sentez akışındaki parçalara yakın)
+STREAM_CHUNK_BYTES = 8192
+
+# Cümle modunda eşzamanlı sentez sayısı (daemon connector limiti 8)
+DEFAULT_PARALLEL = 3
+
+# Bu uzunluktan kısa parçalar öncekine eklenir (her istek bir websocket bağlantısı)
+MIN_SENTENCE_CHARS = 12
+
+# Noktadan sonra cümle bitirmeyen Türkçe kısaltmalar (küçük harfle)
+TURKISH_ABBREVIATIONS = {
+    "dr", "prof", "doç", "yrd", "öğr", "gör", "arş", "av", "müh", "uzm", "sn", "bay", "bayan",
+    "alb", "gen", "yzb", "bkz", "vb", "vs", "örn", "yy", "no", "tel", "cad", "sok", "mah",
+    "apt", "blv", "şti", "ltd", "a.ş", "st", "bşk", "md", "mr", "mrs", "ms", "etc", "ör",
+}
+
+SENTENCE_END = re.compile(r'([.!?…]+["\'”’)\]]*)(\s+)')
+TURKISH_UPPER = "ABCÇDEFGĞHIİJKLMNOÖPRSŞTUÜVYZQWX"
+
+# Boşta önceden sentezlenen sık cümleler (uygulamanın sabit geri bildirimleri)
+WARMUP_PHRASES = [
+    "Tamam",
+    "Komut moduna geçildi",
+    "Yazı moduna geçildi",
+    "Yapay zeka moduna geçildi",
+    "Sorunuz sıraya alındı.",
+    "Sohbet geçmişi temizlendi.",
+    "E posta bulunamadı.",
+    "E-posta açılırken hata oluştu.",
+    "Web sitesi açılırken bir hata oluştu",
+    "Takvim özeti hazırlanıyor...",
+    "Yarınki toplantılar kontrol ediliyor...",
+    "Outlook hesapları kontrol ediliyor...",
+    "Quadro Asistan alternatif sisteme geçiyor.",
+]
+
+
+def log(message):
+    """Daemon logları stderr'e (stdout protokol için ayrılmış)"""
+    print(message, file=sys.stderr, flush=True)
+
+
+def apply_wss_override():
+    """EDGE_TTS_WSS_URL verilmişse edge-tts'in bağlandığı adresi değiştir"""
+    url = os.environ.get("EDGE_TTS_WSS_URL")
+    if not url:
+        return
+    import edge_tts.communicate
+    edge_tts.communicate.WSS_URL = url
+    log(f"[edge-tts] WSS URL override: {url}")
+
+
+class AudioCache:
+    """İçerik adresli ses önbelleği - anahtar (voice, rate, pitch, volume, text) hash'i"""
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        # Yarım kalmış yazımları temizle, mevcut boyutu hesapla
+        self.total = 0
+        for entry in os.scandir(directory):
+            if entry.name.endswith(".tmp"):
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+            elif entry.name.endswith(".mp3"):
+                self.total += entry.stat().st_size
+
+    @staticmethod
+    def key(voice, rate, pitch, volume, text):
+        payload = json.dumps([voice, rate, pitch, volume, text], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + ".mp3")
+
+    def contains(self, key):
+        return os.path.exists(self.path(key))
+
+    def fetch(self, key, output):
+        """Önbellekte varsa output'a kopyala ve boyutu döndür, yoksa None"""
+        path = self.path(key)
+        try:
+            os.utime(path)  # LRU: son kullanım zamanı
+            shutil.copyfile(path, output)
+            return os.path.getsize(output)
+        except OSError:
+            return None
+
+    def read(self, key):
+        """Önbellekte varsa ses verisini döndür, yoksa None"""
+        path = self.path(key)
+        try:
+            os.utime(path)
+            with open(path, "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def spool_path(self, key):
+        """Önbellek klasöründe geçici dosya yolu (aynı diskte → os.replace atomik)"""
+        return os.path.join(self.directory, f"{key}.{uuid.uuid4().hex}.tmp")
+
+    def store(self, key, source):
+        """Sentezlenen dosyayı atomik olarak önbelleğe ekle"""
+        tmp_path = self.spool_path(key)
+        try:
+            shutil.copyfile(source, tmp_path)
+        except OSError as e:
+            log(f"[edge-tts] Önbelleğe yazılamadı: {e}")
+            self.discard(tmp_path)
+            return
+        self.adopt(key, tmp_path)
+
+    def adopt(self, key, tmp_path):
+        """Önbellek klasöründeki tamamlanmış geçici dosyayı yerine taşı"""
+        path = self.path(key)
+        try:
+            existed = os.path.exists(path)
+            os.replace(tmp_path, path)
+            if not existed:
+                self.total += os.path.getsize(path)
+        except OSError as e:
+            log(f"[edge-tts] Önbelleğe yazılamadı: {e}")
+            self.discard(tmp_path)
+            return
+        if self.total > self.max_bytes:
+            self.evict()
+
+    @staticmethod
+    def discard(tmp_path):
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+    def evict(self):
+        """Boyut sınırının %90'ına inene kadar en eski kullanılanları sil"""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".mp3"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        entries.sort()
+        self.total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        for _, size, path in entries:
+            if self.total <= target:
+                break
+            try:
+                os.remove(path)
+                self.total -= size
+            except OSError:
+                pass
+
+
+def open_cache():
+    """Ortam değişkenlerine göre önbelleği aç (kapalıysa None)"""
+    if os.environ.get("EDGE_TTS_CACHE", "1") == "0":
+        return None
+    base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+    directory = os.environ.get("EDGE_TTS_CACHE_DIR") or os.path.join(base, "QuadroAIPilot", "TTSCache")
+    max_mb = int(os.environ.get("EDGE_TTS_CACHE_MB", "200"))
+    try:
+        return AudioCache(directory, max_mb * 1024 * 1024)
+    except OSError as e:
+        log(f"[edge-tts] Önbellek açılamadı: {e}")
+        return None
+
+
+cache = None
+
+
+def request_key(request):
+    return AudioCache.key(
+        request.get("voice", DEFAULT_VOICE),
+        request.get("rate", "+0%"),
+        request.get("pitch", "+0Hz"),
+        request.get("volume", "+0%"),
+        request.get("text", ""),
+    )
+
+
+async def audio_chunks(request, info):
+    """MP3 parçalarını sentez akışından geldikçe üret
+
+    Önbellekte varsa dosyadan parça parça okunur (info["cached"] = True). Yoksa akış
+    önbellek klasörüne de yazılır ve tamamlanınca önbelleğe eklenir.
+    """
+    import edge_tts
+
+    text = request.get("text", "")
+    if not text:
+        raise ValueError("text zorunlu")
+
+    info["cached"] = False
+    key = request_key(request) if cache else None
+    if key:
+        data = cache.read(key)
+        if data is not None:
+            info["cached"] = True
+            for offset in range(0, len(data), STREAM_CHUNK_BYTES):
+                yield data[offset:offset + STREAM_CHUNK_BYTES]
+            return
+
+    global connector_supported
+    options = {
+        "rate": request.get("rate", "+0%"),
+        "volume": request.get("volume", "+0%"),
+        "pitch": request.get("pitch", "+0Hz"),
+    }
+    if shared_connector is not None and connector_supported:
+        options["connector"] = shared_connector
+    try:
+        communicate = edge_tts.Communicate(text, request.get("voice", DEFAULT_VOICE), **options)
+    except TypeError:
+        if "connector" not in options:
+            raise
+        # Eski edge-tts: paylaşılan connector olmadan devam (her istek kendi bağlantısını açar)
+        connector_supported = False
+        log("[edge-tts] Bu edge-tts sürümü connector desteklemiyor (>= 7 gerekli), paylaşılan bağlantı kapalı")
+        del options["connector"]
+        communicate = edge_tts.Communicate(text, request.get("voice", DEFAULT_VOICE), **options)
+
+    spool_path = cache.spool_path(key) if key else None
+    spool = open(spool_path, "wb") if spool_path else None
+    try:
+        async for chunk in communicate.stream():
+            if chunk["type"] == "audio":
+                if spool:
+                    spool.write(chunk["data"])
+                yield chunk["data"]
+        if spool:
+            spool.close()
+            cache.adopt(key, spool_path)
+            spool = None
+    finally:
+        # Hata / yarıda kesilen akış önbelleğe girmez
+        if spool:
+            spool.close()
+            cache.discard(spool_path)
+
+
+async def synthesize(request):
+    """Tek bir isteği sentezle ve output dosyasına yaz - (boyut, önbellekten mi) döndürür"""
+    output = request.get("output")
+    if not output:
+        raise ValueError("text ve output zorunlu")
+
+    info = {}
+    size = 0
+    tmp_path = output + ".part"
+    try:
+        with open(tmp_path, "wb") as f:
+            async for data in chunk_source(request, info):
+                f.write(data)
+                size += len(data)
+        os.replace(tmp_path, output)
+    except BaseException:
+        # Yarım kalan .part dosyasını bırakma (iptal dahil)
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    return size, info["cached"]
+
+
+def split_sentences(text):
+    """Metni Türkçe kurallarıyla cümlelere böl
+
+    - Satır sonları (liste maddeleri, paragraflar) her zaman böler
+    - . ! ? … ardından boşluk ve büyük harf / rakam / tırnak gelirse böler
+    - Kısaltmalar (Dr., vb., örn.) ve sıra sayıları (3. madde, 15. yüzyıl) bölmez
+    - Ondalık sayı ve tarihler (3.5, 19.10.2026) boşluk içermediği için zaten bölünmez
+    """
+    sentences = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        start = 0
+        for match in SENTENCE_END.finditer(line):
+            end = match.end(1)
+            following = line[match.end():match.end() + 1]
+            if not following or not (following in TURKISH_UPPER or following.isdigit() or following in "\"'“‘(-"):
+                continue
+            if match.group(1) == ".":
+                word = line[start:match.start(1)].rsplit(None, 1)[-1] if line[start:match.start(1)].strip() else ""
+                word = word.lstrip("(\"'“‘").lower()
+                if word in TURKISH_ABBREVIATIONS or (word.isdigit() and len(word) <= 3) or len(word) == 1:
+                    continue
+            sentences.append(line[start:end].strip())
+            start = match.end()
+        if line[start:].strip():
+            sentences.append(line[start:].strip())
+
+    # Çok kısa parçaları öncekine ekle
+    merged = []
+    for sentence in sentences:
+        if merged and len(sentence) < MIN_SENTENCE_CHARS:
+            merged[-1] = f"{merged[-1]} {sentence}"
+        else:
+            merged.append(sentence)
+    if len(merged) > 1 and len(merged[0]) < MIN_SENTENCE_CHARS:
+        merged[1] = f"{merged[0]} {merged[1]}"
+        merged.pop(0)
+    return merged
+
+
+async def sentence_chunks(request, info, parallel):
+    """Cümleleri eşzamanlı sentezle, parçaları orijinal sırayla üret
+
+    Her cümlenin parçaları kendi kuyruğuna akar; sıradaki cümlenin kuyruğu canlı okunur,
+    böylece ilk cümlenin ilk parçası diğerlerini beklemeden yayınlanır.
+    """
+    sentences = split_sentences(request.get("text", ""))
+    info["sentences"] = len(sentences)
+    if len(sentences) <= 1:
+        async for data in audio_chunks(request, info):
+            yield data
+        return
+
+    semaphore = asyncio.Semaphore(max(1, parallel))
+    queues = [asyncio.Queue() for _ in sentences]
+    cached = []
+
+    async def worker(index, sentence):
+        # Semaphore bekleyenleri sırayla alır → öndeki cümleler önce başlar
+        async with semaphore:
+            sub_info = {}
+            try:
+                async for data in audio_chunks(dict(request, text=sentence), sub_info):
+                    queues[index].put_nowait(data)
+                cached.append(sub_info.get("cached", False))
+                queues[index].put_nowait(None)
+            except Exception as e:
+                queues[index].put_nowait(e)
+
+    tasks = [asyncio.ensure_future(worker(i, sentence)) for i, sentence in enumerate(sentences)]
+    try:
+        for queue in queues:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        info["cached"] = all(cached)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def chunk_source(request, info):
+    """İsteğe göre tek istek veya cümle modu parça üreticisi"""
+    if request.get("sentences"):
+        return sentence_chunks(request, info, int(request.get("parallel", DEFAULT_PARALLEL)))
+    return audio_chunks(request, info)
+
+
+def write_frame(stream, data):
+    """Akış çerçevesi: 4 byte big-endian uzunluk + veri (boş veri = akış sonu)"""
+    stream.write(struct.pack(">I", len(data)))
+    if data:
+        stream.write(data)
+    stream.flush()
+
+
+class Daemon:
+    """stdin'den JSON satırı okur, her isteği ayrı task olarak işler"""
+
+    def __init__(self):
+        self.write_lock = asyncio.Lock()
+        self.tasks = set()
+        self.warmup_task = None
+
+    async def reply(self, payload):
+        line = json.dumps(payload, ensure_ascii=False) + "\n"
+        async with self.write_lock:
+            sys.stdout.write(line)
+            sys.stdout.flush()
+
+    async def handle(self, request):
+        request_id = request.get("id")
+        start = time.perf_counter()
+        try:
+            if request.get("cmd") == "ping":
+                await self.reply({"id": request_id, "ok": True, "pong": True})
+                return
+            if request.get("cmd") == "warmup":
+                self.start_warmup(request.get("voice", DEFAULT_VOICE), request.get("phrases") or WARMUP_PHRASES)
+                await self.reply({"id": request_id, "ok": True, "warmup": cache is not None})
+                return
+            if request.get("stream"):
+                await self.stream(request, start)
+                return
+            size, cached = await synthesize(request)
+            await self.reply({
+                "id": request_id,
+                "ok": True,
+                "output": request["output"],
+                "bytes": size,
+                "cached": cached,
+                "elapsed_ms": int((time.perf_counter() - start) * 1000),
+            })
+        except Exception as e:
+            log(f"[edge-tts] İstek {request_id} hatası: {e}")
+            await self.reply({"id": request_id, "ok": False, "error": str(e)})
+
+    async def stream(self, request, start):
+        """Parçaları geldikçe "chunk" olayı olarak gönder, sonda normal yanıt"""
+        request_id = request.get("id")
+        info = {}
+        size = 0
+        seq = 0
+        first_chunk_ms = None
+        async for data in chunk_source(request, info):
+            if first_chunk_ms is None:
+                first_chunk_ms = int((time.perf_counter() - start) * 1000)
+            await self.reply({
+                "id": request_id,
+                "event": "chunk",
+                "seq": seq,
+                "data": base64.b64encode(data).decode("ascii"),
+            })
+            size += len(data)
+            seq += 1
+        await self.reply({
+            "id": request_id,
+            "ok": True,
+            "stream": True,
+            "bytes": size,
+            "chunks": seq,
+            "cached": info["cached"],
+            "sentences": info.get("sentences", 1),
+            "first_chunk_ms": first_chunk_ms,
+            "elapsed_ms": int((time.perf_counter() - start) * 1000),
+        })
+
+    def start_warmup(self, voice, phrases):
+        if cache is None or (self.warmup_task and not self.warmup_task.done()):
+            return
+        self.warmup_task = asyncio.ensure_future(self.warmup(voice, list(phrases)))
+
+    async def warmup(self, voice, phrases):
+        """Önbellekte olmayan cümleleri boşta, tek tek sentezle"""
+        warmed = 0
+        for text in phrases:
+            request = {"text": text, "voice": voice}
+            key = request_key(request)
+            if cache.contains(key):
+                continue
+            # Gerçek istek varken bekle - ısınma hiçbir zaman kullanıcıyı geciktirmesin
+            while self.tasks:
+                await asyncio.sleep(0.5)
+            request["output"] = os.path.join(cache.directory, f"warmup.{uuid.uuid4().hex}.tmp")
+            try:
+                await synthesize(request)
+                warmed += 1
+            except Exception as e:
+                log(f"[edge-tts] Isınma hatası ({text}): {e}")
+                break
+            finally:
+                try:
+                    os.remove(request["output"])
+                except OSError:
+                    pass
+        log(f"[edge-tts] Önbellek ısınması bitti: {warmed} yeni cümle")
+
+    async def run(self):
+        global shared_connector
+        shared_connector = aiohttp.TCPConnector(limit=8, ttl_dns_cache=600)
+
+        loop = asyncio.get_running_loop()
+        await self.reply({"event": "ready", "pid": os.getpid()})
+        log("[edge-tts] Daemon hazır")
+
+        try:
+            while True:
+                # stdin bloklayan okuma - executor'da
+                line = await loop.run_in_executor(None, sys.stdin.readline)
+                if not line:
+                    break  # stdin kapandı (parent process çıktı)
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    request = json.loads(line)
+                except json.JSONDecodeError as e:
+                    await self.reply({"id": None, "ok": False, "error": f"Geçersiz JSON: {e}"})
+                    continue
+                if request.get("cmd") == "shutdown":
+                    break
+                task = asyncio.ensure_future(self.handle(request))
+                self.tasks.add(task)
+                task.add_done_callback(self.tasks.discard)
+        finally:
+            if self.warmup_task:
+                self.warmup_task.cancel()
+            if self.tasks:
+                await asyncio.gather(*self.tasks, return_exceptions=True)
+            await shared_connector.close()
+            log("[edge-tts] Daemon kapandı")
+
+
+def run_daemon():
+    global cache
+    # Windows'ta stdin/stdout UTF-8 olmalı (Türkçe metin)
+    for stream in (sys.stdin, sys.stdout):
+        if hasattr(stream, "reconfigure"):
+            stream.reconfigure(encoding="utf-8")
+    apply_wss_override()
+    cache = open_cache()
+    asyncio.run(Daemon().run())
+
+
+async def stream_to(target, request):
+    """Tek seferlik akış: çerçeveleri hedefe yaz, sonda boş çerçeve"""
+    info = {}
+    start = time.perf_counter()
+    first_chunk_ms = None
+    async for data in chunk_source(request, info):
+        if first_chunk_ms is None:
+            first_chunk_ms = int((time.perf_counter() - start) * 1000)
+        write_frame(target, data)
+    write_frame(target, b"")
+    sentences = f", {info['sentences']} cümle" if "sentences" in info else ""
+    log(f"[edge-tts] İlk ses: {first_chunk_ms} ms, toplam: {int((time.perf_counter() - start) * 1000)} ms{sentences}")
+
+
+def run_stream():
+    """--stream: MP3 parçalarını geldikçe stdout'a / pipe'a yaz"""
+    global cache
+    apply_wss_override()
+
+    parser = argparse.ArgumentParser(description="edge-tts akış modu")
+    parser.add_argument("--stream", action="store_true")
+    parser.add_argument("-t", "--text", required=True)
+    parser.add_argument("-v", "--voice", default=DEFAULT_VOICE)
+    parser.add_argument("--rate", default="+0%")
+    parser.add_argument("--pitch", default="+0Hz")
+    parser.add_argument("--volume", default="+0%")
+    parser.add_argument("--stream-to", help="Çıktı pipe'ı veya dosyası (varsayılan stdout)")
+    parser.add_argument("--sentences", action="store_true", help="Cümlelere böl, paralel sentezle")
+    parser.add_argument("--parallel", type=int, default=DEFAULT_PARALLEL, help="Eşzamanlı cümle sayısı")
+    args = parser.parse_args()
+
+    cache = open_cache()
+    request = {
+        "text": args.text,
+        "voice": args.voice,
+        "rate": args.rate,
+        "pitch": args.pitch,
+        "volume": args.volume,
+        "sentences": args.sentences,
+        "parallel": args.parallel,
+    }
+    try:
+        if args.stream_to:
+            with open(args.stream_to, "wb") as target:
+                asyncio.run(stream_to(target, request))
+        else:
+            asyncio.run(stream_to(sys.stdout.buffer, request))
+    except Exception as e:
+        log(f"[edge-tts] Akış hatası: {e}")
+        sys.exit(1)
+
+
+def run_oneshot():
+    """edge-tts CLI - önbellekte varsa sentez yapmadan dosyayı yaz"""
+    global cache
+    apply_wss_override()
     from edge_tts.util import main
+
+    parser = argparse.ArgumentParser(add_help=False)
+    for option in ("--text", "--voice", "--rate", "--pitch", "--volume", "--write-media"):
+        parser.add_argument(option)
+    try:
+        args, _ = parser.parse_known_args()
+    except SystemExit:
+        args = None  # Ayrıştırılamayan argümanlar - doğrudan edge-tts'e bırak
+
+    # Sadece açık sesli, düz metin → dosya çağrılarını önbelleğe al (altyazı, stdout vb. edge-tts'e kalır)
+    cacheable = args and args.text and args.voice and args.write_media and "--write-subtitles" not in sys.argv
+    cache = open_cache() if cacheable else None
+    if cache is None:
+        main()
+        return
+
+    key = request_key({
+        "text": args.text,
+        "voice": args.voice,
+        "rate": args.rate or "+0%",
+        "pitch": args.pitch or "+0Hz",
+        "volume": args.volume or "+0%",
+    })
+    if cache.fetch(key, args.write_media) is not None:
+        return
     main()
+    if os.path.exists(args.write_media):
+        cache.store(key, args.write_media)
+
+
+# edge-tts modülünü import et ve çalıştır
+if __name__ == "__main__":
+    if "--daemon" in sys.argv[1:]:
+        run_daemon()
+    elif "--stream" in sys.argv[1:]:
+        run_stream()
+    else:
+        run_oneshot()
@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Bridge log analizörü - unified_ai_bridge.log / gemini_bridge.log / chatgpt_bridge.log
+
+"Mesaj gönderiliyor" satırlarını "Yanıt ... N karakter" satırlarıyla eşleştirip istek başına
+gecikme ve yanıt uzunluğu çıkarır; gün veya saat bazında yüzdelikler ve hata sınıfları raporlar.
+
+- Log dosyaları mmap ile taranır (çok GB'lık dosyalar belleğe okunmaz)
+- Dosya başına kalıcı indeks tutulur: işlenen son byte offset'i, dosya kimliği, yanıtı beklenen
+  istekler, hata sayaçları ve saat / provider başına kovalar (istek sayıları, gecikme ve yanıt
+  uzunluğu histogramları). Tek tek istek kaydı tutulmaz; indeks boyutu istek sayısıyla değil
+  kapsanan saat sayısıyla büyür. Sonraki çalıştırmalar sadece yeni byte'ları okur; dosya
+  döndürülmüş veya kesilmişse indeks baştan oluşturulur.
+- Log satırlarında tarih yok ([HH:MM:SS]); saat geriye gittiğinde gün değişmiş sayılır ve
+  tarih dosyanın son değişiklik zamanından geriye doğru hesaplanır. Hiç satır yazılmayan 24 saati
+  aşan boşluklar satırlardan anlaşılamaz; bir sonraki taramada mtime farkıyla yeni kayıtlara yansıtılır.
+
+Kullanım:
+    python analyze_bridge_logs.py                          # %LOCALAPPDATA%/QuadroAIPilot/Logs/*.log
+    python analyze_bridge_logs.py unified_ai_bridge.log --by hour --since 2026-10-01
+    python analyze_bridge_logs.py --provider Gemini --json rapor.json
+    python analyze_bridge_logs.py --rebuild                # İndeksi sıfırdan oluştur
+"""
+
+import argparse
+import datetime
+import glob
+import hashlib
+import json
+import math
+import mmap
+import os
+import re
+import sys
+import time
+
+INDEX_VERSION = 3
+# Dosya kimliği için hash'lenen baş kısmın üst sınırı
+HEAD_BYTES = 4096
+
+# Sadece ilgilenilen satırlar: uyarı/hata ve mesaj gönderme/yanıt satırları
+# (INFO satırlarının çoğu atlanır; regex C tarafında ilerler)
+LINE_RE = re.compile(
+    rb'^\[(\d\d):(\d\d):(\d\d)\] \[(?:(WARNING|ERROR|CRITICAL)|INFO(?=\] [^\n]*(?:Mesaj g|[Yy]an\xc4\xb1t)))\] ([^\r\n]*)',
+    re.M
+)
+
+SEND_RE = re.compile(r'Mesaj gönderiliyor|Mesaj göndermeden ÖNCE')
+RESPONSE_RE = re.compile(r'[Yy]anıt(?: alındı)?: (\d+) karakter')
+PROVIDER_RE = re.compile(r'\[(ChatGPT|Gemini)\]')
+# Bu hatalar isteği sonlandırır (diğer ERROR satırları sadece işaretler - ardından fallback gelebilir)
+TERMINAL_ERROR_RE = re.compile(r'Mesaj (?:gönderme )?hatası|Request hatası|Page kapalı')
+
+# Gün değişimi: saat bu kadardan fazla geriye giderse yeni gün
+ROLLOVER_THRESHOLD_S = 3600
+
+DAY_S = 86400
+
+
+def default_log_files():
+    base = os.getenv('LOCALAPPDATA')
+    if not base:
+        return []
+    return sorted(glob.glob(os.path.join(base, 'QuadroAIPilot', 'Logs', '*bridge*.log')))
+
+
+def default_index_dir():
+    base = os.getenv('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'QuadroAIPilot', 'Logs', '.log_index')
+
+
+def default_provider(path):
+    """Tek provider'lı log dosyaları için provider adı"""
+    name = os.path.basename(path).lower()
+    if 'gemini' in name:
+        return 'Gemini'
+    if 'chatgpt' in name:
+        return 'ChatGPT'
+    return None
+
+
+def classify_error(message):
+    """Hata mesajını sınıfa indirger: emoji, sayı ve tırnaklı değerler atılır"""
+    text = re.sub(r'^[^\w\[]+', '', message)
+    text = re.sub(r'(["\']).*?\1', '…', text)
+    text = re.sub(r'0x[0-9a-fA-F]+|\d+', '#', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text[:120]
+
+
+def head_hash(mm, length):
+    """Dosya kimliği - baştaki length byte (en fazla 4 KB) değişirse dosya döndürülmüş/yeniden yazılmış demektir"""
+    return hashlib.sha1(mm[:length]).hexdigest()
+
+
+def new_state(path):
+    return {
+        'version': INDEX_VERSION,
+        'path': os.path.abspath(path),
+        'head': None,
+        # head'in hash'lendiği byte sayısı (küçük dosyada dosya boyu - eklemeler aynı önekle karşılaştırılır)
+        'head_len': 0,
+        'offset': 0,
+        'day': 0,
+        'last_secs': None,
+        'anchor': None,
+        'pending': {},
+        # "saat_no|provider" → kova (saat_no = zaman // 3600, günün çapasına göre)
+        'buckets': {},
+        'errors': {},
+    }
+
+
+def new_bucket():
+    return {'requests': 0, 'ok': 0, 'error': 0, 'abandoned': 0, 'latency': {}, 'chars': {}}
+
+
+def round_chars(chars):
+    """Yanıt uzunluğunu 2 anlamlı basamağa indir (histogram küçük kalır)"""
+    if chars < 100:
+        return chars
+    scale = 10 ** (len(str(chars)) - 2)
+    return chars // scale * scale
+
+
+def add_request(buckets, sent, provider, latency, chars, status):
+    """İsteği saatlik kovasına say (gecikme 1 sn çözünürlüklü, histogramda birebir)"""
+    key = f"{sent // 3600}|{provider}"
+    bucket = buckets.get(key)
+    if bucket is None:
+        bucket = buckets[key] = new_bucket()
+    bucket['requests'] += 1
+    bucket[status] += 1
+    if status == 'ok':
+        for hist, value in ((bucket['latency'], latency), (bucket['chars'], round_chars(chars))):
+            hist[str(value)] = hist.get(str(value), 0) + 1
+
+
+def merge_buckets(target, source, hour_shift=0):
+    """source kovalarını target'a ekle (hour_shift: saat numarası kaydırma)"""
+    for key, bucket in source.items():
+        hour, provider = key.split('|', 1)
+        key = f"{int(hour) + hour_shift}|{provider}"
+        merged = target.get(key)
+        if merged is None:
+            merged = target[key] = new_bucket()
+        for field in ('requests', 'ok', 'error', 'abandoned'):
+            merged[field] += bucket[field]
+        for field in ('latency', 'chars'):
+            hist = merged[field]
+            for value, count in bucket[field].items():
+                hist[value] = hist.get(value, 0) + count
+
+
+def index_path_for(index_dir, path):
+    key = hashlib.sha1(os.path.abspath(path).lower().encode('utf-8')).hexdigest()[:12]
+    return os.path.join(index_dir, f"{os.path.basename(path)}.{key}.json")
+
+
+def load_state(index_file, path):
+    try:
+        with open(index_file, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('version') == INDEX_VERSION:
+            return state
+    except (OSError, ValueError):
+        pass
+    return new_state(path)
+
+
+def save_state(index_file, state):
+    os.makedirs(os.path.dirname(index_file), exist_ok=True)
+    tmp = index_file + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp, index_file)
+
+
+def scan(path, state):
+    """Dosyayı kaldığı offset'ten tara, state'i güncelle - işlenen byte sayısını döndürür"""
+    size = os.path.getsize(path)
+    if size == 0:
+        return 0
+
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        head_len = state['head_len']
+        if state['head'] is None or head_len > size or state['offset'] > size \
+                or head_hash(mm, head_len) != state['head']:
+            # Dosya değişmiş (döndürülmüş / kesilmiş) - baştan
+            state.clear()
+            state.update(new_state(path))
+        if state['head_len'] < min(size, HEAD_BYTES):
+            # 4 KB'tan küçükken eklenen satırlar öneki uzatır, aynı dosya - kimliği genişlet
+            state['head_len'] = min(size, HEAD_BYTES)
+            state['head'] = head_hash(mm, state['head_len'])
+
+        start = state['offset']
+        # Yarım yazılmış son satırı bir sonraki çalıştırmaya bırak
+        end = mm.rfind(b'\n', start) + 1
+        if end <= start:
+            return 0
+
+        fallback_provider = default_provider(path)
+        pending = state['pending']
+        # Bu taramanın kovaları ayrı tutulur: gün boşluğu bulunursa sadece bunlar kaydırılır
+        new_buckets = {}
+        errors = state['errors']
+        day = state['day']
+        last_secs = state['last_secs']
+        segment_start = day * DAY_S + (last_secs or 0)
+
+        for match in LINE_RE.finditer(mm, start, end):
+            secs = int(match.group(1)) * 3600 + int(match.group(2)) * 60 + int(match.group(3))
+            if last_secs is not None and secs < last_secs - ROLLOVER_THRESHOLD_S:
+                day += 1
+            last_secs = secs
+
+            level = match.group(4) and match.group(4).decode('ascii')
+            message = match.group(5).decode('utf-8', errors='replace')
+            tag = PROVIDER_RE.search(message)
+            provider = tag.group(1) if tag else fallback_provider or 'unknown'
+            now = day * DAY_S + secs
+
+            if level:
+                cls = classify_error(message)
+                entry = errors.get(cls)
+                if entry is None:
+                    errors[cls] = [1, level, now, now]
+                else:
+                    entry[0] += 1
+                    entry[3] = now
+                if level != 'WARNING' and provider in pending:
+                    if TERMINAL_ERROR_RE.search(message):
+                        sent = pending.pop(provider)
+                        add_request(new_buckets, sent[0], provider, now - sent[0], None, 'error')
+                    else:
+                        pending[provider][1] = True
+                continue
+
+            if SEND_RE.search(message):
+                previous = pending.get(provider)
+                if previous:
+                    # Yanıtsız kalan önceki istek
+                    add_request(new_buckets, previous[0], provider, now - previous[0], None,
+                                'error' if previous[1] else 'abandoned')
+                pending[provider] = [now, False]
+                continue
+
+            response = RESPONSE_RE.search(message)
+            if response and provider in pending:
+                sent = pending.pop(provider)
+                add_request(new_buckets, sent[0], provider, now - sent[0], int(response.group(1)), 'ok')
+
+        state['offset'] = end
+        state['day'] = day
+        state['last_secs'] = last_secs
+
+        # Tarih çapası: son satırın günü = dosyanın son değişiklik günü
+        # (son satır saati mtime saatinden sonraysa son satır bir önceki güne aittir)
+        mtime = datetime.datetime.fromtimestamp(os.path.getmtime(path))
+        last_day = mtime.date()
+        if last_secs is not None and last_secs > mtime.hour * 3600 + mtime.minute * 60 + mtime.second + 60:
+            last_day -= datetime.timedelta(days=1)
+        anchor = last_day - datetime.timedelta(days=day)
+        delta = 0
+        if state['anchor'] is None:
+            state['anchor'] = anchor.isoformat()
+        else:
+            gap = (anchor - datetime.date.fromisoformat(state['anchor'])).days
+            if gap > 0:
+                delta = gap * DAY_S
+                shift_segment(state, delta, segment_start)
+        merge_buckets(state['buckets'], new_buckets, delta // 3600)
+
+        return end - start
+
+
+def shift_segment(state, delta, segment_start):
+    """
+    Satırlardan görülemeyen gün boşluğunu bu taramada görülen zamanlara uygula
+    (boşluğun önceki çalıştırmanın son satırı ile yeni satırlar arasında olduğu varsayılır;
+    bu taramanın kovaları birleştirilirken ayrıca kaydırılır)
+    """
+    state['day'] += delta // DAY_S
+    for entry in state['errors'].values():
+        if entry[2] > segment_start:
+            entry[2] += delta
+        if entry[3] > segment_start:
+            entry[3] += delta
+    for sent in state['pending'].values():
+        if sent[0] > segment_start:
+            sent[0] += delta
+
+
+def percentile(hist, p):
+    """Histogramda (değer → adet) en yakın sıra yöntemi"""
+    total = sum(hist.values())
+    if not total:
+        return None
+    rank = max(1, math.ceil(p / 100 * total))
+    seen = 0
+    for value in sorted(hist):
+        seen += hist[value]
+        if seen >= rank:
+            return value
+
+
+def bucket_label(anchor, when, by):
+    day, secs = divmod(when, DAY_S)
+    date = anchor + datetime.timedelta(days=day)
+    if by == 'hour':
+        return f"{date.isoformat()} {secs // 3600:02d}:00"
+    return date.isoformat()
+
+
+def aggregate(states, by, provider_filter=None, since=None):
+    buckets = {}
+    error_classes = {}
+    for state in states:
+        if not state.get('anchor'):
+            continue
+        anchor = datetime.date.fromisoformat(state['anchor'])
+        for key, source in state['buckets'].items():
+            hour, provider = key.split('|', 1)
+            if provider_filter and provider.lower() != provider_filter.lower():
+                continue
+            label = bucket_label(anchor, int(hour) * 3600, by)
+            if since and label < since:
+                continue
+            bucket = buckets.setdefault(label, new_bucket())
+            for field in ('requests', 'ok', 'error', 'abandoned'):
+                bucket[field] += source[field]
+            for field in ('latency', 'chars'):
+                hist = bucket[field]
+                for value, count in source[field].items():
+                    hist[int(value)] = hist.get(int(value), 0) + count
+        for cls, (count, level, first, last) in state['errors'].items():
+            first_label = bucket_label(anchor, first, 'hour')
+            last_label = bucket_label(anchor, last, 'hour')
+            if since and last_label < since:
+                continue
+            entry = error_classes.setdefault(cls, {'count': 0, 'level': level, 'first': first_label, 'last': last_label})
+            entry['count'] += count
+            entry['first'] = min(entry['first'], first_label)
+            entry['last'] = max(entry['last'], last_label)
+
+    rows = []
+    for label in sorted(buckets):
+        bucket = buckets[label]
+        latency = bucket['latency']
+        chars = bucket['chars']
+        rows.append({
+            'period': label,
+            'requests': bucket['requests'],
+            'ok': bucket['ok'],
+            'error': bucket['error'],
+            'abandoned': bucket['abandoned'],
+            'latency_s': {p: percentile(latency, p) for p in (50, 90, 95, 99)},
+            'latency_max_s': max(latency) if latency else None,
+            'chars': {p: percentile(chars, p) for p in (50, 95)},
+        })
+    classes = sorted(({'class': cls, **entry} for cls, entry in error_classes.items()),
+                     key=lambda e: -e['count'])
+    return rows, classes
+
+
+def fmt(value):
+    return '-' if value is None else str(value)
+
+
+def print_report(rows, classes, top_errors):
+    print(f"\n{'Dönem':<18}{'İstek':>7}{'Hata':>6}{'Yarım':>6}{'p50':>6}{'p90':>6}{'p95':>6}{'p99':>6}{'max':>6}"
+          f"{'kar.p50':>9}{'kar.p95':>9}")
+    for row in rows:
+        lat = row['latency_s']
+        print(f"{row['period']:<18}{row['requests']:>7}{row['error']:>6}{row['abandoned']:>6}"
+              f"{fmt(lat[50]):>6}{fmt(lat[90]):>6}{fmt(lat[95]):>6}{fmt(lat[99]):>6}{fmt(row['latency_max_s']):>6}"
+              f"{fmt(row['chars'][50]):>9}{fmt(row['chars'][95]):>9}")
+    print("(gecikme saniye cinsinden - log zaman damgaları 1 sn çözünürlüklü; karakter 2 anlamlı basamağa indirilir)")
+
+    if classes:
+        print(f"\n❗ Hata sınıfları (ilk {min(top_errors, len(classes))} / {len(classes)})")
+        for entry in classes[:top_errors]:
+            print(f"{entry['count']:>7}  {entry['level']:<8} {entry['class']}  (son: {entry['last']})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bridge log analizörü (artımlı, mmap)")
+    parser.add_argument('files', nargs='*', help="Log dosyaları (varsayılan: %%LOCALAPPDATA%%/QuadroAIPilot/Logs)")
+    parser.add_argument('--by', choices=['day', 'hour'], default='day', help="Gruplama")
+    parser.add_argument('--since', help="Bu tarihten itibaren (YYYY-MM-DD veya 'YYYY-MM-DD HH:00')")
+    parser.add_argument('--provider', help="Sadece ChatGPT veya Gemini")
+    parser.add_argument('--top-errors', type=int, default=15, help="Gösterilecek hata sınıfı sayısı")
+    parser.add_argument('--index-dir', default=default_index_dir(), help="Kalıcı indeks klasörü")
+    parser.add_argument('--rebuild', action='store_true', help="İndeksi yok say, baştan tara")
+    parser.add_argument('--json', help="Raporu JSON dosyasına yaz")
+    args = parser.parse_args()
+
+    files = args.files or default_log_files()
+    if not files:
+        print("❌ Log dosyası bulunamadı")
+        sys.exit(1)
+
+    states = []
+    for path in files:
+        if not os.path.exists(path):
+            print(f"⚠️ Bulunamadı: {path}")
+            continue
+        index_file = index_path_for(args.index_dir, path)
+        state = new_state(path) if args.rebuild else load_state(index_file, path)
+        start = time.perf_counter()
+        scanned = scan(path, state)
+        elapsed = time.perf_counter() - start
+        save_state(index_file, state)
+        states.append(state)
+        print(f"📄 {os.path.basename(path)}: {scanned / 1048576:.1f} MB yeni veri tarandı "
+              f"({elapsed:.2f} sn), toplam {sum(b['requests'] for b in state['buckets'].values())} istek")
+
+    rows, classes = aggregate(states, args.by, args.provider, args.since)
+    print_report(rows, classes, args.top_errors)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'periods': rows, 'errors': classes}, f, ensure_ascii=False, indent=2)
+        print(f"\n✅ {args.json} yazıldı")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,18 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import argparse
+import csv
+import json
+import math
+import os
+import re
+import sys
+from itertools import chain, islice
+
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
 from openpyxl.utils import get_column_letter
 
 def create_competitor_analysis():
@@ -245,7 +255,204 @@ def create_priority_analysis():
     wb.save("/mnt/c/Users/serkan/source/repos/QuadroAIPilot setup so so outlook not setup deneme2/QuadroAIPilot_Eksikler_Oncelik.xlsx")
     print("✅ QuadroAIPilot_Eksikler_Oncelik.xlsx oluşturuldu")
 
+# ---------------------------------------------------------------------------
+# Streaming rapor (write-only) - CSV / JSONL girdiden, sabit bellek
+# ---------------------------------------------------------------------------
+
+# Satır dolguları: dolgu adı → renk (hex) - satırın dolgusunu row_fill_for() seçer
+ROW_FILLS = {
+    "critical": "FFE6E6",
+    "important": "FFF4E6",
+    "optional": "E6F4EA",
+    "error": "FFC7CE",
+}
+
+# Hücre seviyesinde sembol renkleri (rakip analizi tablosu)
+SYMBOL_FILLS = {
+    "✅": "C6EFCE",
+    "❌": "FFC7CE",
+    "⚠️": "FFEB9C",
+}
+
+# Hata satırı sayılan sütun/değer çiftleri (bridge metrik ve trace export'ları)
+ERROR_COLUMNS = {"iserror", "is_error", "status", "level", "error"}
+ERROR_VALUES = {"true", "error", "err", "failed", "fail", "timeout"}
+
+# Sütun genişliği tahmini için örneklenen satır sayısı
+WIDTH_SAMPLE_ROWS = 200
+
+
+def row_fill_for(headers, row):
+    """Satırın dolgu adı (yoksa None)"""
+    for value in row:
+        if not isinstance(value, str):
+            continue
+        if "🔴" in value:
+            return "critical"
+        if "🟡" in value:
+            return "important"
+        if "🟢" in value:
+            return "optional"
+    for name, value in zip(headers, row):
+        if name.lower() in ERROR_COLUMNS and str(value).strip().lower() in ERROR_VALUES:
+            return "error"
+    return None
+
+
+def register_report_styles(wb):
+    """
+    Rapor stillerini workbook'a bir kez NamedStyle olarak ekle
+    Hücreler sadece stil adını taşır (her hücre için yeni Font/Fill nesnesi yok)
+    """
+    thin = Side(style='thin')
+    border = Border(left=thin, right=thin, top=thin, bottom=thin)
+
+    def add(name, font=None, fill=None, horizontal='left'):
+        style = NamedStyle(name=name)
+        style.font = font or Font(size=11)
+        if fill:
+            style.fill = PatternFill(start_color=fill, end_color=fill, fill_type="solid")
+        style.border = border
+        style.alignment = Alignment(horizontal=horizontal, vertical='center', wrap_text=False)
+        wb.add_named_style(style)
+
+    add("qa_header", Font(bold=True, color="FFFFFF", size=11), "1F4E78", horizontal='center')
+    for fill_name, color in chain([(None, None)], ROW_FILLS.items()):
+        suffix = f"_{fill_name}" if fill_name else ""
+        add(f"qa_cell{suffix}", fill=color)
+        add(f"qa_first{suffix}", Font(bold=True, size=11), color)
+        add(f"qa_number{suffix}", fill=color, horizontal='right')
+    for index, color in enumerate(SYMBOL_FILLS.values()):
+        add(f"qa_symbol_{index}", Font(size=14), color, horizontal='center')
+
+
+SYMBOL_STYLES = {symbol: f"qa_symbol_{index}" for index, symbol in enumerate(SYMBOL_FILLS)}
+
+
+# Düz sayı: başta sıfır yok ("0012" kod olabilir), "1_000" / "nan" / "inf" yok
+NUMBER_RE = re.compile(r'-?(?:0|[1-9]\d*)(\.\d+)?([eE][+-]?\d+)?')
+
+
+def coerce_value(value):
+    """Sayısal metinleri sayıya çevir (Excel'de sıralama/filtre için), iç içe yapıları JSON yap"""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    if not isinstance(value, str):
+        return value
+    text = value.strip()
+    if not text:
+        return None
+    match = NUMBER_RE.fullmatch(text)
+    if match is None:
+        return value
+    if match.group(1) is None and match.group(2) is None:
+        return int(text)
+    number = float(text)
+    # "1e999" gibi taşanlar metin kalır
+    return number if math.isfinite(number) else value
+
+
+def read_csv_rows(path):
+    """CSV/TSV satırlarını sırayla üret - ayırıcı ilk satırdan tahmin edilir"""
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        sample = f.readline()
+        f.seek(0)
+        delimiter = max("\t,;", key=sample.count)
+        reader = csv.reader(f, delimiter=delimiter)
+        headers = next(reader, [])
+        yield headers
+        for row in reader:
+            if row:
+                yield row
+
+
+def read_jsonl_rows(path, columns=None):
+    """JSONL kayıtlarını satır olarak üret - sütunlar ilk kayıttan (veya columns) alınır"""
+    with open(path, 'r', encoding='utf-8') as f:
+        records = (json.loads(line) for line in f if line.strip())
+        first = next(records, None)
+        if first is None:
+            yield columns or []
+            return
+        headers = columns or list(first.keys())
+        yield headers
+        for record in chain([first], records):
+            yield [record.get(name) for name in headers]
+
+
+def stream_report(inputs, output_path, columns=None):
+    """
+    CSV/JSONL dosyalarını write-only modda Excel'e yaz (dosya başına bir sayfa)
+    Satırlar okunduğu gibi yazılır; bellek kullanımı satır sayısından bağımsızdır
+    """
+    wb = Workbook(write_only=True)
+    register_report_styles(wb)
+
+    for path in inputs:
+        if path.lower().endswith(('.jsonl', '.ndjson')):
+            rows = read_jsonl_rows(path, columns)
+        else:
+            rows = read_csv_rows(path)
+        headers = [str(h) for h in next(rows)]
+
+        title = os.path.splitext(os.path.basename(path))[0][:31]
+        ws = wb.create_sheet(title=title)
+
+        # Genişlik ve dondurma ilk satırdan önce ayarlanmalı (write-only kısıtı)
+        sample = list(islice(rows, WIDTH_SAMPLE_ROWS))
+        for index, name in enumerate(headers, 1):
+            longest = max([len(name)] + [len(str(r[index - 1])) for r in sample if len(r) >= index])
+            ws.column_dimensions[get_column_letter(index)].width = min(max(longest + 2, 8), 60)
+        ws.freeze_panes = "A2"
+
+        header_cells = []
+        for name in headers:
+            cell = WriteOnlyCell(ws, value=name)
+            cell.style = "qa_header"
+            header_cells.append(cell)
+        ws.append(header_cells)
+
+        count = 0
+        for row in chain(sample, rows):
+            fill = row_fill_for(headers, row)
+            suffix = f"_{fill}" if fill else ""
+            cells = []
+            for index, raw in enumerate(row):
+                value = coerce_value(raw)
+                cell = WriteOnlyCell(ws, value=value)
+                if isinstance(raw, str) and raw.strip() in SYMBOL_STYLES:
+                    cell.style = SYMBOL_STYLES[raw.strip()]
+                elif index == 0:
+                    cell.style = f"qa_first{suffix}"
+                elif isinstance(value, (int, float)):
+                    cell.style = f"qa_number{suffix}"
+                else:
+                    cell.style = f"qa_cell{suffix}"
+                cells.append(cell)
+            ws.append(cells)
+            count += 1
+
+        if headers and count:
+            ws.auto_filter.ref = f"A1:{get_column_letter(len(headers))}{count + 1}"
+        print(f"📄 {title}: {count} satır")
+
+    wb.save(output_path)
+    print(f"✅ {output_path} oluşturuldu")
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="QuadroAIPilot Excel raporları")
+    parser.add_argument("--input", nargs="+", help="CSV/TSV veya JSONL dosyaları (dosya başına bir sayfa)")
+    parser.add_argument("--output", help="Çıktı .xlsx (varsayılan: ilk girdinin adı)")
+    parser.add_argument("--columns", help="JSONL için sütunlar (virgülle ayrılmış, varsayılan: ilk kayıt)")
+    args = parser.parse_args()
+
+    if args.input:
+        output = args.output or os.path.splitext(args.input[0])[0] + ".xlsx"
+        columns = args.columns.split(",") if args.columns else None
+        stream_report(args.input, output, columns)
+        sys.exit(0)
+
     print("📊 Excel raporları oluşturuluyor...")
     create_competitor_analysis()
     create_priority_analysis()